@@ -2,22 +2,72 @@
 
 # Importation des bibliothèques nécessaires.
 
+# time : pour mesurer précisément des durées (mesures de performance, rapport de démarrage).
+#   Il est importé en premier pour noter l'instant du lancement du programme.
 # pygame : pour créer des jeux et des animations.
 # sys : pour interagir avec le système, comme quitter le programme proprement.
 # random : pour choisir des valeurs aléatoires, utile pour les obstacles.
 # os : pour gérer les chemins de fichiers.
 # math : pour des opérations mathématiques complexes, comme les angles 
 # (mise en place du design du compte à rebours avant de commencer le jeu).
-# pyzt : pour gérer les fuseaux horaires.
 # datetime : classe datetime du module datetime pour manipuler les dates et heures.
-import pygame
+# OrderedDict : dictionnaire ordonné, utilisé pour les caches avec éviction (LRU).
+# defaultdict : dictionnaire avec une valeur par défaut (clavier sans touche enfoncée).
+# deque : file de taille limitée, utilisée pour les moyennes glissantes du profileur.
+# array : tableau compact de nombres, utilisé pour enregistrer les touches d'une partie (replay).
+# struct : pour lire et écrire l'en-tête binaire des fichiers de replay.
+# gc : pour compter les passages du ramasse-miettes.
+# threading, queue : pour charger les images et les sons du jeu en arrière-plan pendant l'introduction.
+#
+# Les modules suivants ne sont importés qu'au moment où ils servent, pour que la fenêtre
+# s'ouvre plus vite au lancement du jeu :
+# zoneinfo (ou pytz s'il manque les données de fuseaux horaires), locale : fuseau horaire 
+#   et langue de la date affichée pendant l'introduction (voir "ClockDisplay").
+# json, tracemalloc : écriture des résultats et mesure des allocations mémoire (benchmarks).
+# numpy (facultatif) : calculs sur des tableaux, utilisé par le moteur d'obstacles vectorisé
+#   (voir "import_numpy()").
+import time
+
+# Instant du lancement du programme, origine des durées du rapport de démarrage
+PROGRAM_START = time.perf_counter()
+
 import sys
+import pygame
 import random
 import os
 import math
-import pytz  
 from datetime import datetime
-import locale
+from collections import OrderedDict, defaultdict, deque
+from array import array
+import struct
+import gc
+import threading
+import queue
+
+
+# Rapport de démarrage : "python dysheros.py --startup-report" affiche la durée de chaque étape
+# du lancement (importations, chargement du code, ouverture de la fenêtre, première image, son).
+STARTUP_REPORT = "--startup-report" in sys.argv
+
+# Etapes du démarrage déjà terminées : (nom, instant de fin en ms depuis le lancement)
+startup_steps = []
+
+
+# Fonction qui note la fin d'une étape du démarrage
+def startup_step(name):
+    startup_steps.append((name, (time.perf_counter() - PROGRAM_START) * 1000))
+
+
+# Fonction qui affiche la durée de chaque étape du démarrage et le temps total écoulé
+def print_startup_report():
+    print("Démarrage :")
+    previous = 0.0
+    for name, end in startup_steps:
+        print(f"  {name:<24} {end - previous:8.1f} ms   (depuis le lancement : {end:8.1f} ms)")
+        previous = end
+
+
+startup_step("importations")
 
 
 # Fonction pour obtenir le chemin absolu vers une ressource
@@ -49,36 +99,265 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
-# Initialiser tous les modules de pygame.
-# Cette fonction doit être appelée avant d'utiliser d'autres fonctions de pygame.
-pygame.init()
+# Registre des mesures de performance (benchmarks) du jeu.
+# Chaque mesure est une fonction enregistrée sous un nom avec le décorateur "benchmark",
+# elles sont lancées depuis la ligne de commande avec :
+# "python dysheros.py --benchmark" (toutes) ou "python dysheros.py --benchmark fonds" (une seule).
+BENCHMARKS = {}
+
+
+# Décorateur qui enregistre une fonction de mesure dans le registre "BENCHMARKS".
+def benchmark(name):
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+# Mesure la durée moyenne (en millisecondes) d'une fonction appelée "frames" fois.
+# Utilisé par les benchmarks pour comparer le coût de deux images (frames) différentes.
+def measure_frames(frame_func, frames):
+    durations = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        frame_func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return sum(durations) / len(durations), max(durations)
 
-# Initialiser le module mixer de pygame.
-# Le module mixer est utilisé pour jouer des sons et de la musique.
-pygame.mixer.init()
 
+# Renvoie le centile "p" (entre 0 et 100) d'une liste de valeurs déjà triée (rang le plus proche)
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
 
-# Chargement de l'icône pour la fenêtre.
-# Utilisation de la fonction resource_path pour obtenir le chemin de l'icône de la fenêtre.
-icon_image_path = resource_path("window_icone.png")  
 
-# Chargement de l'image de l'icône en mémoire en utilisant le module pygame.
-icon_image = pygame.image.load(icon_image_path)
+# Définition de la classe 'PhaseTimer' qui mesure la durée de chaque étape (phase) d'une image
+# "begin()" démarre l'image, "mark(nom)" attribue au nom donné le temps écoulé depuis
+# la marque précédente, "end()" renvoie la durée totale de l'image et la durée de chaque phase
+# (en millisecondes). Une seule lecture de l'horloge est faite par phase.
+class PhaseTimer:
+    
+    def __init__(self):
+        self.frame_start = 0.0
+        self.last = 0.0
+        self.current = {}
+
+    # Démarre la mesure d'une nouvelle image
+    def begin(self):
+        self.current = {}
+        self.frame_start = self.last = time.perf_counter()
+
+    # Termine la phase en cours en lui attribuant le temps écoulé depuis la marque précédente
+    def mark(self, name):
+        now = time.perf_counter()
+        self.current[name] = self.current.get(name, 0.0) + (now - self.last) * 1000
+        self.last = now
+
+    # Termine l'image : renvoie sa durée totale et le dictionnaire des durées par phase
+    def end(self):
+        return (time.perf_counter() - self.frame_start) * 1000, self.current
+
+
+# Mesureur qui ne mesure rien : utilisé à la place d'un "PhaseTimer" quand le profileur
+# est désactivé, pour que les marques de phase dans le jeu ne coûtent presque rien
+class NullTimer:
+    
+    def begin(self):
+        pass
+
+    def mark(self, name):
+        pass
+
+
+NULL_TIMER = NullTimer()
+
+
+# Lance les benchmarks demandés (ou tous si aucun nom n'est donné) et affiche les résultats.
+def run_benchmarks(names):
+    for name in names or list(BENCHMARKS):
+        print(f"== {name}")
+        BENCHMARKS[name]()
+
 
-# Définition de l'icône de la fenêtre avec l'image chargée.
-pygame.display.set_icon(icon_image)
+# Fonction qui renvoie la valeur d'une option de la ligne de commande (par exemple "--fps 30"),
+# ou "default" si l'option n'est pas présente
+def command_line_option(name, default=None):
+    if name in sys.argv[:-1]:
+        return sys.argv[sys.argv.index(name) + 1]
+    return default
 
 
+# Mode sans affichage : "python dysheros.py --headless" simule une partie complète
+# (et "--replay" rejoue une partie enregistrée) sans fenêtre ni son, aussi vite que possible (pilotes "dummy" de SDL pour l'image et le son).
+# Les pilotes doivent être choisis avant l'initialisation de pygame.
+HEADLESS = "--headless" in sys.argv or "--replay" in sys.argv
+if HEADLESS:
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
 # Définition de la largeur et de la hauteur de la fenêtre de jeu.
 # WIDTH = largeur de la fenêtre en pixels (800 pixels).
 # HEIGHT = hauteur de la fenêtre en pixels (600 pixels).
 WIDTH, HEIGHT = 800, 600
 
-# Création de la fenêtre de jeu avec la taille précédente.
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
+# Surface de rendu du jeu (800 x 600), créée par "init_display()" au démarrage.
+# Toutes les scènes dessinent sur cette surface, qui ne change jamais : le passage en plein
+# écran ou le redimensionnement de la fenêtre ne touche ni à elle ni aux images converties.
+screen = None
+
+# Mise à l'échelle de l'image à l'écran : "sdl" (par défaut) laisse SDL agrandir l'image 
+# (option "SCALED" de pygame), "lisse" dessine dans une surface hors écran puis l'agrandit
+# avec "pygame.transform.smoothscale" (par exemple "python dysheros.py --scaling lisse")
+SCALING = command_line_option("--scaling", "sdl")
+
+
+# Définition de la classe 'GameDisplay' : la fenêtre du jeu et sa surface de rendu 800 x 600
+# "target" est la surface sur laquelle le jeu dessine, "window" la surface de la fenêtre.
+# - "sdl" : la fenêtre est ouverte avec "pygame.SCALED" ; SDL agrandit lui-même l'image 
+#   (avec des bandes noires si besoin), "target" est la surface de la fenêtre et garde 
+#   toujours la taille 800 x 600, en fenêtre comme en plein écran ;
+# - "lisse" : "target" est une surface hors écran ; "present()" la recopie dans la fenêtre,
+#   agrandie avec "smoothscale" si la fenêtre n'a pas la même taille. La zone de destination
+#   (centrée, mêmes proportions) est calculée une seule fois par taille de fenêtre.
+# Avec les pilotes sans fenêtre ("dummy", "offscreen"), "sdl" ouvre une fenêtre simple.
+class GameDisplay:
+    
+    def __init__(self, size, scaling="sdl"):
+        self.size = size
+        self.scaling = scaling
+        self.window = None
+        self.target = None
+        self.fullscreen = False
+        
+        # Zone de la fenêtre où l'image est affichée en mode "lisse" et sous-surface correspondante
+        self.layout = None
+        self.view = None
+        
+        # Nombre d'images agrandies avec "smoothscale"
+        self.scaled_frames = 0
+
+    # Ouvre la fenêtre et crée la surface de rendu
+    def open(self):
+        self.fullscreen = False
+        if self.scaling == "sdl":
+            flags = 0
+            if pygame.display.get_driver() not in ("dummy", "offscreen"):
+                flags = pygame.SCALED | pygame.RESIZABLE
+            
+            # Sans "SCALED" (pilote trop ancien par exemple), l'agrandissement se fait avec "smoothscale"
+            try:
+                self.window = self.target = pygame.display.set_mode(self.size, flags)
+                return
+            except pygame.error:
+                self.scaling = "lisse"
+        self.window = pygame.display.set_mode(self.size, pygame.RESIZABLE)
+        self.target = pygame.Surface(self.size).convert()
+        self.layout = None
+
+    # Passe en plein écran ou revient en fenêtre ; la surface de rendu reste la même
+    # Renvoie False si le pilote d'affichage ne permet pas le plein écran.
+    def toggle_fullscreen(self):
+        if self.scaling == "sdl":
+            
+            # Avec "SCALED", SDL passe en plein écran sans recréer la surface de la fenêtre
+            try:
+                pygame.display.toggle_fullscreen()
+            except pygame.error:
+                return False
+            self.window = self.target = pygame.display.get_surface()
+        
+        # En mode "lisse", seule la fenêtre est recréée (à la taille du bureau en plein écran)
+        elif self.fullscreen:
+            self.window = pygame.display.set_mode(self.size, pygame.RESIZABLE)
+        else:
+            self.window = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        self.fullscreen = not self.fullscreen
+        self.layout = None
+        return True
+
+    # La fenêtre a été redimensionnée par le joueur
+    def window_resized(self):
+        self.window = pygame.display.get_surface()
+        if self.scaling == "sdl":
+            self.target = self.window
+        self.layout = None
+
+    # Calcule la zone de la fenêtre où l'image est affichée (centrée, mêmes proportions)
+    # et efface les bandes noires autour une fois pour toutes
+    def update_layout(self):
+        width, height = self.window.get_size()
+        scale = min(width / self.size[0], height / self.size[1])
+        self.layout = pygame.Rect(0, 0, round(self.size[0] * scale), round(self.size[1] * scale))
+        self.layout.center = (width // 2, height // 2)
+        self.view = self.window.subsurface(self.layout)
+        self.window.fill(BLACK)
+
+    # Envoie l'image à l'écran : toute l'image, ou seulement les zones "rects" si elles sont données
+    def present(self, rects=None):
+        if self.target is self.window:
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+            return
+        
+        # Mode "lisse" : la première image après un changement de fenêtre est envoyée en entier
+        if self.layout is None:
+            self.update_layout()
+            rects = None
+        
+        # Fenêtre à la taille du jeu : recopie simple des zones modifiées
+        if self.layout.size == self.size:
+            x, y = self.layout.topleft
+            if rects is None:
+                self.window.blit(self.target, self.layout)
+                pygame.display.flip()
+            else:
+                moved = [rect.move(x, y) for rect in rects]
+                for rect, window_rect in zip(rects, moved):
+                    self.window.blit(self.target, window_rect, rect)
+                pygame.display.update(moved)
+            return
+        
+        # Fenêtre agrandie : l'image entière est lissée directement dans la zone de la fenêtre
+        pygame.transform.smoothscale(self.target, self.layout.size, self.view)
+        self.scaled_frames += 1
+        pygame.display.flip()
+
+
+# Fenêtre du jeu (touche "F" dans toutes les scènes pour le plein écran)
+game_display = GameDisplay((WIDTH, HEIGHT), SCALING)
+
+
+# Fonction qui initialise l'affichage et ouvre la fenêtre du jeu
+# Seuls les modules nécessaires à la première image sont initialisés (affichage et polices) :
+# le son est initialisé juste après l'affichage de la première image (voir "init_audio()").
+def init_display():
+    global screen
+    
+    # Initialiser les modules d'affichage et de polices de caractères de pygame.
+    # Ces fonctions doivent être appelées avant d'ouvrir la fenêtre et d'écrire du texte.
+    pygame.display.init()
+    pygame.font.init()
+
+    # Chargement de l'icône pour la fenêtre.
+    # Utilisation de la fonction resource_path pour obtenir le chemin de l'icône de la fenêtre.
+    icon_image_path = resource_path("window_icone.png")  
+
+    # Chargement de l'image de l'icône en mémoire en utilisant le module pygame.
+    icon_image = pygame.image.load(icon_image_path)
+
+    # Définition de l'icône de la fenêtre avec l'image chargée.
+    pygame.display.set_icon(icon_image)
+
+    # Création de la fenêtre de jeu et de la surface de rendu de taille WIDTH x HEIGHT.
+    game_display.open()
+    screen = game_display.target
 
-# Définition du titre de la fenêtre de jeu.
-pygame.display.set_caption("Jeu thérapeutique pour les troubles Dys (Dylexie, dyspraxie, dysgraphie)")
+    # Définition du titre de la fenêtre de jeu.
+    pygame.display.set_caption("Jeu thérapeutique pour les troubles Dys (Dylexie, dyspraxie, dysgraphie)")
 
 # Définition des couleurs utilisées dans le jeu en format RGB (Rouge, Vert, Bleu).
 # BLACK = noir (0, 0, 0) = Fond d'écran final pour affichage des textes du jeu. 
@@ -91,133 +370,294 @@ WHITE = (255, 255, 255)
 OR = (255, 215, 0)
 
 
-# Charge la musique de fond du jeu à partir du fichier spécifié.
-# 'resource_path("aventure_son.mp3")' renvoie le chemin complet du fichier de musique
-# 'pygame.mixer.music.load()' charge le fichier de musique pour qu'il puisse être joué.
-pygame.mixer.music.load(resource_path("aventure_son.mp3"))
-
-# Définit le volume de la musique à 0.09 (9% du volume maximal).
-# 'pygame.mixer.music.set_volume(0.09)' ajuste le volume de la musique.
-pygame.mixer.music.set_volume(0.09)
-
-# Joue la musique en boucle.
-# 'pygame.mixer.music.play(-1)' commence à jouer la musique et la répète indéfiniment.
-# Le paramètre '-1' indique que la musique doit être jouée en boucle.
-pygame.mixer.music.play(-1)
-
-
+# Définition de la classe 'TextCache' qui garde en mémoire les polices et les textes déjà rendus
+# Créer une police ("pygame.font.Font") et rendre un texte ("render") coûtent cher :
+# le cache réutilise les polices par (police, taille) et les surfaces de texte
+# par (police, taille, texte, couleur, lissage). Quand le cache est plein, le texte
+# utilisé le moins récemment est supprimé (éviction LRU).
+class TextCache:
+    
+    # Initialisation du cache avec le nombre maximum de surfaces de texte gardées en mémoire
+    def __init__(self, max_surfaces=256):
+        # Polices déjà créées, indexées par (police, taille)
+        self.fonts = {}
+        
+        # Surfaces de texte déjà rendues, de la moins récente à la plus récente
+        self.surfaces = OrderedDict()
+        self.max_surfaces = max_surfaces
+        
+        # Compteurs de réussites (hits) et d'échecs (misses) du cache pour l'image en cours,
+        # ceux de l'image précédente, et les totaux depuis le début
+        self.frame_hits = 0
+        self.frame_misses = 0
+        self.last_frame_hits = 0
+        self.last_frame_misses = 0
+        self.total_hits = 0
+        self.total_misses = 0
+        self.evictions = 0
+
+    # Renvoie la police de la taille demandée, créée une seule fois
+    # "face" est le fichier de police (None = police par défaut de pygame)
+    def font(self, size, face=None):
+        key = (face, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(face, size)
+            self.fonts[key] = font
+        return font
+
+    # Renvoie la surface du texte demandé, rendue uniquement si elle n'est pas déjà en cache
+    # La surface renvoyée est partagée : il faut la copier ("copy()") avant de la modifier.
+    def render(self, text, size, color, antialias=True, face=None):
+        key = (face, size, text, color, antialias)
+        surface = self.surfaces.get(key)
+        
+        # Texte déjà rendu : on le marque comme le plus récemment utilisé
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.frame_hits += 1
+            return surface
+        
+        # Texte absent du cache : on le rend et on l'ajoute au cache
+        self.frame_misses += 1
+        surface = self.font(size, face).render(text, antialias, color)
+        self.surfaces[key] = surface
+        
+        # Supprime le texte le moins récemment utilisé si le cache est plein
+        if len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        
+        return surface
+
+    # Termine l'image en cours : mémorise ses compteurs et les remet à zéro
+    # A appeler une fois par image (frame) dans les boucles d'affichage.
+    def end_frame(self):
+        self.last_frame_hits = self.frame_hits
+        self.last_frame_misses = self.frame_misses
+        self.total_hits += self.frame_hits
+        self.total_misses += self.frame_misses
+        self.frame_hits = 0
+        self.frame_misses = 0
+
+    # Renvoie un résumé lisible des compteurs du cache
+    def stats(self):
+        return (f"textes : {self.last_frame_hits} hits / {self.last_frame_misses} misses par image, "
+                f"total {self.total_hits} hits / {self.total_misses} misses, "
+                f"{len(self.surfaces)} en cache, {self.evictions} évictions")
+
+
+# Cache de texte partagé par tout le jeu (HUD, écrans de fin, menus)
+text_cache = TextCache()
+
+
+# Mesure le coût du rendu des textes du HUD (score, niveau, bonus, effets actifs).
+# "sans cache (ancien)" recrée une police et rend chaque texte à chaque image,
+# "avec cache" passe par "text_cache" : seul un texte qui change est rendu à nouveau.
+@benchmark("textes")
+def bench_hud_text(frames=600):
+    cache = TextCache()
+    state = {"frame": 0}
+
+    def hud_labels():
+        # Le score change une fois par seconde (toutes les 60 images)
+        score = state["frame"] // 60
+        state["frame"] += 1
+        return [(f"Score : {score}", WHITE), (f"Niveau : {score // 10 + 1}", WHITE),
+                ("Bonus collectés : 3", WHITE), ("Invincible !", (255, 215, 0)),
+                ("Obstacles ralentis !", (255, 165, 0))]
+
+    def uncached_frame():
+        for text, color in hud_labels():
+            screen.blit(pygame.font.Font(None, 38).render(text, True, color), (10, 10))
+
+    def cached_frame():
+        for text, color in hud_labels():
+            screen.blit(cache.render(text, 38, color), (10, 10))
+        cache.end_frame()
+
+    average, worst = measure_frames(uncached_frame, frames)
+    print(f"{'sans cache (ancien)':<22} moyenne {average:7.3f} ms   pire {worst:7.3f} ms")
+    state["frame"] = 0
+    average, worst = measure_frames(cached_frame, frames)
+    print(f"{'avec cache':<22} moyenne {average:7.3f} ms   pire {worst:7.3f} ms")
+    print(f"{'hits/misses par image':<22} {cache.total_hits / frames:.2f} / {cache.total_misses / frames:.2f}")
+    print(cache.stats())
+
+
+# Fonction qui initialise le son et lance la musique de fond du jeu
+# Les sons courts (fin de partie, bonus, alerte, victoire) sont chargés en arrière-plan 
+# par "asset_loader" et obtenus avec "get_sound()".
+def init_audio():
+    
+    # Initialiser le module mixer de pygame.
+    # Le module mixer est utilisé pour jouer des sons et de la musique.
+    pygame.mixer.init()
 
-# Charge le son de fin de jeu à partir du fichier spécifié.
-# 'resource_path("game_over.wav")' renvoie le chemin complet du fichier sonore.
-# 'pygame.mixer.Sound()' crée un objet sonore à partir du fichier spécifié.
-game_over_sound = pygame.mixer.Sound(resource_path("game_over.wav"))
+    # Charge la musique de fond du jeu à partir du fichier spécifié.
+    # 'resource_path("aventure_son.mp3")' renvoie le chemin complet du fichier de musique
+    # 'pygame.mixer.music.load()' charge le fichier de musique pour qu'il puisse être joué.
+    pygame.mixer.music.load(resource_path("aventure_son.mp3"))
 
-# Charge le son de bonus collecté à partir du fichier spécifié.
-# 'resource_path("bonus_collected.wav")' renvoie le chemin complet du fichier sonore.
-# 'pygame.mixer.Sound()' crée un objet sonore à partir du fichier spécifié.
-bonus_sound = pygame.mixer.Sound(resource_path("bonus_collected.wav"))
+    # Définit le volume de la musique à 0.09 (9% du volume maximal).
+    # 'pygame.mixer.music.set_volume(0.09)' ajuste le volume de la musique.
+    pygame.mixer.music.set_volume(0.09)
 
-# Définit le volume du son de fin de jeu à 1.0 (100% du volume maximal).
-# 'game_over_sound.set_volume(1.0)' ajuste le volume du son de fin de jeu.
-game_over_sound.set_volume(1.0)
+    # Joue la musique en boucle.
+    # 'pygame.mixer.music.play(-1)' commence à jouer la musique et la répète indéfiniment.
+    # Le paramètre '-1' indique que la musique doit être jouée en boucle.
+    pygame.mixer.music.play(-1)
 
-# Définit le volume du son de bonus collecté à 1.0 (100% du volume maximal).
-# 'bonus_sound.set_volume(1.0)' ajuste le volume du son de bonus collecté.
-bonus_sound.set_volume(1.0)
 
+# Fonction qui renvoie l'image d'introduction (Léo) : l'image est redimensionnée à une taille 
+# de 350 x 150 pixels avec un lissage ("smoothscale") pour éviter les artefacts, puis ses coins 
+# sont arrondis. Elle est préparée lors du premier appel et gardée dans le cache des images
+# ("asset_cache"), avec les autres images du jeu.
+def get_intro_image():
+    return asset_cache.get("leo_hero1.png", (350, 150), smooth=True, effect=round_corners)
 
-# Charge le fichier audio du son d'alerte pour le combat final.
-# "pygame.mixer.Sound()" charge un fichier son pour le jouer plus tard : 
-# ici, on utilise la fonction "resource_path()"
-# pour obtenir le chemin du fichier "final_alert.wav" 
-# (assurez-vous que le fichier se trouve dans le dossier correct).
-final_alert_sound = pygame.mixer.Sound(resource_path("final_alert.wav"))
 
-# Définit le volume du son chargé pour qu'il joue à pleine puissance (volume maximal).
-# "final_alert_sound.set_volume(1.0)" ajuste le volume entre 
-# 0.0 (silencieux) et 1.0 (volume maximal).
-final_alert_sound.set_volume(1.0)  # Vous pouvez ajuster ce niveau selon vos préférences
+# Fonction qui renvoie une copie de l'image "image" avec des coins arrondis
+def round_corners(image):
 
+    # Création d'une nouvelle surface avec la taille de l'image d'introduction 
+    # et un coin arrondi de 30 pixels.
 
-# Chargement de l'image d'introduction.
-# L'image est redimensionnée à une taille de 350 x 150 pixels.
+    # Crée une nouvelle surface avec la même taille que l'image d'introduction
+    # 'pygame.Surface()' crée une nouvelle surface
+    # 'image.get_size()' obtient la taille de l'image d'introduction
+    # 'pygame.SRCALPHA' indique que la surface prend en charge la transparence
+    rounded_image = pygame.Surface(image.get_size(), pygame.SRCALPHA)
 
-# Charge l'image d'introduction à partir du fichier spécifié.
-# 'resource_path("leo_hero.png")' renvoie le chemin complet du fichier image
-# 'pygame.image.load()' charge l'image à partir du fichier spécifié
-# 'convert_alpha()' convertit l'image en un format qui prend en charge la transparence.
-intro_image = pygame.image.load(resource_path("leo_hero1.png")).convert_alpha()
+    # Définit le rayon des coins arrondis à 30 pixels.
+    corner_radius = 30
 
-# Redimensionne l'image d'introduction à une taille de 350 x 150 pixels.
-# 'pygame.transform.smoothscale()' redimensionne l'image de manière fluide 
-# pour éviter les artefacts (Éléments graphiques interactifs.).
-intro_image = pygame.transform.smoothscale(intro_image, (350, 150))
+    # Obtient le rectangle de la nouvelle surface.
+    # 'get_rect()' obtient le rectangle de la surface.
+    rect = rounded_image.get_rect()
 
-# Création d'une nouvelle surface avec la taille de l'image d'introduction 
-# et un coin arrondi de 30 pixels.
 
-# Crée une nouvelle surface avec la même taille que l'image d'introduction
-# 'pygame.Surface()' crée une nouvelle surface
-# 'intro_image.get_size()' obtient la taille de l'image d'introduction
-# 'pygame.SRCALPHA' indique que la surface prend en charge la transparence
-rounded_image = pygame.Surface(intro_image.get_size(), pygame.SRCALPHA)
+    # Dessine un rectangle avec des coins arrondis pour créer un effet visuel autour de l'image.
 
-# Définit le rayon des coins arrondis à 30 pixels.
-corner_radius = 30
+    # Dessine un rectangle sur la surface 'rounded_image'
+    # 'pygame.draw.rect()' dessine un rectangle sur une surface
+    # 'rounded_image' est la surface sur laquelle le rectangle est dessiné
+    # '(255, 255, 255, 255)' est la couleur du rectangle (blanc avec transparence)
+    # 'rect' est le rectangle définissant la position et la taille du rectangle
+    # 'border_radius=corner_radius' définit le rayon des coins arrondis du rectangle
+    pygame.draw.rect(rounded_image, (255, 255, 255, 255), rect, border_radius=corner_radius)
 
-# Obtient le rectangle de la nouvelle surface.
-# 'get_rect()' obtient le rectangle de la surface.
-rect = rounded_image.get_rect()
+    # Superposition de l'image d'introduction sur le rectangle arrondi.
 
+    # Superpose l'image d'introduction sur la surface 'rounded_image'.
+    # 'rounded_image.blit()' superpose une image sur une autre surface.
+    # 'image' est l'image à superposer.
+    # '(0, 0)' est la position où l'image est superposée (coin supérieur gauche).
+    # 'special_flags=pygame.BLEND_RGBA_MIN' applique un effet de mélange pour gérer la transparence.
+    rounded_image.blit(image, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
 
-# Dessine un rectangle avec des coins arrondis pour créer un effet visuel autour de l'image.
+    # La nouvelle version avec des bords arrondis remplace l'image d'origine dans le cache
+    return rounded_image
 
-# Dessine un rectangle sur la surface 'rounded_image'
-# 'pygame.draw.rect()' dessine un rectangle sur une surface
-# 'rounded_image' est la surface sur laquelle le rectangle est dessiné
-# '(255, 255, 255, 255)' est la couleur du rectangle (blanc avec transparence)
-# 'rect' est le rectangle définissant la position et la taille du rectangle
-# 'border_radius=corner_radius' définit le rayon des coins arrondis du rectangle
-pygame.draw.rect(rounded_image, (255, 255, 255, 255), rect, border_radius=corner_radius)
 
-# Superposition de l'image d'introduction sur le rectangle arrondi.
+# Noms des jours de la semaine en français (du lundi au dimanche)
+# Utilisés lorsque la langue française ("fr_FR.UTF-8") n'est pas installée sur le système.
+FRENCH_DAY_NAMES = ["lundi", "mardi", "mercredi", "jeudi", "vendredi", "samedi", "dimanche"]
 
-# Superpose l'image d'introduction sur la surface 'rounded_image'.
-# 'rounded_image.blit()' superpose une image sur une autre surface.
-# 'intro_image' est l'image à superposer.
-# '(0, 0)' est la position où l'image est superposée (coin supérieur gauche).
-# 'special_flags=pygame.BLEND_RGBA_MIN' applique un effet de mélange pour gérer la transparence.
-rounded_image.blit(intro_image, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
 
-# Réinitialisation de "intro_image" pour utiliser la nouvelle version avec bords arrondis.
+# Définition de la classe 'ClockDisplay' qui fournit la date et l'heure affichées à l'écran
+# La langue et le fuseau horaire sont configurés une seule fois, au premier affichage
+# (et non au lancement du programme, pour que la fenêtre s'ouvre plus vite).
+# La date et l'heure ne sont recalculées que lorsque la seconde affichée change,
+# et les surfaces de texte rendues sont gardées jusqu'au prochain changement.
+class ClockDisplay:
+    
+    # Initialisation avec le fuseau horaire à utiliser (par défaut 'Europe/Paris')
+    def __init__(self, timezone_name="Europe/Paris"):
+        self.timezone_name = timezone_name
+        
+        # Fuseau horaire et langue, configurés par "configure()" au premier affichage
+        self.timezone = None
+        self.use_locale = False
+        self.configured = False
+        
+        # Dernière seconde formatée et textes correspondants
+        self.last_second = None
+        self.date_str = ""
+        self.time_str = ""
+        
+        # Dernières surfaces rendues, avec la clé (police, couleur, texte) qui les a produites
+        self.date_surface = (None, None)
+        self.time_surface = (None, None)
 
-# Réinitialise 'intro_image' pour qu'elle utilise la nouvelle version avec des bords arrondis.
-# 'intro_image' est maintenant la surface 'rounded_image' avec les bords arrondis.
-intro_image = rounded_image
+    # Configure la langue et le fuseau horaire de la date affichée
+    def configure(self):
+        self.configured = True
+        
+        # Configuration de la langue en français pour afficher le jour en français
+        # Si la langue n'est pas installée, on utilise la table "FRENCH_DAY_NAMES".
+        import locale
+        try:
+            locale.setlocale(locale.LC_TIME, "fr_FR.UTF-8")
+            self.use_locale = True
+        except locale.Error:
+            self.use_locale = False
+        
+        # Définition du fuseau horaire avec le module 'zoneinfo' de la bibliothèque standard.
+        # Sous Windows, les données des fuseaux horaires viennent du paquet "tzdata" : 
+        # s'il n'est pas installé, le module 'pytz' est utilisé à la place, 
+        # et à défaut l'heure locale de l'ordinateur.
+        try:
+            from zoneinfo import ZoneInfo
+            self.timezone = ZoneInfo(self.timezone_name)
+        except (ImportError, LookupError):
+            try:
+                import pytz
+                self.timezone = pytz.timezone(self.timezone_name)
+            except ImportError:
+                self.timezone = None
+
+    # Renvoie la date et l'heure actuelles sous forme de chaînes de caractères
+    # Le formatage n'est refait que si la seconde a changé depuis le dernier appel.
+    def strings(self):
+        if not self.configured:
+            self.configure()
+        second = int(time.time())
+        if second != self.last_second:
+            self.last_second = second
+            
+            # Date et heure actuelles dans le fuseau horaire configuré
+            now = datetime.fromtimestamp(second, self.timezone)
+            
+            # Formatage de la date dans le format "jour en lettres-jour-mois-année"
+            if self.use_locale:
+                self.date_str = now.strftime("%A %d-%m-%Y")
+            else:
+                self.date_str = FRENCH_DAY_NAMES[now.weekday()] + now.strftime(" %d-%m-%Y")
+            
+            # Formatage de l'heure dans le format "heures:minutes:secondes"
+            self.time_str = now.strftime("%H:%M:%S")
+        
+        return self.date_str, self.time_str
 
+    # Renvoie les surfaces de texte de la date et de l'heure pour la police et la couleur données
+    # Une surface n'est rendue à nouveau que si son texte a changé.
+    def render(self, font, color):
+        date_str, time_str = self.strings()
+        
+        key = (font, color, date_str)
+        if self.date_surface[0] != key:
+            self.date_surface = (key, font.render(date_str, True, color))
+        
+        key = (font, color, time_str)
+        if self.time_surface[0] != key:
+            self.time_surface = (key, font.render(time_str, True, color))
+        
+        return self.date_surface[1], self.time_surface[1]
 
-# Fonction pour obtenir la date et l'heure actuelles
-# Définition d'une fonction nommée get_date_time pour obtenir la date et l'heure actuelles.
-def get_date_time():
-    
-    # Configuration de la langue en français pour afficher le jour en français
-    locale.setlocale(locale.LC_TIME, "fr_FR.UTF-8")
-    
-    # Définition du fuseau horaire sur 'Europe/Paris' en utilisant le module 'pytz'.
-    timezone = pytz.timezone('Europe/Paris')
-    
-    # Obtention de la date et de l'heure actuelles dans le fuseau horaire spécifié.
-    now = datetime.now(timezone)
-    
-    # Formatage de la date dans le format "jour en lettres-jour-mois-année".
-    date_str = now.strftime("%A %d-%m-%Y")
-    
-    # Formatage de l'heure dans le format "heures:minutes:secondes".
-    time_str = now.strftime("%H:%M:%S")
-    
-    # Retourne la date et l'heure sous forme de chaînes de caractères
-    return date_str, time_str
 
+# Horloge partagée par l'écran d'introduction
+clock_display = ClockDisplay()
 
 
 # Texte de l'histoire du jeu, qui sera affiché avant de commencer l'aventure
@@ -287,60 +727,225 @@ Bonne aventure avec Léo.
 ________________________________________
 """
 
-# Fonction pour couper le texte en plusieurs lignes pour qu'il s'adapte bien à l'écran
-# "text" est le texte à afficher, "font" est la police de caractères utilisée, 
-# "max_width" est la largeur maximum autorisée.
-# Cela crée une liste de lignes à afficher une à une sur l'écran.
-def wrap_text(text, font, max_width):
-    # Divise le texte en une liste de mots en utilisant l'espace comme séparateur.
-    words = text.split(' ')
-
-    # Initialise une liste vide pour stocker les lignes de texte.
-    lines = []
-
-    # Initialise une liste vide pour stocker les mots de la ligne actuelle.
-    current_line = []
-
-    # Parcourt chaque mot dans la liste de mots.
-    for word in words:
-        # Ajoute le mot à la ligne actuelle.
-        current_line.append(word)
-
-        # Calcule la largeur de la ligne actuelle en joignant les mots avec des espaces.
-        width, _ = font.size(' '.join(current_line))
-
-        # Si la largeur de la ligne actuelle dépasse la largeur maximum autorisée.
-        if width > max_width:
-            # Retire le dernier mot ajouté à la ligne actuelle.
-            current_line.pop()
+# Définition de la classe 'WordWrapper' qui coupe un texte en lignes pour une police donnée
+# La largeur de chaque mot distinct (et celle de l'espace) n'est mesurée qu'une seule fois
+# avec "font.size()", puis gardée en cache. Les lignes sont ensuite construites en additionnant
+# les largeurs connues, en un seul passage sur les mots (temps linéaire).
+class WordWrapper:
+    
+    # Initialisation avec la police utilisée pour mesurer les mots
+    def __init__(self, font):
+        self.font = font
+        
+        # Largeur en pixels de chaque mot déjà mesuré
+        self.widths = {}
+        
+        # Largeur en pixels d'un espace entre deux mots
+        self.space_width = font.size(' ')[0]
+
+    # Renvoie la largeur d'un mot, mesurée uniquement lors de sa première utilisation
+    def width(self, word):
+        width = self.widths.get(word)
+        if width is None:
+            width = self.font.size(word)[0]
+            self.widths[word] = width
+        return width
+
+    # Coupe un mot plus large que "max_width" en morceaux qui tiennent chacun sur une ligne
+    # La longueur de chaque morceau est cherchée par dichotomie sur le nombre de caractères.
+    def split_word(self, word, max_width):
+        pieces = []
+        while word:
+            # Plus grand nombre de caractères (au moins un) dont la largeur tient sur la ligne
+            low, high = 1, len(word)
+            while low < high:
+                middle = (low + high + 1) // 2
+                if self.font.size(word[:middle])[0] <= max_width:
+                    low = middle
+                else:
+                    high = middle - 1
+            pieces.append(word[:low])
+            word = word[low:]
+        return pieces
+
+    # Coupe le texte en lignes dont la largeur ne dépasse pas "max_width"
+    # "text" est le texte à afficher (un paragraphe), les mots sont séparés par des espaces.
+    def wrap(self, text, max_width):
+        # Initialise la liste des lignes, les mots de la ligne actuelle et sa largeur
+        lines = []
+        current_line = []
+        current_width = 0
+
+        # Parcourt chaque mot du texte une seule fois
+        for word in text.split(' '):
+            word_width = self.width(word)
+
+            # Un mot trop large pour une ligne entière est coupé en plusieurs morceaux
+            if word_width > max_width:
+                if current_line:
+                    lines.append(' '.join(current_line))
+                pieces = self.split_word(word, max_width)
+                lines.extend(pieces[:-1])
+                current_line = [pieces[-1]]
+                current_width = self.width(pieces[-1])
+                continue
+
+            # Largeur de la ligne si on y ajoute ce mot (avec l'espace qui le précède)
+            new_width = current_width + self.space_width + word_width if current_line else word_width
+            fits = new_width <= max_width
+
+            # La somme des largeurs peut différer d'environ un pixel par mot de la largeur réelle
+            # (crénage, arrondis) : tout près de la limite, la ligne est mesurée exactement.
+            if current_line and abs(new_width - max_width) <= len(current_line) + 1:
+                new_width = self.font.size(' '.join(current_line) + ' ' + word)[0]
+                fits = new_width <= max_width
+
+            # Si le mot ne tient plus, la ligne actuelle est terminée et le mot commence la suivante
+            if not fits and current_line:
+                lines.append(' '.join(current_line))
+                current_line = [word]
+                current_width = word_width
+            else:
+                current_line.append(word)
+                current_width = new_width
 
-            # Ajoute la ligne actuelle à la liste des lignes.
+        # Ajoute la dernière ligne (ou une ligne vide pour un paragraphe vide)
+        if current_line:
             lines.append(' '.join(current_line))
 
-            # Réinitialise la ligne actuelle avec le mot retiré.
-            current_line = [word]
+        # Renvoie la liste des lignes de texte.
+        return lines
 
-    # Si des mots restent dans la ligne actuelle après la boucle.
-    if current_line:
-        # Ajoute la dernière ligne à la liste des lignes.
-        lines.append(' '.join(current_line))
 
-    # Renvoie la liste des lignes de texte.
-    return lines
+# Découpeurs de texte déjà créés, un par police, pour réutiliser les largeurs mesurées
+word_wrappers = {}
 
 
-# Fonction pour faire défiler le texte de l'histoire sur l'écran.
-# Cela affiche le texte ligne par ligne et permet de le faire défiler aussi
-# à l'aide des touches du clavier.
-
-def scroll_text():
-    # Utilisation de la variable globale 'screen' pour accéder à l'écran de jeu.
-    global screen
+# Fonction pour couper le texte en plusieurs lignes pour qu'il s'adapte bien à l'écran
+# "text" est le texte à afficher, "font" est la police de caractères utilisée, 
+# "max_width" est la largeur maximum autorisée.
+# Cela crée une liste de lignes à afficher une à une sur l'écran.
+def wrap_text(text, font, max_width):
+    # Récupère (ou crée) le découpeur associé à cette police
+    wrapper = word_wrappers.get(font)
+    if wrapper is None:
+        wrapper = WordWrapper(font)
+        word_wrappers[font] = wrapper
+    return wrapper.wrap(text, max_width)
+
+
+# Mesure le découpage de tout le texte de l'histoire en lignes.
+# "ancien" est l'ancienne version de "wrap_text()" qui mesurait toute la ligne après
+# chaque mot (coût quadratique), "nouveau" utilise "WordWrapper" et son cache de largeurs.
+@benchmark("decoupage")
+def bench_wrap_text(repeats=50):
+    def old_wrap_text(text, font, max_width):
+        words = text.split(' ')
+        lines = []
+        current_line = []
+        for word in words:
+            current_line.append(word)
+            width, _ = font.size(' '.join(current_line))
+            if width > max_width:
+                current_line.pop()
+                lines.append(' '.join(current_line))
+                current_line = [word]
+        if current_line:
+            lines.append(' '.join(current_line))
+        return lines
 
-    # Création d'une police d'écriture de taille 43 pixels pour le texte.
-    # 'pygame.font.Font(None, 43)' crée une police de caractères de taille 43 pixels.
     font = pygame.font.Font(None, 43)
+    paragraphs = story_text.splitlines()
+    results = {}
+
+    for label, wrap in (("ancien", old_wrap_text), ("nouveau (1er appel)", None), ("nouveau", wrap_text)):
+        if wrap is None:
+            # Premier appel avec une police neuve : toutes les largeurs sont mesurées
+            word_wrappers.pop(font, None)
+            start = time.perf_counter()
+            lines = [line for p in paragraphs for line in wrap_text(p, font, WIDTH - 35)]
+            print(f"{label:<22} {(time.perf_counter() - start) * 1000:8.3f} ms")
+            continue
+        start = time.perf_counter()
+        for _ in range(repeats):
+            lines = [line for p in paragraphs for line in wrap(p, font, WIDTH - 35)]
+        print(f"{label:<22} {(time.perf_counter() - start) * 1000 / repeats:8.3f} ms")
+        results[label] = lines
+
+    print(f"lignes identiques : {results['ancien'] == results['nouveau']} ({len(results['nouveau'])} lignes)")
+
+
+# Définition de la classe 'StoryScroll' qui prépare le texte défilant de l'histoire
+# Les lignes sont rendues une seule fois, par blocs (chunks) de plusieurs lignes,
+# et seulement quand un bloc devient visible. A chaque image, seuls les blocs
+# qui recouvrent l'écran sont affichés : le coût par image reste le même
+# quelle que soit la longueur du texte.
+class StoryScroll:
+    
+    # Initialisation avec les lignes déjà coupées, la police, l'espacement entre lignes
+    # et la couleur du texte.
+    # "chunk_lines" est le nombre de lignes par bloc, "max_chunks" le nombre de blocs
+    # gardés en mémoire en même temps (les plus anciens sont libérés).
+    def __init__(self, lines, font, line_spacing, color, chunk_lines=16, max_chunks=4):
+        self.lines = lines
+        self.font = font
+        self.line_spacing = line_spacing
+        self.color = color
+        self.chunk_lines = chunk_lines
+        self.max_chunks = max_chunks
+        
+        # Hauteur totale du texte (nombre de lignes multiplié par l'espacement entre lignes)
+        self.total_height = len(lines) * line_spacing
+        
+        # Hauteur d'un bloc et marge pour les lettres plus hautes que l'espacement
+        self.chunk_height = chunk_lines * line_spacing
+        self.margin = max(0, font.get_height() - line_spacing) // 2 + 1
+        self.chunk_count = (len(lines) + chunk_lines - 1) // chunk_lines
+        
+        # Blocs déjà rendus, du moins récent au plus récent, et nombre de lignes rendues
+        self.chunks = OrderedDict()
+        self.rendered_lines = 0
+
+    # Renvoie la surface du bloc demandé, rendue lors de sa première utilisation
+    def _chunk(self, index):
+        surface = self.chunks.get(index)
+        if surface is not None:
+            self.chunks.move_to_end(index)
+            return surface
+        
+        # Surface transparente de la largeur de l'écran, avec une marge en haut et en bas
+        surface = pygame.Surface((WIDTH, self.chunk_height + 2 * self.margin), pygame.SRCALPHA)
+        first = index * self.chunk_lines
+        for j, line in enumerate(self.lines[first:first + self.chunk_lines]):
+            # Chaque ligne est centrée horizontalement, et verticalement dans sa place du bloc
+            text_surface = self.font.render(line, True, self.color)
+            center_y = self.margin + j * self.line_spacing + self.line_spacing // 2
+            surface.blit(text_surface, text_surface.get_rect(center=(WIDTH // 2, center_y)))
+            self.rendered_lines += 1
+        
+        # Garde le bloc en cache et libère le moins récent si nécessaire
+        self.chunks[index] = surface
+        if len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+        return surface
+
+    # Affiche la partie visible du texte sur "target" pour la position de défilement "scroll_y"
+    # Comme avant, le centre de la ligne "i" est placé à "scroll_y + i * line_spacing".
+    def draw(self, target, scroll_y):
+        # Position du haut du premier bloc sur l'écran
+        top = scroll_y - self.line_spacing // 2
+        
+        # Indices du premier et du dernier bloc qui recouvrent l'écran
+        first = max(0, (-top - self.margin) // self.chunk_height)
+        last = min(self.chunk_count - 1, (HEIGHT - top + self.margin) // self.chunk_height)
+        
+        for index in range(first, last + 1):
+            target.blit(self._chunk(index), (0, top + index * self.chunk_height - self.margin))
 
+
+# Fonction qui découpe le texte de l'histoire en lignes avec la police donnée
+# et prépare son défilement
+def create_story_scroll(font):
     # La largeur maximale du texte est la largeur de la fenêtre (WIDTH) 
     # moins 35 pixels de marge.
     # 'max_text_width' est la largeur maximale autorisée pour le texte.
@@ -357,301 +962,784 @@ def scroll_text():
         # 'wrap_text(paragraph, font, max_text_width)' renvoie une liste de lignes formatées.
         wrapped_text.extend(wrap_text(paragraph, font, max_text_width))
 
-    # Initialisation de la position 'Y' de défilement, commence hors de l'écran en bas.
-    # 'scroll_y' est la position verticale de défilement du texte.
-    scroll_y = HEIGHT
-
     # Espacement entre chaque ligne, fixé à 35 pixels.
     # 'line_spacing' est l'espacement vertical entre chaque ligne de texte.
     line_spacing = 35
 
-    # Hauteur totale du texte (nombre de lignes multiplié par l'espacement entre lignes).
-    # 'total_height' est la hauteur totale du texte à afficher.
-    total_height = len(wrapped_text) * line_spacing
+    # Préparation du texte défilant : les lignes seront rendues une seule fois, par blocs,
+    # au lieu d'être rendues à nouveau à chaque image.
+    return StoryScroll(wrapped_text, font, line_spacing, OR)
 
-    # Vitesse de défilement initiale fixée à 1 pixel par image.
-    # 'scroll_speed' est la vitesse à laquelle le texte défile.
-    scroll_speed = 1
 
-    # Variable pour savoir si on est en mode plein écran ou non.
-    # 'fullscreen' est une variable qui indique si le jeu est en mode plein écran.
-    fullscreen = False
-
-    # Indicateur pour savoir si le jeu est en cours d'exécution.
-    # 'running' est une variable qui indique si le jeu est en cours d'exécution.
-    running = True
+# Fonction qui dessine une image de l'introduction sur la surface "target" :
+# la date et l'heure, l'image de Léo et la partie visible du texte de l'histoire
+# "scroll_y" est la position verticale de la première ligne du texte.
+def draw_intro_frame(target, story_scroll, font, scroll_y):
+    # Efface le contenu de l'écran en le remplissant entièrement de noir.
+    # "target.fill(BLACK)" applique une couleur noire à toute la surface de l'écran 
+    # pour le réinitialiser.
+    target.fill(BLACK)
+    
+    # Obtention et affichage de la date et de l'heure
+    # "clock_display.render()" renvoie les surfaces de la date et de l'heure 
+    # avec la police spécifiée et en blanc ; elles ne sont rendues à nouveau 
+    # que lorsque la seconde affichée change.
+    date_surface, time_surface = clock_display.render(font, WHITE)
+
+
+    # Positionnement de la date et de l'heure.
+    # Création d'un rectangle pour centrer l'affichage de la date
+    # Le centre du rectangle est positionné horizontalement au milieu de l'écran (WIDTH // 2)
+    # et verticalement à 20 pixels depuis le haut de l'écran
+    date_rect = date_surface.get_rect(center=(WIDTH // 2, 20))
+    # Création d'un rectangle pour centrer l'affichage de l'heure
+    # Le centre du rectangle est positionné horizontalement au milieu de l'écran (WIDTH // 2)
+    # et verticalement à une position de HEIGHT - 400, soit 400 pixels 
+    # au-dessus du bas de l'écran
+    time_rect = time_surface.get_rect(center=(WIDTH // 2, HEIGHT - 400))
+    
+    # Affichage de la date et de l'heure
+    # Affichage de la surface contenant la date '(date_surface)' 
+    # à la position définie par 'date_rect'
+    # Cela permet de dessiner le texte de la date sur l'écran 
+    # aux coordonnées spécifiées par 'date_rect'
+    target.blit(date_surface, date_rect)
+    # Affichage de la surface contenant l'heure '(time_surface)' 
+    # à la position définie par 'time_rect'
+    # Cela permet de dessiner le texte de l'heure sur l'écran 
+    # aux coordonnées spécifiées par 'time_rect'
+    target.blit(time_surface, time_rect)
+    
+    # Prépare la position de l'image d'introduction pour l'afficher au centre de l'écran
+    # Utilise "get_rect()" pour obtenir un rectangle autour de l'image 
+    # et le centre à une position spécifique.
+    # "(WIDTH // 2, HEIGHT // 2 - 190)" place le centre de l'image horizontalement 
+    # au milieu de l'écran
+    # et 190 pixels au-dessus du centre vertical
+    intro_image = get_intro_image()
+    intro_image_rect = intro_image.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 190))
+    
+    
+    # Affiche l'image d'introduction sur l'écran aux coordonnées spécifiées 
+    # par "intro_image_rect".
+    # "target.blit(intro_image, intro_image_rect)". 
+    # dessine l'image sur l'écran en fonction du rectangle défini.
+    target.blit(intro_image, intro_image_rect)
+
+    # Affiche uniquement la partie visible du texte de l'histoire.
+    # "story_scroll.draw()" dessine les blocs de lignes déjà rendus qui recouvrent l'écran,
+    # chaque ligne "i" étant centrée à la hauteur "scroll_y + i * line_spacing".
+    story_scroll.draw(target, scroll_y)
+
+
+# Définition de la classe 'TimedWait' : une attente de "duration_ms" millisecondes
+# qui avance avec le temps écoulé à chaque image, au lieu de bloquer tout le jeu 
+# avec "pygame.time.delay()". Pendant l'attente, les scènes continuent à traiter les événements 
+# (fermeture de la fenêtre, plein écran) et à se dessiner : la fenêtre ne se fige plus.
+class TimedWait:
+
+    def __init__(self, duration_ms):
+        self.duration = duration_ms
+        self.elapsed = 0
+
+    # Fait avancer l'attente de "elapsed_ms" millisecondes et indique si elle est terminée
+    def update(self, elapsed_ms):
+        self.elapsed += elapsed_ms
+        return self.done
+
+    # Recommence une nouvelle attente de même durée, en gardant le temps déjà dépassé
+    # (les chiffres du compte à rebours restent ainsi espacés d'une seconde exactement)
+    def restart(self):
+        self.elapsed = max(0, self.elapsed - self.duration)
+
+    @property
+    def done(self):
+        return self.elapsed >= self.duration
+
+    # Avancement de l'attente, de 0 (début) à 1 (terminée)
+    @property
+    def progress(self):
+        if self.duration <= 0:
+            return 1.0
+        return min(1.0, self.elapsed / self.duration)
+
+
+# Définition de la classe 'Scene' : une étape du jeu (introduction, compte à rebours, partie,
+# fin de partie, victoire). Le gestionnaire de scènes ("SceneManager") appelle à chaque image :
+# "handle_event()" pour chaque événement, puis "update()" avec le temps écoulé, puis "draw()".
+# Pour passer à l'étape suivante, une scène appelle "switch_to()" avec la nouvelle scène :
+# le gestionnaire change de scène à la fin de l'image, sans appel imbriqué 
+# (la pile d'appels et la mémoire restent les mêmes, quel que soit le nombre de parties).
+class Scene:
+    
+    # Nombre maximal d'images par seconde de la scène
+    frame_rate = 60
+    
+    # Attente maximale d'un événement, en millisecondes, quand la scène est au repos
+    # (voir "is_idle()")
+    idle_timeout = 1000
+
+    def __init__(self):
+        self.manager = None
+        self.next_scene = None
+
+    # Appelée quand la scène devient la scène active
+    def enter(self, manager):
+        self.manager = manager
+
+    # Appelée quand la scène est quittée (scène suivante ou fermeture du jeu)
+    def exit(self):
+        pass
+
+    # Demande le passage à la scène "scene" à la fin de l'image
+    def switch_to(self, scene):
+        self.next_scene = scene
+
+    # Traite un événement propre à la scène (les événements communs, comme la fermeture
+    # de la fenêtre ou le plein écran, sont traités par le gestionnaire)
+    def handle_event(self, event):
+        pass
+
+    # Fait avancer la scène de "elapsed_ms" millisecondes
+    def update(self, elapsed_ms):
+        pass
+
+    # Dessine la scène sur l'écran
+    def draw(self):
+        pass
+
+    # Appelée quand la surface de l'écran change (passage en plein écran ou retour)
+    # ou doit être entièrement redessinée (fenêtre revenue au premier plan)
+    def screen_changed(self):
+        pass
+
+    # Indique si la scène est au repos : elle n'a rien à animer et attend une action du joueur.
+    # Le gestionnaire de scènes attend alors le prochain événement (au plus "idle_timeout" ms)
+    # au lieu de faire "frame_rate" images par seconde : le processeur ne travaille plus.
+    def is_idle(self):
+        return False
+
+    # Nombre d'objets de la scène, affichés par le profileur
+    # Toutes les scènes montrent les textes servis par le cache de textes à la dernière image
+    # (hits) et ceux qu'il a fallu rendre (misses), puis le cache des images : nombre d'images,
+    # mémoire occupée et nombre d'images retirées depuis le lancement (évictions).
+    def profile_counts(self):
+        return {"textes": f"{text_cache.last_frame_hits}/{text_cache.last_frame_misses}",
+                "images": f"{len(asset_cache.surfaces)} ({asset_cache.bytes / 1048576:.1f} Mo)",
+                "évictions": asset_cache.evictions}
+
+
+# Définition de la classe 'IntroScene' pour faire défiler le texte de l'histoire sur l'écran.
+# Cela affiche le texte ligne par ligne et permet de le faire défiler plus ou moins vite
+# à l'aide des flèches "Haut" et "Bas" du clavier.
+class IntroScene(Scene):
+    
+    # Le texte défile à 30 images par seconde
+    frame_rate = 30
 
-    # Boucle tant que la variable 'running' est vraie.
-    while running:
+    def enter(self, manager):
+        super().enter(manager)
         
-        # Efface le contenu de l'écran en le remplissant entièrement de noir.
-        # "screen.fill(BLACK)" applique une couleur noire à toute la surface de l'écran 
-        # pour le réinitialiser.
-        screen.fill(BLACK)
+        # Création d'une police d'écriture de taille 43 pixels pour le texte.
+        # 'pygame.font.Font(None, 43)' crée une police de caractères de taille 43 pixels.
+        self.font = pygame.font.Font(None, 43)
+        
+        # Texte de l'histoire découpé en lignes et préparé pour le défilement
+        # (voir la fonction "create_story_scroll")
+        self.story_scroll = create_story_scroll(self.font)
+        
+        # Initialisation de la position 'Y' de défilement, commence hors de l'écran en bas.
+        # 'scroll_y' est la position verticale de défilement du texte.
+        self.scroll_y = HEIGHT
+        
+        # Vitesse de défilement initiale fixée à 1 pixel par image.
+        # 'scroll_speed' est la vitesse à laquelle le texte défile.
+        self.scroll_speed = 1
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            # Vérifie si la touche enfoncée est la flèche "Haut" :
+            # augmente la vitesse de défilement d'une unité, avec un maximum de 5
+            if event.key == pygame.K_UP:
+                self.scroll_speed = min(self.scroll_speed + 1, 5)
+            
+            # Vérifie si la touche enfoncée est la flèche "Bas" : réduit la vitesse 
+            # de défilement d'une unité, avec un minimum de 0 (arrêt complet)
+            elif event.key == pygame.K_DOWN:
+                self.scroll_speed = max(self.scroll_speed - 1, 0)
+
+    def draw(self):
+        # Dessine l'image d'introduction : date, heure, image de Léo et texte de l'histoire,
+        # puis rafraîchit l'écran pour que les modifications soient affichées.
+        draw_intro_frame(screen, self.story_scroll, self.font, self.scroll_y)
+        draw_loading_bar(screen, asset_loader)
+        game_display.present()
+
+    def update(self, elapsed_ms):
+        # Range dans les caches les éléments chargés en arrière-plan depuis l'image précédente
+        asset_loader.poll()
         
-        # Obtention et affichage de la date et de l'heure
-        # Appel de la fonction 'get_date_time' pour obtenir 
-        # la date et l'heure actuelles sous forme de chaînes
-        date_str, time_str = get_date_time()
-
-        # Rendu de la date sous forme de texte avec la police spécifiée et en blanc.
-        date_surface = font.render(date_str, True, WHITE)
-
-        # Rendu de l'heure sous forme de texte avec la police spécifiée et en blanc.
-        time_surface = font.render(time_str, True, WHITE)
-
-    
-        # Positionnement de la date et de l'heure.
-        # Création d'un rectangle pour centrer l'affichage de la date
-        # Le centre du rectangle est positionné horizontalement au milieu de l'écran (WIDTH // 2)
-        # et verticalement à 20 pixels depuis le haut de l'écran
-        date_rect = date_surface.get_rect(center=(WIDTH // 2, 20))
-        # Création d'un rectangle pour centrer l'affichage de l'heure
-        # Le centre du rectangle est positionné horizontalement au milieu de l'écran (WIDTH // 2)
-        # et verticalement à une position de HEIGHT - 400, soit 400 pixels 
-        # au-dessus du bas de l'écran
-        time_rect = time_surface.get_rect(center=(WIDTH // 2, HEIGHT - 400))
-        
-        # Affichage de la date et de l'heure
-        # Affichage de la surface contenant la date '(date_surface)' 
-        # à la position définie par 'date_rect'
-        # Cela permet de dessiner le texte de la date sur l'écran 
-        # aux coordonnées spécifiées par 'date_rect'
-        screen.blit(date_surface, date_rect)
-        # Affichage de la surface contenant l'heure '(time_surface)' 
-        # à la position définie par 'time_rect'
-        # Cela permet de dessiner le texte de l'heure sur l'écran 
-        # aux coordonnées spécifiées par 'time_rect'
-        screen.blit(time_surface, time_rect)
-        
-        # Prépare la position de l'image d'introduction pour l'afficher au centre de l'écran
-        # Utilise "get_rect()" pour obtenir un rectangle autour de l'image 
-        # et le centre à une position spécifique.
-        # "(WIDTH // 2, HEIGHT // 2 - 190)" place le centre de l'image horizontalement 
-        # au milieu de l'écran
-        # et 190 pixels au-dessus du centre vertical
-        intro_image_rect = intro_image.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 190))
-        
-        
-        # Affiche l'image d'introduction sur l'écran aux coordonnées spécifiées 
-        # par "intro_image_rect".
-        # "screen.blit(intro_image, intro_image_rect)". 
-        # dessine l'image sur l'écran en fonction du rectangle défini.
-        screen.blit(intro_image, intro_image_rect)
-
-        # Boucle à travers chaque ligne du texte en utilisant 
-        # son index et le contenu de la ligne.
-        for i, line in enumerate(wrapped_text):
-            # Rend la ligne de texte actuelle sur une nouvelle surface de texte.
-            # "font.render()" dessine le texte sur une surface, prenant comme paramètres la ligne,
-            # une valeur True pour lisser le texte (anti-aliasing), 
-            # et la couleur du texte (ici "OR")
-            text_surface = font.render(line, True, OR)
-            # Crée un rectangle autour de la surface de texte pour le positionnement.
-            # "text_surface.get_rect()" crée un rectangle pour la surface de texte,
-            # "center=" le centre à une position spécifique.
-            # Ici, "WIDTH // 2" positionne horizontalement au centre, et
-            # "scroll_y + i * line_spacing" ajuste verticalement 
-            # en fonction du défilement et de l'espacement.
-            text_rect = text_surface.get_rect(center=(WIDTH // 2, scroll_y + i * line_spacing))
-            # Affiche la surface de texte sur l'écran à la position définie par text_rect.
-            # "screen.blit()" dessine la surface de texte sur l'écran 
-            # aux coordonnées définies par le rectangle.
-            screen.blit(text_surface, text_rect)
-
         # Défilement du texte vers le haut en fonction de la vitesse.
-        scroll_y -= scroll_speed
+        self.scroll_y -= self.scroll_speed
+        
+        # Lorsque tout le texte a défilé hors de l'écran, le compte à rebours commence
+        if self.scroll_y + self.story_scroll.total_height < 0:
+            self.switch_to(CountdownScene())
 
-        # Vérifie si tout le texte a défilé hors de l'écran, si c'est le cas 
-        # la boucle doit être arrêtée.
-        if scroll_y + total_height < 0:
-            # Définit la variable "running" sur False pour arrêter la boucle
-            running = False
 
-        # Parcourt chaque événement qui a eu lieu depuis le dernier appel pour les gérer un par un
-        for event in pygame.event.get():
-            # Vérifie si l'événement actuel est de type "QUIT" (l'utilisateur veut quitter le jeu)
-            if event.type == pygame.QUIT:
-                # Ferme Pygame correctement
-                pygame.quit()
-                # Arrête le programme en fermant Python
-                sys.exit()
-            
-            # Vérifie si une touche du clavier a été enfoncée
-            elif event.type == pygame.KEYDOWN:
-                # Vérifie si la touche enfoncée est "f" pour basculer en mode plein écran
-                if event.key == pygame.K_f:
-                    # Inverse l'état du plein écran : si activé, le désactive, et vice versa
-                    fullscreen = not fullscreen
-
-
-                    # Si le mode plein écran est activé
-                    if fullscreen:
-                        # Redimensionne la fenêtre pour s'afficher en plein écran
-                        screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
-                        
-                    # Si le mode plein écran est désactivé
-                    else:
-                        # Redimensionne la fenêtre à sa taille d'origine sans le plein écran
-                        screen = pygame.display.set_mode((WIDTH, HEIGHT))
-                        
-                        
-                # Vérifie si la touche enfoncée est la flèche "Haut"
-                elif event.key == pygame.K_UP:
-                    # Augmente la vitesse de défilement d'une unité, avec un maximum de 5
-                    scroll_speed = min(scroll_speed + 1, 5)
-                    
-                    
-                # Vérifie si la touche enfoncée est la flèche "Bas"
-                elif event.key == pygame.K_DOWN:
-                    # Réduit la vitesse de défilement d'une unité, 
-                    # avec un minimum de 0 (arrêt complet)
-                    scroll_speed = max(scroll_speed - 1, 0)
-                    
-
-        # Rafraîchit l'écran pour que les modifications soient affichées.
-        pygame.display.flip()
-        # Contrôle la vitesse de la boucle pour la limiter à 30 images par seconde.
-        pygame.time.Clock().tick(30)
-        
 
-# Définition de la fonction 'countdown', qui gère le décompte avant le début du jeu
-# Cette fonction affichera un compte à rebours de 5 à 0 pour annoncer le début de l'aventure
-def countdown():
-    # Crée une police de caractères de taille 95 pour afficher 
-    # les grands chiffres du compte à rebours
-    font = pygame.font.Font(None, 95)
+# Mesure le coût d'une image du texte défilant pour l'histoire actuelle 
+# et pour une histoire 20 fois plus longue.
+# "ancien" rend chaque ligne à chaque image, "par blocs" utilise "StoryScroll" :
+# son coût doit rester le même quelle que soit la longueur du texte.
+@benchmark("histoire")
+def bench_story_scroll(frames=300):
+    font = pygame.font.Font(None, 43)
+    base_lines = []
+    for paragraph in story_text.splitlines():
+        base_lines.extend(wrap_text(paragraph, font, WIDTH - 35))
+
+    for label, lines in (("histoire x1", base_lines), ("histoire x20", base_lines * 20)):
+        story_scroll = StoryScroll(lines, font, 35, OR)
+        state = {"scroll_y": HEIGHT}
+
+        def old_frame():
+            for i, line in enumerate(lines):
+                text_surface = font.render(line, True, OR)
+                screen.blit(text_surface, text_surface.get_rect(center=(WIDTH // 2, state["scroll_y"] + i * 35)))
+            state["scroll_y"] -= 5
+
+        def chunk_frame():
+            story_scroll.draw(screen, state["scroll_y"])
+            state["scroll_y"] -= 5
+
+        average, worst = measure_frames(old_frame, frames // 10)
+        print(f"{label + ' ancien':<24} moyenne {average:7.3f} ms   pire {worst:7.3f} ms")
+        state["scroll_y"] = HEIGHT
+        average, worst = measure_frames(chunk_frame, frames)
+        print(f"{label + ' par blocs':<24} moyenne {average:7.3f} ms   pire {worst:7.3f} ms")
+
+
+# Fonction qui dessine une image du compte à rebours sur la surface "target" :
+# le texte d'introduction, le chiffre "i" et deux arcs de cercle proportionnels 
+# au temps restant ("i" sur "total_time")
+def draw_countdown_frame(target, font, countdown_surface, i, total_time, max_radius):
+    # Remplit l'écran avec la couleur noire pour effacer l'image précédente
+    # Cela garantit que chaque chiffre du compte à rebours apparaît 
+    # proprement sans chevauchement
+    target.fill(BLACK)
+    # Affiche le texte d'introduction du compte à rebours au centre de l'écran
+    # "target.blit()" dessine la surface de texte 
+    # (countdown_surface) aux coordonnées spécifiées
+    # WIDTH // 2 - 300 positionne le texte horizontalement au centre moins 300 pixels,
+    # HEIGHT // 2 - 130 positionne le texte verticalement légèrement au-dessus du centre
+    target.blit(countdown_surface, (WIDTH // 2 - 300, HEIGHT // 2 - 130))
+
+
+    # Convertit le chiffre actuel du compte à rebours en texte 
+    # et crée une surface pour l'afficher
+    # "font.render(str(i), True, WHITE)" 
+    # transforme le chiffre en chaîne de caractères avec "str(i)",
+    # puis le rend (dessine) sur une surface avec une couleur blanche (WHITE) 
+    # et anti-aliasing activé (True)
+    count_surface = font.render(str(i), True, WHITE)
+    
     
-    # Définition du texte qui sera affiché en haut, avant le compte à rebours
-    countdown_text = "La quête de Léo va commencer dans :"
+    # Affiche le chiffre du compte à rebours au centre de l'écran
+    # "target.blit(count_surface, (WIDTH // 2 - 20, HEIGHT // 2))" 
+    # place l'image du chiffre au centre,
+    # en ajustant horizontalement de -20 pixels pour un centrage plus précis
+    target.blit(count_surface, (WIDTH // 2 - 20, HEIGHT // 2))
     
-    # Création de la surface contenant le texte de compte à rebours
-    # Ici, "pygame.font.Font(None, 50)" définit une police de taille 50
-    # ".render()" transforme le texte en une image (surface), 
-    # avec "True" pour lisser les bords et la couleur "WHITE"
-    countdown_surface = pygame.font.Font(None, 50).render(countdown_text, True, WHITE)
     
-    # Variable qui stocke la durée totale du compte à rebours en secondes, 
-    # ici 5 secondes pour aller de 9 à 0
-    total_time = 9
+    # Calcule l'angle de l'arc de cercle à afficher autour du chiffre, 
+    # proportionnel au temps restant
+    # "(i / total_time) * 360" calcule une portion de cercle : 
+    # on divise le temps restant (i) par le temps total,
+    # puis on multiplie par 360 pour obtenir l'angle correspondant en degrés
+    angle = (i / total_time) * 360
+    
 
-    # Définition de la taille maximale du rayon pour dessiner un arc de cercle 
-    # autour du compte à rebours
-    # Cet arc montrera visuellement le temps restant
-    max_radius = 110
+    # Dessine un arc de cercle rouge qui représente le temps restant 
+    # avant la fin du compte à rebours
+    # "pygame.draw.arc()" crée un arc de cercle sur l'écran ; 
+    # on utilise "target" pour le dessiner
+    # "(255, 0, 0)" définit la couleur rouge ; 
+    # le tuple 
+    # (WIDTH // 2 - max_radius, HEIGHT // 2 - max_radius + 40, 2 * max_radius, 2 * max_radius)
+    # définit la position et la taille de l'arc centré sur l'écran avec 
+    # un décalage vertical de 40 pixels.
+    # Le 0 est l'angle de départ (en radians), 
+    # et "angle * (math.pi / 180)" convertit l'angle en degrés en radians
+    # "max_radius" définit l'épaisseur de l'arc
+    pygame.draw.arc(target, (255, 0, 0), (WIDTH // 2 - max_radius, HEIGHT // 2 - max_radius + 40, 2 * max_radius, 2 * max_radius), 0, angle * (math.pi / 180), max_radius)
+    
+    
+    # Rend le chiffre actuel du compte à rebours sur une surface de texte pour affichage
+    # Ici, "font.render(str(i), True, WHITE)" 
+    # convertit le chiffre "i" en texte avec la couleur blanche (WHITE)
+    count_surface = font.render(str(i), True, WHITE)
+    
     
+    # Affiche le chiffre du compte à rebours au centre de l'écran
+    # "target.blit(count_surface, (WIDTH // 2 - 20, HEIGHT // 2))" 
+    # place la surface contenant le chiffre au centre
+    target.blit(count_surface, (WIDTH // 2 - 20, HEIGHT // 2))
+    
+    
+    # Dessine un deuxième arc de cercle, plus fin et de couleur verte, 
+    # pour indiquer le même temps restant
+    # "pygame.draw.arc()" crée cet arc sur l'écran avec la couleur verte (GREEN)
+    # Les mêmes paramètres de position et taille sont utilisés, 
+    # mais l'épaisseur est de 10 pixels cette fois-ci
+    pygame.draw.arc(target, GREEN, (WIDTH // 2 - max_radius, HEIGHT // 2 - max_radius + 40, 2 * max_radius, 2 * max_radius), 0, angle * (math.pi / 180), 10)
+
+
+# Définition de la classe 'CountdownScene', qui gère le décompte avant le début du jeu
+# Cette scène affiche un compte à rebours de 9 à 0 pour annoncer le début de l'aventure,
+# un chiffre par seconde, puis lance la partie.
+class CountdownScene(Scene):
+    
+    # Le chiffre et les arcs sont redessinés 30 fois par seconde
+    frame_rate = 30
 
-    # Boucle de décompte qui commence à la valeur de "total_time" (5) et va jusqu'à -1
-    # La boucle décrémente de 1 à chaque itération pour afficher le compte à rebours de 5 à 0
-    for i in range(total_time, -1, -1):
-        # Remplit l'écran avec la couleur noire pour effacer l'image précédente
-        # Cela garantit que chaque chiffre du compte à rebours apparaît 
-        # proprement sans chevauchement
-        screen.fill(BLACK)
-        # Affiche le texte d'introduction du compte à rebours au centre de l'écran
-        # "screen.blit()" dessine la surface de texte 
-        # (countdown_surface) aux coordonnées spécifiées
-        # WIDTH // 2 - 300 positionne le texte horizontalement au centre moins 300 pixels,
-        # HEIGHT // 2 - 130 positionne le texte verticalement légèrement au-dessus du centre
-        screen.blit(countdown_surface, (WIDTH // 2 - 300, HEIGHT // 2 - 130))
-
-
-        # Convertit le chiffre actuel du compte à rebours en texte 
-        # et crée une surface pour l'afficher
-        # "font.render(str(i), True, WHITE)" 
-        # transforme le chiffre en chaîne de caractères avec "str(i)",
-        # puis le rend (dessine) sur une surface avec une couleur blanche (WHITE) 
-        # et anti-aliasing activé (True)
-        count_surface = font.render(str(i), True, WHITE)
-        
-        
-        # Affiche le chiffre du compte à rebours au centre de l'écran
-        # "screen.blit(count_surface, (WIDTH // 2 - 20, HEIGHT // 2))" 
-        # place l'image du chiffre au centre,
-        # en ajustant horizontalement de -20 pixels pour un centrage plus précis
-        screen.blit(count_surface, (WIDTH // 2 - 20, HEIGHT // 2))
-        
-        
-        # Calcule l'angle de l'arc de cercle à afficher autour du chiffre, 
-        # proportionnel au temps restant
-        # "(i / total_time) * 360" calcule une portion de cercle : 
-        # on divise le temps restant (i) par le temps total,
-        # puis on multiplie par 360 pour obtenir l'angle correspondant en degrés
-        angle = (i / total_time) * 360
-        
-
-        # Dessine un arc de cercle rouge qui représente le temps restant 
-        # avant la fin du compte à rebours
-        # "pygame.draw.arc()" crée un arc de cercle sur l'écran ; 
-        # on utilise "screen" pour le dessiner
-        # "(255, 0, 0)" définit la couleur rouge ; 
-        # le tuple 
-        # (WIDTH // 2 - max_radius, HEIGHT // 2 - max_radius + 40, 2 * max_radius, 2 * max_radius)
-        # définit la position et la taille de l'arc centré sur l'écran avec 
-        # un décalage vertical de 40 pixels.
-        # Le 0 est l'angle de départ (en radians), 
-        # et "angle * (math.pi / 180)" convertit l'angle en degrés en radians
-        # "max_radius" définit l'épaisseur de l'arc
-        pygame.draw.arc(screen, (255, 0, 0), (WIDTH // 2 - max_radius, HEIGHT // 2 - max_radius + 40, 2 * max_radius, 2 * max_radius), 0, angle * (math.pi / 180), max_radius)
-        
-        
-        # Rend le chiffre actuel du compte à rebours sur une surface de texte pour affichage
-        # Ici, "font.render(str(i), True, WHITE)" 
-        # convertit le chiffre "i" en texte avec la couleur blanche (WHITE)
-        count_surface = font.render(str(i), True, WHITE)
-        
-        
-        # Affiche le chiffre du compte à rebours au centre de l'écran
-        # "screen.blit(count_surface, (WIDTH // 2 - 20, HEIGHT // 2))" 
-        # place la surface contenant le chiffre au centre
-        screen.blit(count_surface, (WIDTH // 2 - 20, HEIGHT // 2))
-        
-        
-        # Dessine un deuxième arc de cercle, plus fin et de couleur verte, 
-        # pour indiquer le même temps restant
-        # "pygame.draw.arc()" crée cet arc sur l'écran avec la couleur verte (GREEN)
-        # Les mêmes paramètres de position et taille sont utilisés, 
-        # mais l'épaisseur est de 10 pixels cette fois-ci
-        pygame.draw.arc(screen, GREEN, (WIDTH // 2 - max_radius, HEIGHT // 2 - max_radius + 40, 2 * max_radius, 2 * max_radius), 0, angle * (math.pi / 180), 10)
-        
-        
-        # Met à jour l'écran pour afficher l'arc de cercle et le chiffre du compte à rebours
-        # "pygame.display.flip()" rafraîchit l'écran avec les nouveaux éléments affichés
-        pygame.display.flip()
+    def enter(self, manager):
+        super().enter(manager)
+        
+        # Crée une police de caractères de taille 95 pour afficher 
+        # les grands chiffres du compte à rebours
+        self.font = pygame.font.Font(None, 95)
         
+        # Création de la surface contenant le texte affiché en haut, avant le compte à rebours
+        # Ici, "pygame.font.Font(None, 50)" définit une police de taille 50
+        # ".render()" transforme le texte en une image (surface), 
+        # avec "True" pour lisser les bords et la couleur "WHITE"
+        self.countdown_surface = pygame.font.Font(None, 50).render("La quête de Léo va commencer dans :", True, WHITE)
         
-        # Attend une seconde avant de passer au chiffre suivant pour créer l'effet de décompte
-        # "pygame.time.delay(1000)" retarde le programme d'exactement 1000 millisecondes, 
-        # soit 1 seconde
-        pygame.time.delay(1000)
+        # Durée totale du compte à rebours en secondes (de 9 à 0)
+        self.total_time = 9
         
+        # Taille maximale du rayon de l'arc de cercle qui montre le temps restant
+        self.max_radius = 110
         
+        # Chiffre actuellement affiché, et attente d'une seconde avant le chiffre suivant
+        self.count = self.total_time
+        self.step = TimedWait(1000)
+        
+        # La partie ne commence qu'une fois ses images et ses sons chargés : le chargement
+        # est démarré ici s'il ne l'a pas déjà été au lancement du jeu (voir "main()")
+        asset_loader.start()
+
+    def update(self, elapsed_ms):
+        # Range dans les caches les éléments chargés en arrière-plan depuis l'image précédente
+        asset_loader.poll()
         
+        # Chaque chiffre reste affiché une seconde pour créer l'effet de décompte ;
+        # après le 0, la partie commence dès que tous les éléments de la partie sont chargés
+        # (sur une machine très lente, le 0 reste affiché avec la barre de chargement)
+        if self.step.update(elapsed_ms):
+            if self.count > 0:
+                self.step.restart()
+                self.count -= 1
+            elif asset_loader.ready:
+                self.switch_to(PlayScene())
+
+    def draw(self):
+        # Dessine le texte d'introduction, le chiffre actuel et les arcs de cercle,
+        # puis met à jour l'écran
+        draw_countdown_frame(screen, self.font, self.countdown_surface, self.count, self.total_time, self.max_radius)
+        draw_loading_bar(screen, asset_loader)
+        game_display.present()
+
+
+
+# Liste des fichiers d'image de fond disponibles dans le dossier du projet
+# Chaque fichier correspond à une image de fond possible que l'on pourra afficher dans le jeu
+BACKGROUND_FILES = ["background1.png", "background2.png", "background3.png", "background4.png", "background5.png", "background6.png"]
 
-# Fonction qui charge aléatoirement un fond d'écran parmi plusieurs options disponibles
+
+# Fonction qui charge un fond d'écran depuis le disque et le prépare pour l'affichage,
+# sans passer par le cache des images
+def load_background_from_disk(filename):
+    
+    # Charge l'image de fond, la convertit pour être compatible avec l'affichage dans Pygame
+    # (".convert()" optimise l'image pour un affichage plus rapide, sans transparence)
+    # et la redimensionne pour qu'elle corresponde exactement à la taille de la fenêtre du jeu
+    # ("pygame.transform.scale" ajuste la taille de l'image aux dimensions WIDTH et HEIGHT)
+    return build_sprite_variant(filename, (WIDTH, HEIGHT), alpha=False)
+
+
+# Fonction qui choisit aléatoirement un fond d'écran parmi plusieurs options disponibles
 # Cela permet de changer l'apparence du jeu durant chaque partie pour plus de variété visuelle
 def load_random_background():
     
-    # Liste des fichiers d'image de fond disponibles dans le dossier du projet
-    # Chaque fichier correspond à une image de fond possible que l'on pourra afficher dans le jeu
-    backgrounds = ["background1.png", "background2.png", "background3.png", "background4.png", "background5.png", "background6.png"]
+    # Sélectionne un fond aléatoirement et le prend dans le cache des images ("asset_cache")
+    # "random.choice()" choisit un des fichiers de la liste au hasard ; le fond n'est lu
+    # et redimensionné que s'il n'est pas dans le cache. Le chargeur d'arrière-plan y range
+    # tous les fonds pendant l'introduction : un changement de niveau ne lit donc plus 
+    # aucun fichier sur le disque pendant la boucle de jeu.
+    return asset_cache.get(random.choice(BACKGROUND_FILES), (WIDTH, HEIGHT), alpha=False)
+
+
+# Mesure le coût d'une image de changement de niveau par rapport à une image normale.
+# "image normale" : affichage du fond + rafraîchissement de l'écran.
+# "changement de niveau" : même chose, avec un nouveau fond choisi dans le cache.
+# "sans cache" : ancien comportement, avec lecture et redimensionnement du fichier.
+@benchmark("fonds")
+def bench_backgrounds(frames=60):
+    
+    # Les fonds sont déjà dans le cache des images, comme après le chargement en arrière-plan
+    for filename in BACKGROUND_FILES:
+        asset_cache.get(filename, (WIDTH, HEIGHT), alpha=False)
+    background = load_random_background()
+
+    def normal_frame():
+        screen.blit(background, (0, 0))
+        game_display.present()
+
+    def level_up_frame():
+        screen.blit(load_random_background(), (0, 0))
+        game_display.present()
+
+    def uncached_frame():
+        screen.blit(load_background_from_disk(random.choice(BACKGROUND_FILES)), (0, 0))
+        game_display.present()
+
+    for label, frame_func, count in (("image normale", normal_frame, frames),
+                                     ("changement de niveau", level_up_frame, frames),
+                                     ("sans cache (ancien)", uncached_frame, 6)):
+        average, worst = measure_frames(frame_func, count)
+        print(f"{label:<22} moyenne {average:7.3f} ms   pire {worst:7.3f} ms")
+
+
+# Caractéristiques de chaque type d'obstacle : fichier image, taille en pixels 
+# et vitesse de base (à laquelle s'ajoute le niveau actuel)
+OBSTACLE_TYPES = {
+    "small": ("obstacle_small.png", (25, 25), 7),
+    "medium": ("obstacle_medium.png", (45, 45), 5),
+    "large": ("obstacle_large.png", (65, 65), 3),
+}
+
+# Taille (pour un affichage de 800 x 600) des images du jeu autres que les fonds et les obstacles :
+# joueur, power-up, coupe de l'écran de victoire et image d'introduction
+IMAGE_SIZES = {"player.png": (80, 80), "powerup.png": (35, 35), "cup.png": (400, 300), "leo_hero1.png": (350, 150)}
+
+
+# Fonction qui calcule la mémoire (en mégaoctets) occupée par les images d'une partie
+# pour un affichage de "width" x "height" pixels : les fonds d'écran, les obstacles 
+# et les autres images, agrandis dans les mêmes proportions (4 octets par pixel).
+def asset_working_set_mb(width, height):
+    scale_x, scale_y = width / WIDTH, height / HEIGHT
+    sizes = [size for _, size, _ in OBSTACLE_TYPES.values()] + list(IMAGE_SIZES.values())
+    pixels = len(BACKGROUND_FILES) * width * height
+    pixels += sum(round(w * scale_x) * round(h * scale_y) for w, h in sizes)
+    return pixels * 4 / 1048576
+
+
+# Budget mémoire du cache des images, en mégaoctets ("--asset-budget N" pour le changer).
+# Par défaut, il correspond aux images d'une partie à la taille de l'affichage (environ 12 Mo 
+# en 800 x 600), avec 25 % de marge pour les variantes demandées en plus (benchmarks...).
+ASSET_BUDGET_MB = float(command_line_option("--asset-budget", asset_working_set_mb(WIDTH, HEIGHT) * 1.25))
+
+
+# Définition de la classe 'AssetCache' : cache des images redimensionnées et converties
+# Chaque variante d'image est rangée sous la clé (fichier, taille, filtre, format, effet) :
+# - "filtre" : "lisse" (smoothscale) ou "rapide" (scale) ;
+# - "format" : "alpha" (transparence conservée, convert_alpha) ou "opaque" (convert) ;
+# - "effet" : fonction appliquée après le redimensionnement (coins arrondis de l'introduction), ou None.
+# Une variante n'est construite qu'à la première demande, puis la même surface est partagée
+# (obstacles, power-ups, fonds...). Quand la mémoire occupée dépasse le budget, les variantes
+# utilisées il y a le plus longtemps sont retirées du cache (LRU) ; elles seront reconstruites
+# depuis le fichier si elles sont demandées à nouveau.
+class AssetCache:
+    
+    def __init__(self, budget_mb=ASSET_BUDGET_MB):
+        # Variantes rangées de la moins récemment utilisée à la plus récente
+        self.surfaces = OrderedDict()
+        self.budget = int(budget_mb * 1024 * 1024)
+        
+        # Mémoire occupée par les variantes du cache, en octets
+        self.bytes = 0
+        
+        # Statistiques : demandes servies par le cache, variantes construites, 
+        # variantes retirées et mémoire libérée par ces retraits
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+
+    # Clé d'une variante dans le cache
+    @staticmethod
+    def key(filename, size, smooth=False, alpha=True, effect=None):
+        return (filename, tuple(size), "lisse" if smooth else "rapide", "alpha" if alpha else "opaque", effect)
+
+    # Renvoie la variante demandée, en la construisant si elle n'est pas dans le cache
+    def get(self, filename, size, smooth=False, alpha=True, effect=None):
+        key = self.key(filename, size, smooth, alpha, effect)
+        surface = self.surfaces.get(key)
+        
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        
+        self.misses += 1
+        surface = build_sprite_variant(filename, size, alpha, smooth)
+        if effect is not None:
+            surface = effect(surface)
+        self.put(key, surface)
+        return surface
+
+    # Range une variante dans le cache (aussi appelée par le chargeur d'arrière-plan),
+    # puis retire les variantes les moins récemment utilisées tant que le budget est dépassé.
+    # La variante qui vient d'être rangée est toujours gardée, même si elle dépasse à elle seule le budget.
+    def put(self, key, surface):
+        previous = self.surfaces.pop(key, None)
+        if previous is not None:
+            self.bytes -= surface_bytes(previous)
+        self.surfaces[key] = surface
+        self.bytes += surface_bytes(surface)
+        
+        while self.bytes > self.budget and len(self.surfaces) > 1:
+            _, evicted = self.surfaces.popitem(last=False)
+            size = surface_bytes(evicted)
+            self.bytes -= size
+            self.evictions += 1
+            self.evicted_bytes += size
+            
+            # Le masque de collision de la variante est oublié avec elle
+            sprite_masks.pop(evicted, None)
+
+    # Vide le cache (les statistiques sont conservées)
+    def clear(self):
+        self.surfaces.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return (f"images : {self.hits} hits / {self.misses} misses, {len(self.surfaces)} en cache "
+                f"({self.bytes / 1048576:.1f} / {self.budget / 1048576:.0f} Mo), "
+                f"{self.evictions} évictions ({self.evicted_bytes / 1048576:.1f} Mo)")
+
+
+# Mémoire occupée par les pixels d'une surface, en octets
+def surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+# Cache des images partagé par tout le jeu (fonds, sprites, introduction, victoire)
+asset_cache = AssetCache()
+
+
+# Fonction qui renvoie la variante d'une image à la taille et au format demandés
+# "filename" est le fichier image, "size" la taille voulue en pixels,
+# "alpha" indique si la transparence doit être conservée (convert_alpha) ou non (convert),
+# "smooth" choisit un redimensionnement lissé (smoothscale) plutôt que rapide (scale).
+def get_sprite_variant(filename, size, alpha=True, smooth=False):
+    return asset_cache.get(filename, size, smooth, alpha)
+
+
+# Fonction qui construit une variante d'image sans la ranger dans le cache
+# (elle est aussi appelée par le chargeur d'arrière-plan, voir "AssetLoader")
+def build_sprite_variant(filename, size, alpha=True, smooth=False):
+    
+    # Charge l'image et la convertit au format d'affichage de l'écran
+    image = pygame.image.load(resource_path(filename))
+    image = image.convert_alpha() if alpha else image.convert()
+    
+    # Redimensionne l'image à la taille demandée
+    if smooth:
+        return pygame.transform.smoothscale(image, size)
+    return pygame.transform.scale(image, size)
+
+
+# Active la détection des collisions au pixel près avec les obstacles.
+# Les rectangles des images contiennent des coins transparents : avec cette option,
+# une collision n'est retenue que si des pixels visibles du joueur et de l'obstacle se touchent.
+# Le test au pixel près n'est fait qu'après un test rapide des rectangles.
+# Elle est active par défaut ; "python dysheros.py --rect-collisions" revient aux seuls rectangles.
+PIXEL_PERFECT_COLLISIONS = "--rect-collisions" not in sys.argv
+
+# Cache des masques de collision ("pygame.mask"), un par variante d'image.
+# Le masque indique quels pixels de l'image sont visibles ; il est calculé une seule fois
+# par surface et partagé par tous les sprites qui utilisent cette surface.
+sprite_masks = {}
+
+
+# Fonction qui renvoie le masque de collision d'une image (variante du cache)
+def get_sprite_mask(image):
+    mask = sprite_masks.get(image)
+    if mask is None:
+        # "pygame.mask.from_surface()" marque comme visibles les pixels peu transparents
+        mask = pygame.mask.from_surface(image)
+        sprite_masks[image] = mask
+    return mask
+
+
+# Cache des sons chargés à la demande, par nom de fichier
+sound_cache = {}
+
+
+# Fonction qui renvoie le son "filename" au volume "volume", chargé une seule fois
+def get_sound(filename, volume=1.0):
+    sound = sound_cache.get(filename)
+    if sound is None:
+        sound = load_sound(filename, volume)
+        sound_cache[filename] = sound
+    return sound
+
+
+# Fonction qui charge et décode un fichier son, puis règle son volume (1.0 est le volume maximal)
+def load_sound(filename, volume=1.0):
+    sound = pygame.mixer.Sound(resource_path(filename))
+    sound.set_volume(volume)
+    return sound
+
+
+# Verrou pris pendant les conversions d'images du chargeur d'arrière-plan et pendant 
+# les changements de mode d'affichage : une image n'est jamais convertie au format 
+# d'un écran en train d'être remplacé (passage en plein écran)
+display_lock = threading.Lock()
+
+
+# Définition de la classe 'AssetLoader' qui prépare les images et les sons de la partie 
+# en arrière-plan, pendant le défilement de l'histoire et le compte à rebours.
+# Chaque élément est chargé en deux temps :
+# - "load" est exécuté par un fil d'exécution séparé (thread) : lecture du fichier, 
+#   décodage, conversion et redimensionnement, sans ralentir l'affichage ;
+# - "publish" est exécuté par la boucle principale (méthode "poll()") : il range le résultat
+#   dans le cache habituel ("asset_cache" pour les images, "sound_cache"...).
+# Quand la partie commence, tout est déjà dans les caches : la première image du jeu 
+# ne charge plus aucun fichier.
+class AssetLoader:
+
+    def __init__(self):
+        # Liste des éléments à charger : (nom, fonction de chargement, fonction de publication)
+        self.jobs = []
+        
+        # Résultats prêts à être publiés par la boucle principale, dans l'ordre de chargement
+        self.results = queue.Queue()
+        
+        self.thread = None
+        self.published = 0
+        
+        # Erreur rencontrée par le thread de chargement, signalée par la boucle principale
+        self.error = None
+        
+        # Durée totale du chargement en arrière-plan, en millisecondes
+        self.load_ms = 0.0
+
+    # Ajoute un élément à charger
+    def add(self, name, load, publish):
+        self.jobs.append((name, load, publish))
+
+    # Démarre le chargement en arrière-plan (une seule fois)
+    def start(self):
+        if self.thread is None:
+            # "daemon=True" : le thread ne retient pas le programme si le joueur quitte
+            self.thread = threading.Thread(target=self.work, name="chargement", daemon=True)
+            self.thread.start()
+
+    # Travail du thread de chargement : charge chaque élément dans l'ordre
+    def work(self):
+        start = time.perf_counter()
+        try:
+            for name, load, publish in self.jobs:
+                with display_lock:
+                    data = load()
+                self.results.put((publish, data))
+        except Exception as error:
+            self.error = error
+        self.load_ms = (time.perf_counter() - start) * 1000
+
+    # Publie les éléments chargés depuis le dernier appel (appelée à chaque image)
+    def poll(self):
+        while True:
+            try:
+                publish, data = self.results.get_nowait()
+            except queue.Empty:
+                break
+            publish(data)
+            self.published += 1
+        if self.error is not None:
+            raise self.error
+
+    # Attend la fin du chargement et publie tout ce qui reste.
+    # Si le chargement n'a jamais été démarré, rien n'est fait : les caches se rempliront
+    # à la demande, comme avant.
+    def finish(self):
+        if self.thread is not None:
+            self.thread.join()
+            self.poll()
+
+    # Avancement du chargement, de 0 (rien n'est prêt) à 1 (tout est publié)
+    @property
+    def progress(self):
+        if not self.jobs:
+            return 1.0
+        return self.published / len(self.jobs)
+
+    # Indique si tous les éléments sont chargés et rangés dans leurs caches
+    @property
+    def ready(self):
+        return self.published == len(self.jobs)
+
+
+# Fonction qui prépare la liste des images et des sons nécessaires à la partie
+def create_gameplay_loader():
+    loader = AssetLoader()
+    
+    # Image du joueur, images des obstacles et du power-up, avec leurs masques de collision
+    # (le masque est calculé à la publication, il est rapide à construire)
+    sprites = [("player.png", (80, 80), True)]
+    sprites.extend((filename, size, False) for filename, size, _ in OBSTACLE_TYPES.values())
+    sprites.append(("powerup.png", (35, 35), False))
+    for filename, size, smooth in sprites:
+        def publish(variant, key=AssetCache.key(filename, size, smooth)):
+            asset_cache.put(key, variant)
+            get_sprite_mask(variant)
+        loader.add(filename, lambda f=filename, sz=size, sm=smooth: build_sprite_variant(f, sz, smooth=sm), publish)
     
-    # Sélectionne un fichier d'image aléatoirement dans la liste des fonds d'écran
-    # "random.choice(backgrounds)" choisit un des éléments de la liste au hasard
-    chosen_background = random.choice(backgrounds)
+    # Fonds d'écran, à la taille de la fenêtre et sans transparence
+    for filename in BACKGROUND_FILES:
+        def publish_background(background, key=AssetCache.key(filename, (WIDTH, HEIGHT), alpha=False)):
+            asset_cache.put(key, background)
+        loader.add(filename, lambda f=filename: load_background_from_disk(f), publish_background)
     
-    # Charge l'image de fond choisie et la convertit pour être compatible 
-    # avec l'affichage dans Pygame
-    # "pygame.image.load()" charge le fichier d'image, "resource_path()" 
-    # fournit le chemin complet du fichier,
-    # et ".convert()" optimise l'image pour un affichage plus rapide dans Pygame
-    bg = pygame.image.load(resource_path(chosen_background)).convert()
+    # Coupe de l'écran de victoire
+    def publish_cup(variant):
+        asset_cache.put(AssetCache.key("cup.png", (400, 300), smooth=True), variant)
+    loader.add("cup.png", lambda: build_sprite_variant("cup.png", (400, 300), smooth=True), publish_cup)
     
-    # Redimensionne l'image de fond chargée pour qu'elle corresponde 
-    # exactement à la taille de la fenêtre du jeu
-    # "pygame.transform.scale(bg, (WIDTH, HEIGHT))" 
-    # ajuste la taille de l'image aux dimensions définies par WIDTH et HEIGHT
-    return pygame.transform.scale(bg, (WIDTH, HEIGHT))
+    # Sons du jeu, tous au volume maximal (1.0) : fin de partie, bonus collecté,
+    # alerte du combat final et victoire
+    for filename in ("game_over.wav", "bonus_collected.wav", "final_alert.wav", "son_fin_jeu.mp3"):
+        def publish_sound(sound, filename=filename):
+            sound_cache[filename] = sound
+        loader.add(filename, lambda f=filename: load_sound(f, 1.0), publish_sound)
+    
+    # Polices du HUD et de l'alerte du combat final.
+    # Une police ("pygame.font.Font") ne doit pas être créée dans le thread de chargement :
+    # FreeType n'est pas prévu pour être utilisé depuis plusieurs threads.
+    # Le thread n'a donc rien à charger, la police est créée par la boucle principale à la publication.
+    for size in (38, 78):
+        def publish_font(_, size=size):
+            text_cache.font(size)
+        loader.add(f"police {size}", lambda: None, publish_font)
+    
+    return loader
+
+
+# Chargeur des éléments de la partie, démarré au début de l'introduction
+asset_loader = create_gameplay_loader()
+
+
+# Fonction qui dessine une fine barre de progression du chargement en bas de l'écran
+# (rien n'est dessiné quand tout est chargé)
+def draw_loading_bar(target, loader):
+    if loader.ready:
+        return
+    pygame.draw.rect(target, (60, 60, 60), (0, HEIGHT - 4, WIDTH, 4))
+    pygame.draw.rect(target, OR, (0, HEIGHT - 4, int(WIDTH * loader.progress), 4))
 
 
 # Définition de la classe 'Mobile' pour représenter les obstacles mobiles dans le jeu
@@ -660,18 +1748,34 @@ class Mobile(pygame.sprite.Sprite):
     
     # Initialisation de la classe Mobile avec l'image, 
     # la vitesse de chute et le niveau actuel du jeu
-    def __init__(self, image, vitesse_chute, niveau):
+    # "rng" est le générateur de nombres aléatoires utilisé pour la direction et la position
+    # de départ (celui de la partie en cours, pour qu'elle puisse être rejouée à l'identique).
+    # "pool" est la réserve d'obstacles à laquelle il revient quand il est supprimé.
+    def __init__(self, image, vitesse_chute, niveau, rng=random):
         # Appelle le constructeur de la classe parente pygame.sprite.Sprite
         super().__init__()
+        self.pool = None
+        self.rect = None
+        self.reset(image, vitesse_chute, niveau, rng)
+
+    # Remet l'obstacle dans l'état d'un obstacle neuf (utilisé aussi pour réutiliser 
+    # un obstacle de la réserve "SpritePool" au lieu d'en créer un nouveau)
+    def reset(self, image, vitesse_chute, niveau, rng=random):
         
-        # Redimensionne l'image de l'obstacle pour qu'elle mesure 
-        # 45 pixels de large et 45 pixels de haut
-        # "pygame.transform.scale(image, (45, 45))" ajuste la taille de l'image fournie.
-        self.image = pygame.transform.scale(image, (45, 45))
+        # Associe l'image fournie à l'obstacle, sans la redimensionner :
+        # l'image vient du cache des variantes et a déjà la taille de son type
+        # (petit, moyen ou grand), elle est partagée entre tous les obstacles du même type.
+        self.image = image
         
         # Obtient un rectangle (rect) autour de l'image pour gérer la position et les collisions
         # "self.image.get_rect()" génère un rectangle basé sur les dimensions de l'image.
-        self.rect = self.image.get_rect()
+        # Le rectangle d'un obstacle réutilisé est conservé s'il a déjà la bonne taille
+        # (sa position est de toute façon redéfinie ci-dessous).
+        if self.rect is None or self.rect.size != image.get_size():
+            self.rect = self.image.get_rect()
+        
+        # Masque de collision de l'image, partagé avec les autres obstacles du même type
+        self.mask = get_sprite_mask(image)
         
         # Stocke la vitesse de chute de l'obstacle. 
         # pour déterminer la rapidité de son déplacement.
@@ -685,39 +1789,46 @@ class Mobile(pygame.sprite.Sprite):
         if niveau >= 12:
             # Choisit une direction aléatoire pour l'apparition de l'obstacle. 
             # parmi 'gauche', 'droite' et 'bas'
-            self.direction = random.choice(['gauche', 'droite', 'bas'])
+            self.direction = rng.choice(['gauche', 'droite', 'bas'])
             
             # Si la direction est 'gauche', positionne l'obstacle à gauche de l'écran
             if self.direction == 'gauche':
                 # Place l'obstacle juste en dehors de l'écran à gauche
                 self.rect.x = -self.rect.width
                 # Place l'obstacle à une hauteur aléatoire sur l'écran
-                self.rect.y = random.randint(0, HEIGHT - self.rect.height)
+                self.rect.y = rng.randint(0, HEIGHT - self.rect.height)
             
             # Si la direction est 'droite', positionne l'obstacle à droite de l'écran
             elif self.direction == 'droite':
                 # Place l'obstacle juste en dehors de l'écran à droite
                 self.rect.x = WIDTH
                 # Place l'obstacle à une hauteur aléatoire sur l'écran
-                self.rect.y = random.randint(0, HEIGHT - self.rect.height)
+                self.rect.y = rng.randint(0, HEIGHT - self.rect.height)
             
             # Si la direction est 'bas', positionne l'obstacle en haut de l'écran
             else:
                 # Place l'obstacle à une position horizontale aléatoire
-                self.rect.x = random.randint(0, WIDTH - self.rect.width)
+                self.rect.x = rng.randint(0, WIDTH - self.rect.width)
                 # Place l'obstacle juste en dehors de l'écran en haut
                 self.rect.y = -self.rect.height
 
         # Si le niveau est inférieur à 12, tous les obstacles commencent en haut de l'écran
         else:
             # Place l'obstacle à une position horizontale aléatoire en haut de l'écran
-            self.rect.x = random.randint(0, WIDTH - self.rect.width)
+            self.rect.x = rng.randint(0, WIDTH - self.rect.width)
             # Place l'obstacle juste en dehors de l'écran en haut
             self.rect.y = -self.rect.height
+        
+        # Position de l'obstacle au pas de simulation précédent, utilisée pour l'affichage
+        # entre deux pas (voir la fonction "interpolate_rect")
+        self.previous_topleft = self.rect.topleft
 
-    # Méthode pour mettre à jour la position de l'obstacle à chaque itération du jeu
+    # Méthode pour mettre à jour la position de l'obstacle à chaque pas de simulation
     def update(self):
         
+        # Retient la position actuelle avant le déplacement
+        self.previous_topleft = self.rect.topleft
+        
         # Mise à jour de la position de l'obstacle selon la direction définie.
         if self.direction == 'gauche':
             # Déplace l'obstacle vers la droite s'il est apparu à gauche
@@ -737,6 +1848,16 @@ class Mobile(pygame.sprite.Sprite):
             # Supprime l'obstacle en appelant la méthode "kill()" pour libérer de la mémoire.
             self.kill()
 
+    # Méthode pour supprimer l'obstacle du jeu
+    # Il est retiré de tous ses groupes de sprites et rendu à sa réserve s'il en a une 
+    # (pour être réutilisé par une prochaine apparition).
+    def kill(self):
+        if self.pool is not None and self.alive():
+            super().kill()
+            self.pool.release(self)
+        else:
+            super().kill()
+
 
 # Définition de la classe 'PowerUp' pour représenter les objets 'power-ups' dans le jeu
 # Cette classe gère l'apparence, la position et le mouvement des 'power-ups' qui tombent
@@ -744,16 +1865,27 @@ class PowerUp(pygame.sprite.Sprite):
     
     # Initialisation de la classe 'PowerUp' avec l'image, 
     # la vitesse de chute et le type de 'power-up'.
-    def __init__(self, image, vitesse_chute, powerup_type):
+    # "rng" est le générateur de nombres aléatoires de la partie (position de départ).
+    # "pool" est la réserve de power-ups à laquelle il revient quand il est supprimé.
+    def __init__(self, image, vitesse_chute, powerup_type, rng=random):
         # Appelle le constructeur de la classe parente pygame.sprite.Sprite.
         super().__init__()
+        self.pool = None
+        self.rect = None
+        self.reset(image, vitesse_chute, powerup_type, rng)
+
+    # Remet le power-up dans l'état d'un power-up neuf (utilisé aussi pour réutiliser 
+    # un power-up de la réserve "SpritePool")
+    def reset(self, image, vitesse_chute, powerup_type, rng=random):
         
         # Associe l'image fournie au power-up pour définir son apparence dans le jeu.
         self.image = image
         
         # Obtient un rectangle (rect) autour de l'image pour gérer la position et les collisions
         # "self.image.get_rect()" génère un rectangle basé sur les dimensions de l'image
-        self.rect = self.image.get_rect()
+        # (le rectangle d'un power-up réutilisé est conservé s'il a déjà la bonne taille)
+        if self.rect is None or self.rect.size != image.get_size():
+            self.rect = self.image.get_rect()
         
         # Stocke la vitesse de chute du power-up pour déterminer la rapidité de son déplacement
         self.vitesse_chute = vitesse_chute
@@ -766,15 +1898,21 @@ class PowerUp(pygame.sprite.Sprite):
         # avec une position 'x' aléatoire
         # "self.rect.x" est placé à une position aléatoire horizontale 
         # pour varier le point de départ
-        self.rect.x = random.randint(0, WIDTH - self.rect.width)
+        self.rect.x = rng.randint(0, WIDTH - self.rect.width)
         
         # Place le 'power-up' juste au-dessus du haut de l'écran pour 
         # qu'il commence à tomber depuis cette position.
         self.rect.y = -self.rect.height
+        
+        # Position du power-up au pas de simulation précédent (pour l'affichage entre deux pas)
+        self.previous_topleft = self.rect.topleft
 
-    # Méthode pour mettre à jour la position du power-up à chaque itération du jeu
+    # Méthode pour mettre à jour la position du power-up à chaque pas de simulation
     def update(self):
         
+        # Retient la position actuelle avant le déplacement
+        self.previous_topleft = self.rect.topleft
+        
         # Déplace le power-up vers le bas en ajoutant la vitesse de chute à sa position Y
         # Cela crée un mouvement vertical descendant pour simuler la chute du power-up
         self.rect.y += self.vitesse_chute
@@ -785,1229 +1923,2575 @@ class PowerUp(pygame.sprite.Sprite):
             # Supprime le power-up en appelant la méthode "kill()" pour libérer de la mémoire
             self.kill()
 
+    # Méthode pour supprimer le power-up du jeu
+    # Il est retiré de tous ses groupes de sprites et rendu à sa réserve s'il en a une.
+    def kill(self):
+        if self.pool is not None and self.alive():
+            super().kill()
+            self.pool.release(self)
+        else:
+            super().kill()
 
-# Fonction principale du jeu
-# La fonction "main()" est le cœur du jeu : 
-# elle gère tout ce qui se passe dans le jeu, y compris
-# l'affichage des éléments à l'écran, les interactions avec le joueur, 
-# et la logique du jeu (comme le score et le niveau)
-def main():
-    
-    # Déclaration de variables globales nécessaires au fonctionnement du jeu
-    # Les variables globales sont partagées dans toutes les fonctions du programme
-    # Ici, on déclare les variables globales utilisées 
-    # dans la fonction "main()" pour contrôler divers aspects du jeu
-    
-    # Déclare la variable "player_rect" pour stocker la position et la taille du joueur
-    global player_rect
-    
-    # Déclare la variable "obstacles" pour gérer le groupe de tous 
-    # les obstacles qui apparaissent dans le jeu
-    global obstacles
-    
-    # Déclare la variable "powerups" pour gérer le groupe de tous 
-    # les power-ups que le joueur peut collecter
-    global powerups
-    
-    # Déclare la variable "score" pour stocker le score actuel du joueur
-    global score
-    
-    # Déclare la variable "level" pour garder en mémoire le niveau actuel du joueur dans le jeu
-    global level
-    
-    # Déclare la variable "invincible" pour indiquer si le joueur 
-    # est invincible (protégé des obstacles) ou non
-    global invincible
-    
-    # Déclare la variable "slow_obstacles" pour indiquer si les obstacles 
-    # se déplacent plus lentement à cause d’un power-up
-    global slow_obstacles
+
+# Définition de la classe 'SpritePool' : une réserve d'obstacles ou de power-ups à réutiliser
+# Un sprite supprimé ("kill()") n'est pas jeté : il revient dans la réserve, et la prochaine
+# apparition le réutilise ("reset()") au lieu de créer un nouvel objet et un nouveau rectangle.
+# Une fois la réserve assez grande, la partie ne crée plus aucun sprite.
+class SpritePool:
     
-    # Déclare la variable "powerup_timer" pour suivre le temps écoulé 
-    # pendant lequel un power-up est actif
-    global powerup_timer
+    # Initialisation avec la classe des sprites de la réserve ("Mobile" ou "PowerUp")
+    def __init__(self, sprite_class):
+        self.sprite_class = sprite_class
+        self.free = []
+        
+        # Statistiques : sprites créés, sprites réutilisés, sprites en jeu 
+        # et nombre maximal de sprites en jeu en même temps (high-water mark)
+        self.created = 0
+        self.reused = 0
+        self.live = 0
+        self.high_water = 0
+
+    # Renvoie un sprite prêt à l'emploi : réutilisé s'il y en a un libre, sinon créé
+    # Les arguments sont ceux du constructeur de la classe des sprites.
+    def acquire(self, *args):
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args)
+            self.reused += 1
+        else:
+            sprite = self.sprite_class(*args)
+            sprite.pool = self
+            self.created += 1
+        self.live += 1
+        if self.live > self.high_water:
+            self.high_water = self.live
+        return sprite
+
+    # Rend un sprite supprimé à la réserve (appelé par "kill()")
+    def release(self, sprite):
+        self.live -= 1
+        self.free.append(sprite)
+
+    # Statistiques de la réserve : taux de réutilisation (hit rate), créations, 
+    # réutilisations, sprites en jeu, sprites libres et maximum en jeu
+    def stats(self):
+        requests = self.created + self.reused
+        return {
+            "hit_rate": self.reused / requests if requests else 0.0,
+            "created": self.created,
+            "reused": self.reused,
+            "live": self.live,
+            "free": len(self.free),
+            "high_water": self.high_water,
+        }
+
+
+# Réserves d'obstacles et de power-ups, partagées par toutes les parties : 
+# une nouvelle partie réutilise les sprites de la précédente
+obstacle_pool = SpritePool(Mobile)
+powerup_pool = SpritePool(PowerUp)
+
+
+# Résultat d'une recherche de collisions autour du joueur :
+# "obstacles" touchés, "powerups" touchés et "near_misses" (obstacles frôlés à moins
+# de quelques pixels, sans être touchés).
+class CollisionResult:
     
-    # Déclare la variable "spawn_timer" pour mesurer le temps écoulé 
-    # entre l'apparition de chaque nouvel obstacle
-    global spawn_timer
+    def __init__(self, obstacles, powerups, near_misses):
+        self.obstacles = obstacles
+        self.powerups = powerups
+        self.near_misses = near_misses
+
+
+# Définition de la classe 'CollisionSystem' qui détecte les collisions du joueur
+# Elle parcourt les groupes d'obstacles et de power-ups de la partie et compare chaque 
+# rectangle avec celui du joueur ("colliderect", fait en C par pygame). Une grille de cases 
+# (broadphase) a été essayée : la tenir à jour à chaque déplacement coûtait plus cher 
+# que cette simple boucle, jusqu'à 2000 obstacles (voir le benchmark "collisions").
+class CollisionSystem:
     
-    # Déclare la variable "background" pour stocker l'image de fond d'écran 
-    # actuellement affichée dans le jeu
-    global background
+    # Initialisation avec les groupes de sprites de la partie
+    # et la marge (en pixels) d'un obstacle frôlé
+    def __init__(self, obstacles, powerups, near_margin=20):
+        self.obstacles = obstacles
+        self.powerups = powerups
+        self.near_margin = near_margin
+
+    # Vérifie si un obstacle dont le rectangle chevauche celui du joueur le touche vraiment
+    # Sans masque du joueur, le chevauchement des rectangles suffit ; avec un masque,
+    # les pixels visibles des deux images doivent se superposer.
+    def _touches(self, player_rect, player_mask, obstacle):
+        if player_mask is None:
+            return True
+        offset = (obstacle.rect.x - player_rect.x, obstacle.rect.y - player_rect.y)
+        return player_mask.overlap(obstacle.mask, offset) is not None
+
+    # Renvoie le premier obstacle qui touche le joueur, ou None
+    # La recherche s'arrête dès le premier obstacle touché (une seule collision suffit).
+    # "player_mask" (facultatif) active le test au pixel près après le test des rectangles.
+    def first_obstacle_hit(self, player_rect, player_mask=None):
+        colliderect = player_rect.colliderect
+        for obstacle in self.obstacles:
+            if colliderect(obstacle.rect) and self._touches(player_rect, player_mask, obstacle):
+                return obstacle
+        return None
+
+    # Renvoie les power-ups touchés par le joueur
+    def powerup_hits(self, player_rect):
+        colliderect = player_rect.colliderect
+        return [powerup for powerup in self.powerups if colliderect(powerup.rect)]
+
+    # Recherche complète autour du joueur : obstacles touchés, power-ups touchés
+    # et obstacles frôlés (à moins de "near_margin" pixels)
+    def query(self, player_rect, player_mask=None):
+        near_rect = player_rect.inflate(2 * self.near_margin, 2 * self.near_margin)
+        hits = []
+        near_misses = []
+        for obstacle in self.obstacles:
+            if player_rect.colliderect(obstacle.rect) and self._touches(player_rect, player_mask, obstacle):
+                hits.append(obstacle)
+            elif near_rect.colliderect(obstacle.rect):
+                near_misses.append(obstacle)
+        return CollisionResult(hits, self.powerup_hits(player_rect), near_misses)
+
+
+# Mesure le coût du déplacement des obstacles et de la détection des collisions
+# avec 200, 800 et 2000 obstacles en jeu.
+# "premier" cherche seulement le premier obstacle touché (arrêt dès la première collision,
+# comme pendant la partie), "complet" cherche aussi les obstacles frôlés et les power-ups.
+@benchmark("collisions")
+def bench_collisions(frames=200):
+    image = pygame.Surface((45, 45))
+    player_rect = pygame.Rect(0, 0, 80, 80)
+    player_rect.center = (WIDTH // 2, HEIGHT - 50)
+
+    # Crée "count" obstacles répartis au-dessus de l'écran et sur l'écran
+    def spawn(count):
+        rng = random.Random(1)
+        group = pygame.sprite.Group()
+        for _ in range(count):
+            obstacle = Mobile(image, rng.randint(3, 12), 1)
+            obstacle.rect.topleft = (rng.randint(0, WIDTH - 45), rng.randint(-4 * HEIGHT, HEIGHT))
+            group.add(obstacle)
+        return group
+
+    for count in (200, 800, 2000):
+        group = spawn(count)
+        collisions = CollisionSystem(group, pygame.sprite.Group())
+        move_average, _ = measure_frames(group.update, frames // 2)
+        first_average, _ = measure_frames(lambda: collisions.first_obstacle_hit(player_rect), frames // 2)
+        query_average, _ = measure_frames(lambda: collisions.query(player_rect), frames // 2)
+        print(f"{count:>5} obstacles   déplacement {move_average:6.3f} ms   "
+              f"premier {first_average:6.3f} ms   complet {query_average:6.3f} ms")
+
+
+# Mesure le coût des collisions au pixel près dans les conditions du niveau 34 :
+# obstacles des trois tailles, très nombreux autour du joueur (pire cas).
+# "rectangles" : test des rectangles seul, "masques" : test des pixels après les rectangles.
+# Le budget d'une image à 60 images par seconde est de 16,7 ms.
+@benchmark("masques")
+def bench_pixel_collisions(frames=300):
+    player_img = get_sprite_variant("player.png", (80, 80), smooth=True)
+    player_mask = get_sprite_mask(player_img)
+    player_rect = player_img.get_rect(center=(WIDTH // 2, HEIGHT - 50))
+    rng = random.Random(34)
+
+    for count in (50, 200):
+        group = pygame.sprite.Group()
+        collisions = CollisionSystem(group, pygame.sprite.Group())
+        for _ in range(count):
+            filename, size, speed = OBSTACLE_TYPES[rng.choice(list(OBSTACLE_TYPES))]
+            obstacle = Mobile(get_sprite_variant(filename, size), speed + 34, 34)
+            # Place l'obstacle autour du joueur pour forcer le test des pixels
+            obstacle.rect.center = (player_rect.centerx + rng.randint(-70, 70),
+                                    player_rect.centery + rng.randint(-70, 70))
+            group.add(obstacle)
+
+        rect_average, _ = measure_frames(lambda: collisions.query(player_rect), frames)
+        mask_average, mask_worst = measure_frames(lambda: collisions.query(player_rect, player_mask), frames)
+        rect_hits = len(collisions.query(player_rect).obstacles)
+        mask_hits = len(collisions.query(player_rect, player_mask).obstacles)
+        print(f"{count:>4} obstacles   rectangles {rect_average:6.3f} ms ({rect_hits} touchés)"
+              f"   masques {mask_average:6.3f} ms ({mask_hits} touchés), pire {mask_worst:6.3f} ms / 16,7 ms")
+
+
+# Moteur d'obstacles vectorisé (NumPy) : "python dysheros.py --numpy-obstacles" l'utilise
+# à la place des sprites "Mobile". Les règles du jeu restent exactement les mêmes.
+NUMPY_OBSTACLES = "--numpy-obstacles" in sys.argv
+
+# Module NumPy, importé par "import_numpy()" seulement quand le moteur vectorisé est utilisé
+# (NumPy est facultatif : le jeu fonctionne sans lui avec les sprites "Mobile").
+np = None
+
+
+# Fonction qui importe NumPy lors du premier appel et le renvoie (None s'il n'est pas installé)
+def import_numpy():
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            return None
+        np = numpy
+    return np
+
+
+# Définition de la classe 'ObstacleArray' : tous les obstacles du jeu rangés dans des tableaux
+# Au lieu d'un objet "Mobile" par obstacle, chaque caractéristique est un tableau NumPy
+# (positions, positions précédentes, vitesses, tailles, types) : l'obstacle numéro "i" 
+# est la case "i" de chaque tableau. Un seul calcul déplace alors tous les obstacles, 
+# un seul masque de booléens supprime ceux qui sont sortis de l'écran, et le chevauchement
+# des rectangles avec le joueur est testé pour tous les obstacles en même temps.
+# Les obstacles vivants occupent les "count" premières cases, dans l'ordre d'apparition.
+class ObstacleArray:
     
-    # Déclare la variable "spawn_interval" pour définir l'intervalle de temps 
-    # entre l'apparition de nouveaux obstacles
-    global spawn_interval
+    # Initialisation avec les images des types d'obstacles ({type: image}) 
+    # et le nombre de cases réservées au départ (agrandi si nécessaire)
+    def __init__(self, images, capacity=64):
+        if import_numpy() is None:
+            raise RuntimeError("Le moteur d'obstacles vectorisé nécessite NumPy (pip install numpy)")
+        
+        # Numéro de chaque type, et image et masque de collision de chaque numéro
+        self.type_ids = {name: index for index, name in enumerate(images)}
+        self.images = list(images.values())
+        self.masks = [get_sprite_mask(image) for image in self.images]
+        sizes = np.array([image.get_size() for image in self.images], dtype=np.int32).reshape(-1, 2)
+        self.type_widths = sizes[:, 0]
+        self.type_heights = sizes[:, 1]
+        
+        self.count = 0
+        self._allocate(capacity)
+
+    # Réserve "capacity" cases dans chaque tableau en conservant les obstacles vivants
+    def _allocate(self, capacity):
+        count = self.count
+        for name in ("x", "y", "prev_x", "prev_y", "vx", "vy", "w", "h"):
+            array_ = np.zeros(capacity, dtype=np.int32)
+            if count:
+                array_[:count] = getattr(self, name)[:count]
+            setattr(self, name, array_)
+        kind = np.zeros(capacity, dtype=np.int8)
+        if count:
+            kind[:count] = self.kind[:count]
+        self.kind = kind
+
+    # Nombre d'obstacles vivants
+    def __len__(self):
+        return self.count
+
+    # Crée un obstacle comme "Mobile.__init__" : même position de départ, même direction,
+    # et mêmes tirages aléatoires dans le même ordre (une partie donne le même résultat
+    # avec les deux moteurs)
+    def spawn(self, obstacle_type, vitesse_chute, niveau, rng=random):
+        kind = self.type_ids[obstacle_type]
+        width = int(self.type_widths[kind])
+        height = int(self.type_heights[kind])
+        
+        # A partir du niveau 12, les obstacles peuvent aussi arriver par la gauche ou la droite
+        direction = rng.choice(['gauche', 'droite', 'bas']) if niveau >= 12 else 'bas'
+        if direction == 'gauche':
+            x, y, vx, vy = -width, rng.randint(0, HEIGHT - height), vitesse_chute, 0
+        elif direction == 'droite':
+            x, y, vx, vy = WIDTH, rng.randint(0, HEIGHT - height), -vitesse_chute, 0
+        else:
+            x, y, vx, vy = rng.randint(0, WIDTH - width), -height, 0, vitesse_chute
+        
+        # Agrandit les tableaux (taille doublée) s'ils sont pleins
+        if self.count == len(self.x):
+            self._allocate(2 * len(self.x))
+        
+        i = self.count
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.w[i] = width
+        self.h[i] = height
+        self.kind[i] = kind
+        self.count += 1
+
+    # Déplace tous les obstacles d'un pas, puis supprime ceux qui sont sortis de l'écran
+    # (par le bas, par la droite ou par la gauche), comme "Mobile.update()"
+    def update(self):
+        n = self.count
+        if not n:
+            return
+        x, y = self.x[:n], self.y[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        x += self.vx[:n]
+        y += self.vy[:n]
+        
+        # Masque des obstacles encore visibles ; les autres sont retirés des tableaux
+        # en gardant l'ordre d'apparition des obstacles restants
+        alive = (y <= HEIGHT) & (x <= WIDTH) & (x + self.w[:n] >= 0)
+        kept = int(np.count_nonzero(alive))
+        if kept != n:
+            for array_ in (self.x, self.y, self.prev_x, self.prev_y, self.vx, self.vy, self.w, self.h, self.kind):
+                array_[:kept] = array_[:n][alive]
+            self.count = kept
+
+    # Renvoie les numéros des obstacles dont le rectangle chevauche "rect"
+    # (même règle que "Rect.colliderect" : les rectangles qui se touchent seulement par 
+    # un bord ne se chevauchent pas)
+    def overlapping(self, rect):
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        overlap = (x < rect.right) & (x + self.w[:n] > rect.left) & (y < rect.bottom) & (y + self.h[:n] > rect.top)
+        return np.flatnonzero(overlap)
+
+    # Renvoie le numéro du premier obstacle qui touche le joueur, ou None
+    # Le test des rectangles est fait en bloc ; le test au pixel près ("player_mask") 
+    # n'est fait que pour les quelques obstacles dont le rectangle touche celui du joueur.
+    def first_hit(self, player_rect, player_mask=None):
+        for i in self.overlapping(player_rect):
+            if player_mask is None:
+                return int(i)
+            offset = (int(self.x[i]) - player_rect.x, int(self.y[i]) - player_rect.y)
+            if player_mask.overlap(self.masks[self.kind[i]], offset) is not None:
+                return int(i)
+        return None
+
+    # Renvoie la liste (image, rectangle) des obstacles à afficher, dans l'ordre d'apparition,
+    # à la position interpolée entre le pas précédent et le pas actuel (voir "interpolate_rect")
+    def sprites(self, alpha=1.0):
+        n = self.count
+        if not n:
+            return []
+        prev_x, prev_y = self.prev_x[:n], self.prev_y[:n]
+        xs = np.rint(prev_x + (self.x[:n] - prev_x) * alpha).astype(np.int32).tolist()
+        ys = np.rint(prev_y + (self.y[:n] - prev_y) * alpha).astype(np.int32).tolist()
+        images = self.images
+        return [(images[kind], pygame.Rect(x, y, w, h))
+                for x, y, w, h, kind in zip(xs, ys, self.w[:n].tolist(), self.h[:n].tolist(), self.kind[:n].tolist())]
+
+
+# Compare le coût d'une image avec 1000, 2000 et 5000 obstacles vivants :
+# "sprites" (un objet "Mobile" par obstacle) et "numpy" ("ObstacleArray").
+# Chaque image déplace les obstacles et teste la collision avec le joueur ("simulation"),
+# recrée les obstacles sortis de l'écran pour garder le même nombre ("apparitions")
+# et construit la liste des images à afficher ("liste").
+@benchmark("obstacles_numpy")
+def bench_obstacle_array(frames=120):
+    if import_numpy() is None:
+        print("NumPy n'est pas installé")
+        return
+    player_img = get_sprite_variant("player.png", (80, 80), smooth=True)
+    player_mask = get_sprite_mask(player_img)
+    player_rect = player_img.get_rect(center=(WIDTH // 2, HEIGHT - 50))
+    images = {name: get_sprite_variant(filename, size) for name, (filename, size, _) in OBSTACLE_TYPES.items()}
+    timer = PhaseTimer()
+
+    for count in (1000, 2000, 5000):
+        results = []
+        
+        # Obstacles sous forme de sprites "Mobile"
+        rng = random.Random(12)
+        group = pygame.sprite.Group()
+        collisions = CollisionSystem(group, pygame.sprite.Group())
+
+        def sprite_frame():
+            group.update()
+            collisions.first_obstacle_hit(player_rect, player_mask)
+            timer.mark("simulation")
+            while len(group) < count:
+                obstacle_type = rng.choice(list(OBSTACLE_TYPES))
+                obstacle = Mobile(images[obstacle_type], OBSTACLE_TYPES[obstacle_type][2] + 12, 12, rng)
+                group.add(obstacle)
+            timer.mark("apparitions")
+            [(obstacle.image, interpolate_rect(obstacle.rect, obstacle.previous_topleft, 0.5)) for obstacle in group]
+            timer.mark("liste")
+
+        # Obstacles rangés dans les tableaux NumPy
+        array_rng = random.Random(12)
+        obstacle_array = ObstacleArray(images)
+
+        def array_frame():
+            obstacle_array.update()
+            obstacle_array.first_hit(player_rect, player_mask)
+            timer.mark("simulation")
+            while len(obstacle_array) < count:
+                obstacle_type = array_rng.choice(list(OBSTACLE_TYPES))
+                obstacle_array.spawn(obstacle_type, OBSTACLE_TYPES[obstacle_type][2] + 12, 12, array_rng)
+            timer.mark("apparitions")
+            obstacle_array.sprites(0.5)
+            timer.mark("liste")
+
+        for label, frame in (("sprites", sprite_frame), ("numpy", array_frame)):
+            timer.begin()
+            frame()
+            totals = defaultdict(float)
+            for _ in range(frames):
+                timer.begin()
+                frame()
+                total, phases = timer.end()
+                totals["total"] += total
+                for phase, duration in phases.items():
+                    totals[phase] += duration
+            results.append(f"{label} " + " + ".join(f"{totals[phase] / frames:.3f}" for phase in ("simulation", "apparitions", "liste"))
+                           + f" = {totals['total'] / frames:6.3f} ms")
+        print(f"{count:>5} obstacles (simulation + apparitions + liste)   " + "   ".join(results))
+
+
+# Mode d'affichage du jeu : par rectangles modifiés (dirty rectangles) ou par écran complet.
+# Avec les rectangles modifiés, seules les zones sous les sprites qui bougent et sous
+# les textes qui changent sont redessinées puis envoyées à l'écran ("pygame.display.update").
+# Le mode écran complet (fond entier + "pygame.display.flip()" à chaque image) reste disponible
+# avec l'option de ligne de commande "--full-redraw".
+DIRTY_RECT_RENDERING = "--full-redraw" not in sys.argv
+
+
+# Définition de la classe 'RenderLayer' : un calque de textes ou de panneaux affichés par-dessus le jeu
+# Les éléments du calque (image, position) sont assemblés une fois dans une surface transparente
+# gardée en mémoire ; le calque n'est assemblé à nouveau que lorsque ses entrées changent
+# (la "clé" passée à "update()"). Les éléments d'un même calque ne doivent pas se chevaucher.
+class RenderLayer:
     
-    # Déclare la variable "last_score_update" pour stocker le moment où le score 
-    # a été mis à jour pour la dernière fois
-    global last_score_update
+    def __init__(self, name):
+        self.name = name
+        
+        # Clé des entrées du dernier assemblage (None = jamais assemblé)
+        self.key = None
+        
+        # Eléments du calque : (surface, position, rectangle à l'écran)
+        self.items = []
+        
+        # Surface assemblée et position de son coin supérieur gauche à l'écran
+        self.surface = None
+        self.origin = (0, 0)
+        
+        # Zones de l'écran modifiées par les assemblages depuis la dernière image dessinée
+        self.changed = []
+        
+        # Compteurs : nombre d'assemblages et nombre de blits de la surface assemblée
+        self.compositions = 0
+        self.blits = 0
+
+    # Assemble le calque si "key" est différente de la clé du dernier assemblage
+    # "build()" n'est appelée que dans ce cas et renvoie la liste des éléments (image, position)
+    def update(self, key, build):
+        if key == self.key:
+            return
+        self.key = key
+        items = [(surface, pos, surface.get_rect(topleft=pos)) for surface, pos in build()]
+        
+        # Zones à redessiner : les éléments qui ont disparu et ceux qui sont apparus ou ont changé
+        previous_keys = {(surface, pos) for surface, pos, _ in self.items}
+        current_keys = {(surface, pos) for surface, pos, _ in items}
+        self.changed.extend(rect for surface, pos, rect in self.items if (surface, pos) not in current_keys)
+        self.changed.extend(rect for surface, pos, rect in items if (surface, pos) not in previous_keys)
+        self.items = items
+        self.compose()
+
+    # Variante de "update()" pour une liste d'éléments déjà prête : les éléments servent de clé
+    def set_items(self, items):
+        items = list(items)
+        self.update(tuple(items), lambda: items)
+
+    # Copie les éléments dans une surface transparente juste assez grande pour les contenir
+    # "BLEND_RGBA_MAX" recopie les pixels tels quels (couleur et transparence) sur le fond
+    # entièrement transparent : le calque affiché donne exactement les mêmes pixels que les 
+    # éléments dessinés un par un, tant qu'ils ne se chevauchent pas.
+    def compose(self):
+        self.compositions += 1
+        if not self.items:
+            self.surface = None
+            return
+        area = self.items[0][2].unionall([rect for _, _, rect in self.items])
+        if self.surface is None or self.surface.get_size() != area.size:
+            self.surface = pygame.Surface(area.size, pygame.SRCALPHA)
+        else:
+            self.surface.fill((0, 0, 0, 0))
+        for surface, _, rect in self.items:
+            self.surface.blit(surface, rect.move(-area.x, -area.y), special_flags=pygame.BLEND_RGBA_MAX)
+        self.origin = area.topleft
+
+    # Dessine sur "target" la partie du calque contenue dans chaque rectangle de "rects"
+    # (tous les éléments du calque par défaut)
+    def draw(self, target, rects=None):
+        if rects is None:
+            rects = [rect for _, _, rect in self.items]
+        x, y = self.origin
+        for rect in rects:
+            target.blit(self.surface, rect, rect.move(-x, -y))
+        self.blits += len(rects)
+
+
+# Définition de la classe 'FrameRenderer' qui compose une image du jeu à partir de quatre calques :
+# - "fond" : l'image de fond, redessinée seulement sous les zones qui changent ;
+# - "monde" : les sprites (image, rectangle), le seul calque redessiné à chaque image ;
+# - "hud" : score, niveau, bonus et messages de la partie (voir "RenderLayer") ;
+# - "surcouche" : panneau du profileur et texte "Pause".
+# Les calques "hud" et "surcouche" sont mis à jour avant "draw()" avec "update()" ou 
+# "set_items()" et ne sont assemblés à nouveau que lorsque leur contenu change.
+class FrameRenderer:
     
-    # Déclare la variable "player_speed" pour gérer la vitesse de déplacement 
-    # du joueur dans le jeu
-    global player_speed
+    # Ordre des calques, du fond vers l'avant
+    LAYERS = ("fond", "monde", "hud", "surcouche")
     
-    # Déclare la variable "fullscreen" pour indiquer si le jeu est en mode plein écran 
-    # (occupant tout l'écran) ou non
-    global fullscreen
+    # Initialisation avec la surface de l'écran, l'image de fond 
+    # et le mode d'affichage ("dirty" = rectangles modifiés, sinon écran complet)
+    def __init__(self, target, background, dirty=True):
+        self.target = target
+        self.background = background
+        self.dirty = dirty
+        
+        # Calques assemblés par-dessus les sprites, dans l'ordre d'affichage
+        self.hud = RenderLayer("hud")
+        self.overlay = RenderLayer("surcouche")
+        
+        # Rectangles des sprites dessinés à l'image précédente (à effacer à l'image suivante)
+        self.previous_rects = []
+        
+        # Indique que tout l'écran doit être redessiné à la prochaine image
+        self.full_redraw = True
+        
+        # Nombre de rectangles envoyés à l'écran lors de la dernière image (0 = écran complet)
+        self.last_update_count = 0
+        
+        # Nombre de blits de chaque calque depuis la création du renderer
+        self.blit_counts = dict.fromkeys(self.LAYERS, 0)
+        
+        # Mesure des phases "dessin" et "affichage" (voir la classe "FrameProfiler")
+        self.timer = NULL_TIMER
+
+    # Change la surface de l'écran (par exemple après un passage en plein écran)
+    def set_target(self, target):
+        self.target = target
+        self.full_redraw = True
+
+    # Change l'image de fond ; tout l'écran sera redessiné si elle est différente
+    def set_background(self, background):
+        if background is not self.background:
+            self.background = background
+            self.full_redraw = True
+
+    # Dessine une image : le fond, les sprites dans l'ordre donné, puis les calques "hud" et "surcouche"
+    def draw(self, sprites):
+        target = self.target
+        layers = (self.hud, self.overlay)
+        
+        # Mode écran complet (ou premier affichage) : tout est redessiné
+        if not self.dirty or self.full_redraw:
+            target.blit(self.background, (0, 0))
+            self.previous_rects = [target.blit(surface, rect) for surface, rect in sprites]
+            for layer in layers:
+                if layer.items:
+                    layer.draw(target)
+                layer.changed = []
+            self.timer.mark("dessin")
+            game_display.present()
+            self.timer.mark("affichage")
+            self.count_blits(1, len(sprites))
+            self.full_redraw = False
+            self.last_update_count = 0
+            return
+        
+        # Zones à redessiner : les sprites à leur ancienne et à leur nouvelle position,
+        # et les éléments des calques qui ont changé, disparu ou sont apparus
+        screen_rect = target.get_rect()
+        sprite_rects = [rect.clip(screen_rect) for _, rect in sprites]
+        changed = self.previous_rects + sprite_rects
+        for layer in layers:
+            changed.extend(layer.changed)
+            layer.changed = []
+        
+        # Un élément de calque touché par une zone à redessiner est redessiné en entier ;
+        # sa zone s'ajoute aux zones à redessiner et peut toucher un élément d'un autre calque
+        touched = [[] for _ in layers]
+        growing = True
+        while growing:
+            growing = False
+            for layer, rects in zip(layers, touched):
+                for _, _, rect in layer.items:
+                    if rect not in rects and rect.collidelist(changed) != -1:
+                        rects.append(rect)
+                        changed.append(rect)
+                        growing = True
+        
+        # Remet le fond sous toutes les zones à redessiner, puis dessine tous les sprites 
+        # dans l'ordre et les parties concernées des calques par-dessus
+        background_blits = 0
+        for rect in changed:
+            if rect.width and rect.height:
+                target.blit(self.background, rect, rect)
+                background_blits += 1
+        for surface, rect in sprites:
+            target.blit(surface, rect)
+        for layer, rects in zip(layers, touched):
+            if rects:
+                layer.draw(target, rects)
+        self.timer.mark("dessin")
+        
+        # Envoie uniquement les zones modifiées à l'écran
+        game_display.present(changed)
+        self.timer.mark("affichage")
+        self.count_blits(background_blits, len(sprites))
+        self.previous_rects = sprite_rects
+        self.last_update_count = len(changed)
+
+    # Ajoute les blits de la dernière image aux compteurs de chaque calque
+    def count_blits(self, background, world):
+        self.blit_counts["fond"] += background
+        self.blit_counts["monde"] += world
+        self.blit_counts["hud"] = self.hud.blits
+        self.blit_counts["surcouche"] = self.overlay.blits
+
+
+# Mesure le temps processeur d'une image de jeu (40 obstacles en mouvement, joueur et HUD)
+# dans les deux modes d'affichage : écran complet ("flip") et rectangles modifiés ("dirty"),
+# avec le nombre moyen de blits par image et le nombre d'assemblages de chaque calque.
+@benchmark("rendu")
+def bench_rendering(frames=300):
+    background = load_random_background()
+    player_img = get_sprite_variant("player.png", (80, 80), smooth=True)
+    player_rect = player_img.get_rect(center=(WIDTH // 2, HEIGHT - 50))
+
+    for label, dirty in (("écran complet (flip)", False), ("rectangles modifiés", True)):
+        rng = random.Random(9)
+        group = pygame.sprite.Group()
+        for _ in range(40):
+            filename, size, speed = OBSTACLE_TYPES[rng.choice(list(OBSTACLE_TYPES))]
+            obstacle = Mobile(get_sprite_variant(filename, size), speed, 1)
+            obstacle.rect.y = rng.randint(-HEIGHT, HEIGHT)
+            group.add(obstacle)
+        renderer = FrameRenderer(screen, background, dirty)
+        state = {"frame": 0}
+
+        # Le score (et donc le calque "hud") change une fois par seconde (toutes les 60 images)
+        def hud():
+            return [(text_cache.render(f"Score : {state['frame'] // 60}", 38, WHITE), (10, 10)),
+                    (text_cache.render("Niveau : 1", 38, WHITE), (10, 50)),
+                    (text_cache.render("Bonus collectés : 0", 38, WHITE), (10, 90))]
+
+        def frame():
+            group.update()
+            state["frame"] += 1
+            sprites = [(player_img, player_rect)] + [(obstacle.image, obstacle.rect) for obstacle in group]
+            renderer.hud.update(state["frame"] // 60, hud)
+            renderer.draw(sprites)
+
+        start = time.process_time()
+        average, worst = measure_frames(frame, frames)
+        cpu = (time.process_time() - start) * 1000 / frames
+        print(f"{label:<22} CPU {cpu:6.3f} ms/image   moyenne {average:6.3f} ms   pire {worst:6.3f} ms")
+        
+        print(f"{'':<22} blits par image : " + "   ".join(f"{name} {count / frames:.2f}"
+                                                         for name, count in renderer.blit_counts.items())
+              + f"   assemblages du hud : {renderer.hud.compositions}")
+
+
+# Profileur des images du jeu : "python dysheros.py --profile" l'active dès le lancement,
+# la touche F3 l'active ou le désactive pendant la partie.
+# "--profile-log fichier" écrit son journal dans un fichier au lieu de la console.
+PROFILE_AT_START = "--profile" in sys.argv
+PROFILE_LOG = command_line_option("--profile-log")
+
+
+# Définition de la classe 'FrameProfiler' qui mesure chaque phase de la boucle principale ("SceneManager")
+# Phases mesurées : événements, clavier, apparitions, déplacements, collisions, 
+# autres (sons, changements de décor), hud (rendu des textes), dessin (blits) et affichage (flip).
+# Quand il est actif, il affiche par-dessus le jeu la moyenne de chaque phase sur les 
+# dernières images, la pire image récente et le nombre d'objets du jeu ; il écrit aussi 
+# un résumé dans le journal toutes les "log_interval" millisecondes, et chaque image 
+# plus longue que "stutter_ms" avec le détail de ses phases (saccade).
+class FrameProfiler:
     
-    # Déclare la variable "screen" pour gérer l'écran de jeu et afficher 
-    # tous les éléments (joueur, obstacles, etc.)
-    global screen
+    # Ordre d'affichage des phases
+    PHASES = ("evenements", "clavier", "apparitions", "deplacements", "collisions",
+              "autres", "hud", "dessin", "affichage")
+
+    # Initialisation : "window" est le nombre d'images des moyennes glissantes
+    def __init__(self, active=False, window=120, log_interval=5000, stutter_ms=50, log_path=None):
+        self.active = active
+        self.timer = PhaseTimer()
+        self.window = window
+        self.log_interval = log_interval
+        self.stutter_ms = stutter_ms
+        self.log_path = log_path
+        
+        # Dernières images mesurées : (durée totale, durées par phase)
+        self.frames = deque(maxlen=window)
+        
+        # Pire image depuis le dernier résumé du journal : (durée, phases, objets)
+        self.worst = None
+        
+        # Nombre d'objets du jeu à la dernière image
+        self.counts = {}
+        
+        # Surface du panneau affiché à l'écran, reconstruite deux fois par seconde au plus
+        self.panel = None
+        self.panel_time = 0
+        self.last_log = time.perf_counter()
+
+    # Renvoie le mesureur à utiliser par le jeu : le vrai si le profileur est actif
+    def current_timer(self):
+        return self.timer if self.active else NULL_TIMER
+
+    # Active ou désactive le profileur (touche F3)
+    def toggle(self):
+        self.active = not self.active
+        self.frames.clear()
+        self.worst = None
+        self.panel = None
+        
+        # L'image en cours a commencé sans mesure : le mesureur démarre maintenant,
+        # pour que la fin de cette image ne soit pas comptée depuis son dernier usage
+        if self.active:
+            self.timer.begin()
+
+    # Termine la mesure d'une image ; "counts" donne le nombre d'objets du jeu (obstacles...)
+    def end_frame(self, counts):
+        if not self.active:
+            return
+        total, phases = self.timer.end()
+        self.frames.append((total, phases))
+        self.counts = counts
+        if self.worst is None or total > self.worst[0]:
+            self.worst = (total, dict(phases), dict(counts))
+        
+        # Une image trop longue est écrite tout de suite dans le journal, avec ses phases
+        if total > self.stutter_ms:
+            self.log(f"saccade {total:.1f} ms : {self.format_phases(phases)} | {self.format_counts(counts)}")
+        
+        # Résumé régulier : moyennes glissantes, pire image et statistiques du cache des images
+        now = time.perf_counter()
+        if (now - self.last_log) * 1000 >= self.log_interval:
+            averages = self.averages()
+            worst_total, worst_phases, _ = self.worst
+            self.log(f"moyenne {sum(averages.values()):.2f} ms ({self.format_phases(averages)}) | "
+                     f"pire {worst_total:.1f} ms ({self.format_phases(worst_phases)}) | "
+                     f"{self.format_counts(counts)} | {asset_cache.stats()}")
+            self.worst = None
+            self.last_log = now
+
+    # Moyenne glissante de chaque phase sur les dernières images
+    def averages(self):
+        sums = dict.fromkeys(self.PHASES, 0.0)
+        for _, phases in self.frames:
+            for phase, duration in phases.items():
+                sums[phase] = sums.get(phase, 0.0) + duration
+        count = max(1, len(self.frames))
+        return {phase: total / count for phase, total in sums.items()}
+
+    # Texte "phase durée" des phases qui ont pris du temps, dans l'ordre des phases
+    def format_phases(self, phases):
+        return " ".join(f"{phase} {duration:.2f}" for phase, duration in phases.items() if duration >= 0.005)
+
+    # Texte "objet nombre" du nombre d'objets du jeu
+    @staticmethod
+    def format_counts(counts):
+        return " ".join(f"{name} {count}" for name, count in counts.items())
+
+    # Ecrit une ligne dans le journal (fichier "--profile-log" ou console)
+    def log(self, message):
+        line = f"[profil {time.strftime('%H:%M:%S')}] {message}"
+        if self.log_path is None:
+            print(line)
+        else:
+            with open(self.log_path, "a", encoding="utf-8") as log_file:
+                log_file.write(line + "\n")
+
+    # Renvoie le panneau du profileur à afficher (liste de (surface, position)), vide s'il est inactif
+    # Le panneau n'est reconstruit que deux fois par seconde : les chiffres restent lisibles
+    # et le profileur ne coûte presque rien à l'image qu'il mesure.
+    def overlay(self):
+        if not self.active:
+            return []
+        now = pygame.time.get_ticks()
+        if self.panel is None or now - self.panel_time >= 500:
+            self.panel = self.build_panel()
+            self.panel_time = now
+        return [(self.panel, (WIDTH - self.panel.get_width() - 10, HEIGHT - self.panel.get_height() - 10))]
+
+    # Construit le panneau : une ligne par phase (moyenne et valeur de la pire image), 
+    # puis le total, et le nombre d'objets sur les dernières lignes (deux par ligne)
+    # Chaque colonne est dessinée séparément et alignée à droite (police proportionnelle).
+    def build_panel(self):
+        font = text_cache.font(20)
+        averages = self.averages()
+        worst = max(self.frames, key=lambda frame: frame[0], default=(0.0, {}))
+        rows = [("phase", "moy.", "pire")]
+        for phase in self.PHASES:
+            rows.append((phase, f"{averages.get(phase, 0.0):.2f}", f"{worst[1].get(phase, 0.0):.2f}"))
+        rows.append(("total", f"{sum(averages.values()):.2f}", f"{worst[0]:.2f}"))
+        
+        counts = list(self.counts.items())
+        count_lines = [self.format_counts(dict(counts[start:start + 2])) for start in range(0, len(counts), 2)]
+        
+        line_height = font.get_linesize()
+        panel = pygame.Surface((250, line_height * (len(rows) + len(count_lines)) + 10), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for index, (label, average, worst_value) in enumerate(rows):
+            y = 5 + index * line_height
+            panel.blit(font.render(label, True, GREEN), (5, y))
+            for text, right in ((average, 180), (worst_value, 240)):
+                surface = font.render(text, True, GREEN)
+                panel.blit(surface, (right - surface.get_width(), y))
+        for index, line in enumerate(count_lines, len(rows)):
+            panel.blit(font.render(line, True, GREEN), (5, 5 + index * line_height))
+        return panel
+
+
+# Profileur unique du jeu, conservé d'une partie à l'autre
+profiler = FrameProfiler(PROFILE_AT_START, log_path=PROFILE_LOG)
+
+
+# Fréquence de la simulation : le jeu avance toujours par pas de "TICK_MS" millisecondes
+# (60 pas par seconde), quelle que soit la fréquence d'affichage. Les vitesses (en pixels par pas),
+# l'intervalle d'apparition des obstacles (en pas) et le score (en temps simulé) ne dépendent
+# donc plus du nombre d'images par seconde que la machine arrive à afficher.
+TICK_RATE = 60
+TICK_MS = 1000 / TICK_RATE
+
+# Durée maximale d'une image prise en compte par la simulation, en millisecondes.
+# Une machine lente saute des images mais rattrape les pas de simulation manquants ;
+# au-delà de cette durée (fenêtre déplacée, pause du système...), le temps est abandonné
+# pour éviter une longue rafale de pas de rattrapage.
+MAX_FRAME_MS = 250
+
+# Nombre maximal d'images affichées par seconde, modifiable avec "--fps N" (par exemple 30 ou 144)
+FRAME_RATE = int(command_line_option("--fps", 60))
+
+# Options d'enregistrement et de relecture des parties :
+# "--seed N" fixe la graine du générateur aléatoire de la partie,
+# "--record fichier" enregistre la partie jouée (ou simulée) dans un fichier de replay,
+# "--replay fichier" rejoue un fichier de replay en mode sans affichage.
+# La graine est ramenée entre 0 et 2**64 - 1 ("% 2 ** 64"), la plage enregistrée dans les replays :
+# "--seed -3" donne ainsi toujours la même partie, et elle peut être enregistrée.
+GAME_SEED = command_line_option("--seed")
+GAME_SEED = None if GAME_SEED is None else int(GAME_SEED) % 2 ** 64
+RECORD_FILE = command_line_option("--record")
+REPLAY_FILE = command_line_option("--replay")
+
+
+# Définition de la classe 'FixedTimestep' : un accumulateur de temps à pas fixe
+# Le temps réel écoulé à chaque image est ajouté à l'accumulateur, puis consommé 
+# par pas entiers de "step_ms" ; le reste (fraction de pas) sert à l'interpolation de l'affichage.
+class FixedTimestep:
     
-    # Déclare la variable "bonus_collected" pour indiquer si un bonus 
-    # a été collecté récemment par le joueur
-    global bonus_collected
+    # Initialisation avec la durée d'un pas et la durée maximale d'une image (en millisecondes)
+    def __init__(self, step_ms=TICK_MS, max_frame_ms=MAX_FRAME_MS):
+        self.step_ms = step_ms
+        self.max_frame_ms = max_frame_ms
+        self.accumulator = 0.0
+
+    # Ajoute le temps écoulé depuis l'image précédente et renvoie le nombre de pas à simuler
+    def advance(self, elapsed_ms):
+        self.accumulator += min(elapsed_ms, self.max_frame_ms)
+        steps = int(self.accumulator // self.step_ms)
+        self.accumulator -= steps * self.step_ms
+        return steps
+
+    # Fraction du pas suivant déjà écoulée (entre 0 et 1), utilisée pour l'interpolation
+    @property
+    def alpha(self):
+        return self.accumulator / self.step_ms
+
+    # Oublie le temps accumulé (après une pause de la partie)
+    def reset(self):
+        self.accumulator = 0.0
+
+
+# Fonction qui renvoie le rectangle d'affichage d'un sprite entre deux pas de simulation
+# "previous" est la position (x, y) au pas précédent, "rect" la position au pas actuel 
+# et "alpha" la fraction du pas écoulée : le sprite est dessiné entre les deux positions,
+# ce qui donne un mouvement fluide même si l'affichage est plus rapide que la simulation.
+def interpolate_rect(rect, previous, alpha):
+    x = previous[0] + (rect.x - previous[0]) * alpha
+    y = previous[1] + (rect.y - previous[1]) * alpha
+    return pygame.Rect(round(x), round(y), rect.width, rect.height)
+
+
+# Touches du clavier enregistrées dans un replay, dans l'ordre des bits : 
+# gauche = bit 0, droite = bit 1, haut = bit 2, bas = bit 3
+REPLAY_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)
+
+# Etat du clavier correspondant à chacune des 16 combinaisons de bits possibles,
+# construit une seule fois : rejouer un pas ne crée aucun objet
+KEY_STATES = tuple(
+    defaultdict(bool, {key: True for bit, key in enumerate(REPLAY_KEYS) if bits & (1 << bit)})
+    for bits in range(1 << len(REPLAY_KEYS))
+)
+
+
+# Définition de la classe 'Replay' : l'enregistrement compact d'une partie
+# Une partie est entièrement déterminée par la graine de son générateur aléatoire 
+# et par les touches enfoncées à chaque pas de simulation. Les touches sont stockées 
+# sous forme de champs de bits, un octet par pas, dans un "array" (environ 20 Ko pour
+# une partie complète de 34 niveaux).
+# Format du fichier : en-tête "<4sBBQI" (signature, version, options, graine, nombre de pas)
+# suivi d'un octet par pas.
+class Replay:
     
-    # Déclare la variable "bonus_display_timer" pour mesurer le temps écoulé 
-    # depuis que le dernier bonus a été collecté
-    global bonus_display_timer
+    # Signature, version du format et option "god_mode" (bit 0 des options)
+    MAGIC = b"DYSR"
+    VERSION = 1
+    HEADER = struct.Struct("<4sBBQI")
+    GOD_MODE = 1
+
+    # Initialisation avec la graine de la partie, son mode et les touches déjà enregistrées
+    def __init__(self, seed, god_mode=False, inputs=b""):
+        self.seed = seed
+        self.god_mode = god_mode
+        self.inputs = array("B", inputs)
+
+    # Enregistre les touches d'un pas de simulation
+    def record(self, keys):
+        bits = 0
+        for bit, key in enumerate(REPLAY_KEYS):
+            if keys[key]:
+                bits |= 1 << bit
+        self.inputs.append(bits)
+
+    # Renvoie l'état du clavier de chaque pas enregistré, dans l'ordre
+    def keys(self):
+        for bits in self.inputs:
+            yield KEY_STATES[bits]
+
+    # Nombre de pas enregistrés
+    def __len__(self):
+        return len(self.inputs)
+
+    # Convertit l'enregistrement en données binaires (en-tête + touches)
+    def to_bytes(self):
+        flags = self.GOD_MODE if self.god_mode else 0
+        header = self.HEADER.pack(self.MAGIC, self.VERSION, flags, self.seed, len(self.inputs))
+        return header + self.inputs.tobytes()
+
+    # Reconstruit un enregistrement à partir de données binaires
+    # Une erreur "ValueError" est levée si les données ne sont pas un replay valide.
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < cls.HEADER.size:
+            raise ValueError("Replay trop court")
+        magic, version, flags, seed, count = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError("Format de replay inconnu")
+        inputs = data[cls.HEADER.size:]
+        if len(inputs) != count:
+            raise ValueError("Replay incomplet")
+        return cls(seed, bool(flags & cls.GOD_MODE), inputs)
+
+    # Enregistre le replay dans un fichier
+    def save(self, path):
+        with open(path, "wb") as replay_file:
+            replay_file.write(self.to_bytes())
+
+    # Charge un replay depuis un fichier
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as replay_file:
+            return cls.from_bytes(replay_file.read())
+
+
+# Définition de la classe 'GameSession' qui contient l'état et les règles d'une partie
+# Elle regroupe tout ce qui était géré par la boucle du jeu à chaque image : déplacement du joueur,
+# apparition des obstacles et des power-ups, déplacements, collisions, effets des power-ups,
+# score et niveaux. Elle ne dessine rien, ne joue aucun son et n'attend jamais :
+# le temps de la partie est un temps simulé qui avance d'un pas à chaque appel de "step()",
+# à pas fixes de "TICK_MS" millisecondes : la scène "PlayScene" fait autant de pas que le temps réel écoulé
+# l'exige, le mode sans affichage les enchaîne sans attendre.
+class GameSession:
     
-    # Déclare la variable "bonus_collected_count" pour compter le nombre total 
-    # de bonus collectés par le joueur
-    global bonus_collected_count
-
-
-    # Initialisation des variables de jeu pour le suivi du nombre de bonus collectés
-    bonus_collected_count = 0
-
-    # Création de groupes de sprites pour gérer les obstacles et les power-ups
-    
-    # Crée un groupe de sprites pour gérer tous les obstacles dans le jeu
-    # "pygame.sprite.Group()" crée un groupe qui peut contenir plusieurs objets (sprites) 
-    # de type obstacle
-    # Cela permet de les gérer facilement ensemble, 
-    # comme pour les déplacements ou les collisions.
-    obstacles = pygame.sprite.Group()
-    
-    
-    # Crée un groupe de sprites pour gérer tous les 'power-ups' dans le jeu
-    # "pygame.sprite.Group()" crée également un groupe pour les 'power-ups', 
-    # facilitant leur gestion
-    # Les 'power-ups' peuvent être ajoutés, mis à jour et vérifiés pour les collisions.
-    powerups = pygame.sprite.Group()
-
-    # Définition des timers pour contrôler l'apparition des obstacles et le déroulement du jeu
-    # Cette section initialise les variables utilisées pour gérer le timing et l’état du jeu
-    
-    # Initialise le "spawn_timer" à 0 pour démarrer le compte du temps écoulé 
-    # avant l'apparition d'un nouvel obstacle
-    spawn_timer = 0
-    
-    # Définit "spawn_interval" à 60 pour espacer l’apparition des obstacles
-    # Cet intervalle est exprimé en images (frames) : 
-    # 60 correspond à 1 seconde si le jeu fonctionne à 60 images par seconde.
-    spawn_interval = 60  # Intervalle entre apparitions des obstacles, exprimé en images.
-    
-    # Définit la "player_speed" à 5, qui est la vitesse de déplacement du joueur dans le jeu
-    # Une valeur plus élevée permettrait au joueur de se déplacer plus rapidement
-    player_speed = 5  # Vitesse de déplacement du joueur.
-    
-    # Initialise le "score" du joueur à 0, 
-    # car le joueur commence le jeu sans avoir marqué de points
-    score = 0  # Initialisation du score du joueur à 0.
-    
-    # Définit le "level" à 1 pour indiquer que le joueur commence au niveau 1
-    level = 1  # Définition du niveau de départ du joueur
-    
-    # Définit "invincible" sur False car le joueur n’est pas invincible au départ
-    # Lorsque ce statut est activé, le joueur est temporairement protégé des obstacles.
-    invincible = False  # Statut d'invincibilité du joueur (désactivé au départ).
-    
-    # Définit "slow_obstacles" sur False car les obstacles ne sont pas ralentis par défaut
-    # Ce statut peut être activé temporairement par un power-up 
-    # pour diminuer la vitesse des obstacles
-    slow_obstacles = False  # Indicateur pour ralentir les obstacles (désactivé).
-    
-    # Initialise le "powerup_timer" à 0 pour suivre le temps pendant lequel un power-up est actif
-    powerup_timer = 0  # Timer pour mesurer la durée des effets de power-ups
-    
-    # Définit "fullscreen" sur False, ce qui signifie que le jeu démarre en mode fenêtre
-    # Lorsqu’il est activé, le jeu s'affiche en mode plein écran
-    fullscreen = False  # Mode plein écran désactivé par défaut
-    
-    # Initialise "bonus_collected" à False, car le joueur n’a pas encore collecté 
-    # de bonus au début du jeu
-    bonus_collected = False  # Indicateur pour savoir si un bonus a été collecté
-    
-    # Initialise "bonus_display_timer" à 0 pour mesurer la durée d’affichage 
-    # d’un message lorsqu’un bonus est collecté
-    bonus_display_timer = 0  # Timer pour afficher un message lorsqu'un bonus est collecté
-
-
-
-    # Stocke l'heure de la dernière mise à jour du score en millisecondes
-    # "pygame.time.get_ticks()" renvoie le nombre de 
-    # millisecondes écoulées depuis le début du jeu
-    # Cette valeur est utilisée pour savoir quand le score doit être mis à jour
-    last_score_update = pygame.time.get_ticks()
-    
-    
-    # Charge une image de fond aléatoire au début de la partie
-    # "load_random_background()" est une fonction qui choisit une image parmi plusieurs options
-    # Elle permet de varier l'apparence du fond d'écran durant chaque partie
-    background = load_random_background()
-
-    # Chargement de l'image du joueur et redimensionnement
-    # La fonction "pygame.image.load()" charge l'image, et "convert_alpha()" 
-    # conserve sa transparence
-    player_img = pygame.image.load(resource_path("player.png")).convert_alpha()
-    
-    # Redimensionne l'image du joueur pour qu'elle mesure exactement 55x55 pixels
-    # "pygame.transform.smoothscale()" ajuste la taille de l'image 
-    # et lisse les bords pour une meilleure qualité
-    # Cela permet d'obtenir une image de joueur cohérente en taille 
-    # avec les autres éléments du jeu
-    player_img = pygame.transform.smoothscale(player_img, (80, 80))  
-
-    # Crée un rectangle de collision pour le joueur à partir de l'image redimensionnée
-    # "player_img.get_rect()" génère un rectangle (rect) autour de l'image, 
-    # qui sera utilisé pour la position et les collisions
-    # Ce rectangle permettra de détecter quand le joueur entre en contact 
-    # avec des obstacles ou des power-ups
-    player_rect = player_img.get_rect()
-    
-    
-    # Positionne le rectangle du joueur au centre de l'écran, en bas
-    # "player_rect.center" place le centre du rectangle à une position spécifique
-    # Ici, "WIDTH // 2" le centre horizontalement, et "HEIGHT - 50" 
-    # le place légèrement au-dessus du bas de l'écran
-    player_rect.center = (WIDTH // 2, HEIGHT - 50)
-    
-
-    # Chargement des images pour les différents types d'obstacles
-    
-    # Chargement de l'image pour l'obstacle de petite taille
-    # "pygame.image.load()" charge l'image à partir du fichier "obstacle_small.png" 
-    # et "resource_path()" assure que le chemin du fichier est correct
-    # "convert_alpha()" permet de gérer la transparence de l'image, 
-    # pour qu'elle s'affiche correctement dans le jeu
-    obstacle_small = pygame.image.load(resource_path("obstacle_small.png")).convert_alpha()
-    
-    
-    # Chargement de l'image pour l'obstacle de taille moyenne
-    # Cette image est chargée de manière similaire à celle de l'obstacle petit,
-    # mais provient d'un fichier différent, "obstacle_medium.png"
-    obstacle_medium = pygame.image.load(resource_path("obstacle_medium.png")).convert_alpha()
-    
-    
-    # Chargement de l'image pour l'obstacle de grande taille
-    # De même, cette ligne charge l'image pour l'obstacle grand, 
-    # en utilisant le fichier "obstacle_large.png" et en gérant la transparence 
-    # avec "convert_alpha()"
-    obstacle_large = pygame.image.load(resource_path("obstacle_large.png")).convert_alpha()
-    
-    
-
-    # Chargement de l'image du power-up et redimensionnement à 40x40 pixels
-    
-    # Chargement de l'image pour le power-up
-    # "pygame.image.load()" charge l'image à partir du fichier "powerup.png"
-    # "resource_path()" garantit que le chemin du fichier est correct
-    # "convert_alpha()" permet de gérer la transparence de l'image 
-    # pour qu'elle s'affiche sans bords indésirables
-    powerup_img = pygame.image.load(resource_path("powerup.png")).convert_alpha()
-    
-    
-    # Redimensionnement de l'image du power-up à une taille de 35x35 pixels
-    # "pygame.transform.scale()" ajuste la taille de l'image, 
-    # ici pour qu'elle soit plus petite et s'intègre mieux au jeu
-    powerup_img = pygame.transform.scale(powerup_img, (35, 35))
-
-    # Création de l'horloge pour contrôler la vitesse du jeu
-    
-    # Création de l'horloge pour contrôler la vitesse de la boucle du jeu
-    # "pygame.time.Clock()" crée un objet 'horloge' qui permet de limiter 
-    # le nombre d'images par seconde
-    # Cela aide à maintenir une vitesse constante pour le déroulement du jeu
-    clock = pygame.time.Clock()
-    
-    
-    # Variable pour indiquer si le jeu est en cours
-    # "running = True" signifie que la boucle principale du jeu fonctionnera 
-    # jusqu'à ce que cette variable soit False
-    running = True  # Contrôle l'état de la boucle principale du jeu
-    
-    
-    # Indicateur pour vérifier si l'alerte de combat final a été affichée
-    # "alert_displayed = False" signifie que l'alerte ne s'affiche qu'une fois, 
-    # et une fois affichée, cette variable sera mise à True pour éviter de la répéter
-    alert_displayed = False  # Indicateur pour savoir si l'alerte de combat final a été affichée
-    
-
-    # Boucle principale du jeu
-    # Cette boucle continue de s'exécuter tant que la variable "running" est True
-    # Elle gère tous les éléments du jeu, comme l'affichage, le mouvement et les interactions
-    while running:
+    # Initialisation d'une nouvelle partie
+    # "god_mode" rend les collisions non mortelles (elles sont seulement comptées), 
+    # ce qui sert à simuler une partie complète.
+    # "seed" est la graine du générateur aléatoire de la partie (tirée au hasard si None) :
+    # tous les tirages de la partie en dépendent, elle peut donc être rejouée à l'identique.
+    # "vectorized" range les obstacles dans un "ObstacleArray" (NumPy) au lieu de sprites "Mobile".
+    def __init__(self, god_mode=False, seed=None, vectorized=NUMPY_OBSTACLES):
         
+        # Générateur de nombres aléatoires propre à la partie
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.rng = random.Random(self.seed)
         
-        # Gère les événements du jeu (comme appuyer sur une touche ou fermer la fenêtre)
-        # "pygame.event.get()" récupère tous les événements récents qui se sont produits
-        # La boucle "for" parcourt chaque événement un par un pour vérifier ce qu'il faut faire
-        for event in pygame.event.get():
-            
-            # Vérifie si l'événement est de type "QUIT", 
-            # ce qui signifie que l'utilisateur veut fermer la fenêtre
-            if event.type == pygame.QUIT:
-                
-                # Si la fenêtre est fermée, on arrête la boucle principale du jeu
-                # En mettant "running = False", la boucle "while" s'arrête, 
-                # ce qui met fin au jeu
-                running = False
-                
-                
-            # Vérifie si l'événement est de type "KEYDOWN", 
-            # ce qui signifie qu'une touche a été enfoncée
-            elif event.type == pygame.KEYDOWN:
-                
-                # Vérifie si la touche enfoncée est la touche "f"
-                # "pygame.K_f" correspond à la touche "f" du clavier
-                if event.key == pygame.K_f:
-                    
-                    # Bascule le mode plein écran entre activé et désactivé
-                    # "fullscreen = not fullscreen" change la valeur
-                    # de "fullscreen" de True à False ou inversement
-                    # Cela signifie que si le plein écran est activé, 
-                    # il sera désactivé, et vice versa
-                    fullscreen = not fullscreen
-                    
-
-                    # Applique le mode plein écran si la variable "fullscreen" est True
-                    # "pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)" 
-                    # ajuste la fenêtre pour qu'elle prenne tout l'écran
-                    if fullscreen:
-                        screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
-                    
-                    # Sinon, restaure la fenêtre à sa taille normale si "fullscreen" est False
-                    else:
-                        # "pygame.display.set_mode((WIDTH, HEIGHT))" 
-                        # crée une fenêtre de jeu avec les dimensions standard
-                        screen = pygame.display.set_mode((WIDTH, HEIGHT))
-                        
-
-        # Gère le déplacement du joueur en fonction des touches directionnelles pressées
-        # "pygame.key.get_pressed()" vérifie l'état de chaque touche 
-        # et renvoie un dictionnaire de touches pressées
-        # Ce dictionnaire permet de savoir quelles touches 
-        # sont actuellement enfoncées pour contrôler le mouvement du joueur
-        keys = pygame.key.get_pressed()
+        # Enregistrement de la partie (graine et touches de chaque pas)
+        self.replay = Replay(self.seed, god_mode)
         
-
-        # Vérifie si la touche directionnelle gauche est enfoncée 
-        # et si le joueur n'est pas déjà au bord gauche de l'écran
+        # Groupes de sprites pour gérer tous les obstacles et tous les power-ups du jeu
+        # "pygame.sprite.Group()" permet de les gérer facilement ensemble, 
+        # comme pour les déplacements ou les collisions.
+        self.obstacles = pygame.sprite.Group()
+        self.powerups = pygame.sprite.Group()
+        
+        # Système de détection des collisions entre le joueur, les obstacles et les power-ups
+        # Il parcourt les deux groupes et s'arrête au premier obstacle qui touche le joueur.
+        self.collisions = CollisionSystem(self.obstacles, self.powerups)
+        
+        # Timer et intervalle d'apparition des obstacles, exprimés en pas de simulation :
+        # 60 correspond à 1 seconde (la simulation fait toujours 60 pas par seconde).
+        self.spawn_timer = 0
+        self.spawn_interval = 60
+        
+        # Vitesse de déplacement du joueur
+        self.player_speed = 5
+        
+        # Score et niveau de départ du joueur
+        self.score = 0
+        self.level = 1
+        
+        # Effets des power-ups (désactivés au départ) et timer de leur durée d'activation
+        self.invincible = False
+        self.slow_obstacles = False
+        self.powerup_timer = 0
+        
+        # Message "Bonus collecté !", timer de son affichage et nombre total de bonus collectés
+        self.bonus_collected = False
+        self.bonus_display_timer = 0
+        self.bonus_collected_count = 0
+        
+        # Temps simulé de la dernière mise à jour du score, en millisecondes
+        self.last_score_update = 0
+        
+        # Indicateur pour savoir si l'alerte de combat final a déjà été déclenchée
+        self.alert_displayed = False
+        
+        # Mode sans collision mortelle, nombre de pas avec une collision dans ce mode,
+        # nombre de pas simulés et indicateur de fin de partie
+        self.god_mode = god_mode
+        self.fatal_hits = 0
+        self.ticks = 0
+        self.finished = False
+        
+        # Mesure des phases de la simulation (voir la classe "FrameProfiler")
+        self.timer = NULL_TIMER
+        
+        # Image du joueur redimensionnée à 80x80 pixels avec un lissage des bords,
+        # gardée en cache : une nouvelle partie ne la recharge pas
+        self.player_img = get_sprite_variant("player.png", (80, 80), smooth=True)
+        
+        # Rectangle de collision du joueur, placé au centre de l'écran, en bas
+        self.player_rect = self.player_img.get_rect()
+        self.player_rect.center = (WIDTH // 2, HEIGHT - 50)
+        
+        # Position du joueur au pas précédent (pour l'affichage entre deux pas)
+        self.player_previous = self.player_rect.topleft
+        
+        # Masque de collision du joueur, utilisé pour les collisions au pixel près
+        # (None si l'option "PIXEL_PERFECT_COLLISIONS" est désactivée : seuls les rectangles comptent)
+        self.player_mask = get_sprite_mask(self.player_img) if PIXEL_PERFECT_COLLISIONS else None
+        
+        # Images des différents types d'obstacles (petit, moyen, grand), chacune redimensionnée
+        # une seule fois à sa taille définie dans "OBSTACLE_TYPES"
+        self.obstacle_images = {}
+        for obstacle_type, (filename, size, _) in OBSTACLE_TYPES.items():
+            self.obstacle_images[obstacle_type] = get_sprite_variant(filename, size)
+        
+        # Image du power-up redimensionnée à 35x35 pixels, partagée par tous les power-ups
+        self.powerup_img = get_sprite_variant("powerup.png", (35, 35))
+        
+        # Avec le moteur vectorisé, les obstacles sont rangés dans des tableaux NumPy
+        # et le groupe "obstacles" reste vide
+        self.obstacle_array = ObstacleArray(self.obstacle_images) if vectorized else None
+
+    # Déplace le joueur en fonction des touches directionnelles pressées
+    # "keys" indique pour chaque touche si elle est enfoncée (comme "pygame.key.get_pressed()")
+    # Le joueur ne peut pas sortir de l'écran.
+    def move_player(self, keys):
+        player_rect = self.player_rect
+        self.player_previous = player_rect.topleft
         if keys[pygame.K_LEFT] and player_rect.left > 0:
-            
-            # Déplace le joueur vers la gauche en réduisant sa position X 
-            # d'un montant égal à "player_speed"
-            player_rect.x -= player_speed 
-            
-             
-        # Vérifie si la touche directionnelle droite est enfoncée 
-        # et si le joueur n'est pas déjà au bord droit de l'écran
+            player_rect.x -= self.player_speed
         if keys[pygame.K_RIGHT] and player_rect.right < WIDTH:
-            
-            # Déplace le joueur vers la droite en augmentant sa position X 
-            # d'un montant égal à "player_speed"
-            player_rect.x += player_speed  
-            
-            
-        # Vérifie si la touche directionnelle haut est enfoncée 
-        # et si le joueur n'est pas déjà au bord supérieur de l'écran
+            player_rect.x += self.player_speed
         if keys[pygame.K_UP] and player_rect.top > 0:
-            
-            # Déplace le joueur vers le haut en réduisant sa position Y 
-            # d'un montant égal à "player_speed"
-            player_rect.y -= player_speed 
-            
-             
-        # Vérifie si la touche directionnelle bas est enfoncée 
-        # et si le joueur n'est pas déjà au bord inférieur de l'écran
+            player_rect.y -= self.player_speed
         if keys[pygame.K_DOWN] and player_rect.bottom < HEIGHT:
-            
-            # Déplace le joueur vers le bas en augmentant sa position Y 
-            # d'un montant égal à "player_speed"
-            player_rect.y += player_speed  
+            player_rect.y += self.player_speed
 
-        # Incrémente le timer pour contrôler l'apparition des obstacles
-        # "spawn_timer" augmente de 1 à chaque cycle de la boucle pour mesurer le temps écoulé
-        spawn_timer += 1
+    # Crée un nouvel obstacle et, avec une probabilité de 30 %, un nouveau power-up
+    def spawn(self):
         
-
+        # Choisit aléatoirement le type d'obstacle (petit, moyen ou grand)
+        # et calcule sa vitesse : vitesse de base de son type + niveau actuel
+        obstacle_type = self.rng.choice(["small", "medium", "large"])
+        speed = OBSTACLE_TYPES[obstacle_type][2] + self.level
         
-        # Crée un nouvel obstacle lorsque le timer atteint l'intervalle défini pour l'apparition
-        # "spawn_timer >= spawn_interval" vérifie si le temps écoulé depuis le dernier obstacle
-        # a atteint la durée spécifiée par "spawn_interval"
-        if spawn_timer >= spawn_interval:
-            
-            # Choisit aléatoirement le type d'obstacle (petit, moyen ou grand)
-            # "random.choice()" sélectionne un élément au hasard 
-            # dans la liste des types d'obstacles
-            obstacle_type = random.choice(["small", "medium", "large"])
-            
-            
-            # Définit l'image, la taille et la vitesse de l'obstacle en fonction du type choisi
-            # Utilise une expression conditionnelle pour chaque type d'obstacle
-            # - Si "obstacle_type" est "small", utilise l'image "obstacle_small" 
-            # avec une taille de 25x25 pixels et une vitesse de 7 + niveau
-            # - Si "obstacle_type" est "medium", utilise "obstacle_medium" 
-            # avec une taille de 45x45 pixels et une vitesse de 5 + niveau
-            # - Si "obstacle_type" est "large", utilise "obstacle_large" 
-            # avec une taille de 65x65 pixels et une vitesse de 3 + niveau
-            img, size, speed = (obstacle_small, (25, 25), 7 + level) if obstacle_type == "small" else \
-                               (obstacle_medium, (45, 45), 5 + level) if obstacle_type == "medium" else \
-                               (obstacle_large, (65, 65), 3 + level)
-                               
+        # Crée l'obstacle avec l'image partagée de son type et l'ajoute à son groupe
+        if self.obstacle_array is not None:
+            self.obstacle_array.spawn(obstacle_type, speed, self.level, self.rng)
+        else:
+            new_obstacle = obstacle_pool.acquire(self.obstacle_images[obstacle_type], speed, self.level, self.rng)
+            self.obstacles.add(new_obstacle)
+        
+        # Crée un power-up aléatoirement avec une probabilité d'affichage de 30 %
+        # Son type ("invincible" ou "slow") est choisi au hasard, sa vitesse de chute est de 3
+        if self.rng.random() < 0.3:
+            powerup_type = self.rng.choice(["invincible", "slow"])
+            new_powerup = powerup_pool.acquire(self.powerup_img, 3, powerup_type, self.rng)
+            self.powerups.add(new_powerup)
+
+    # Termine la partie : supprime tous les obstacles et power-ups encore en jeu,
+    # ce qui les rend à leurs réserves pour la partie suivante
+    def clear(self):
+        for sprite in self.obstacles.sprites() + self.powerups.sprites():
+            sprite.kill()
+
+    # Renvoie l'obstacle (ou son numéro avec le moteur vectorisé) qui touche le joueur, ou None
+    def obstacle_hit(self):
+        if self.obstacle_array is not None:
+            return self.obstacle_array.first_hit(self.player_rect, self.player_mask)
+        return self.collisions.first_obstacle_hit(self.player_rect, self.player_mask)
+
+    # Nombre d'obstacles en jeu
+    @property
+    def obstacle_count(self):
+        if self.obstacle_array is not None:
+            return len(self.obstacle_array)
+        return len(self.obstacles)
+
+    # Temps simulé de la partie en millisecondes
+    @property
+    def time_ms(self):
+        return self.ticks * TICK_MS
+
+    # Fait avancer la partie d'un pas de simulation ("TICK_MS" millisecondes)
+    # "keys" est l'état des touches pendant ce pas.
+    # Renvoie la liste des événements du pas, que l'appelant traduit en sons et en écrans :
+    # "bonus" (power-up collecté), "level_up" (nouveau niveau), "final_alert" (début du
+    # combat final), "game_over" (obstacle touché) et "victory" (niveau 34 atteint).
+    def step(self, keys):
+        events = []
+        self.ticks += 1
+        now = self.time_ms
+        
+        # Enregistre les touches du pas pour pouvoir rejouer la partie
+        self.replay.record(keys)
+        
+        # Déplacement du joueur
+        self.move_player(keys)
+        self.timer.mark("clavier")
+        
+        # Incrémente le timer d'apparition et crée un obstacle lorsqu'il atteint l'intervalle
+        self.spawn_timer += 1
+        if self.spawn_timer >= self.spawn_interval:
+            self.spawn()
+            self.spawn_timer = 0
+        self.timer.mark("apparitions")
+        
+        # Met à jour la position de chaque obstacle et power-up dans leurs groupes respectifs
+        if self.obstacle_array is not None:
+            self.obstacle_array.update()
+        else:
+            self.obstacles.update()
+        self.powerups.update()
+        self.timer.mark("deplacements")
+        
+        # Vérifie s'il y a une collision entre le joueur et un obstacle
+        # La collision n'est prise en compte que si le joueur n'est pas invincible
+        if not self.invincible and self.obstacle_hit() is not None:
+            if self.god_mode:
+                self.fatal_hits += 1
+            else:
+                # La partie est terminée : rien d'autre ne se passe pendant ce pas
+                self.finished = True
+                events.append("game_over")
+                self.timer.mark("collisions")
+                return events
+        
+        # Vérifie s'il y a des collisions entre le joueur et les power-ups
+        for powerup in self.collisions.powerup_hits(self.player_rect):
             
-            # Redimensionne l'image de l'obstacle à la taille définie par "size"
-            # "pygame.transform.scale(img, size)" 
-            # ajuste les dimensions de l'image pour qu'elle corresponde 
-            # au type d'obstacle (petit, moyen ou grand)
-            img = pygame.transform.scale(img, size)
+            # Active l'effet du power-up en fonction de son type et démarre le timer de sa durée
+            if powerup.type == "invincible":
+                self.invincible = True
+            elif powerup.type == "slow":
+                self.slow_obstacles = True
+            self.powerup_timer = now
             
-            # Crée un nouvel obstacle en utilisant l'image redimensionnée, 
-            # la vitesse et le niveau actuel
-            # La classe "Mobile" est utilisée pour créer un objet obstacle 
-            # avec ses propriétés spécifiques  
-            new_obstacle = Mobile(img, speed, level)
+            # Active le message de bonus collecté et compte le bonus
+            self.bonus_collected = True
+            self.bonus_display_timer = now
+            self.bonus_collected_count += 1
+            events.append("bonus")
             
-            # Ajoute le nouvel obstacle au groupe d'obstacles
-            # "obstacles.add(new_obstacle)" permet de gérer facilement 
-            # tous les obstacles ensemble dans le groupe  
-            obstacles.add(new_obstacle)
+            # Supprime le power-up pour qu'il ne soit plus affiché ni collecté à nouveau
+            powerup.kill()
+        self.timer.mark("collisions")
+        
+        # Désactive les effets des power-ups après 6 secondes (6000 millisecondes)
+        if (self.invincible or self.slow_obstacles) and now - self.powerup_timer > 6000:
+            self.invincible = False
+            self.slow_obstacles = False
+        
+        # Le message de bonus collecté disparaît après une seconde (1000 millisecondes)
+        if self.bonus_collected and now - self.bonus_display_timer > 1000:
+            self.bonus_collected = False
+        
+        # Ajoute un point au score à chaque seconde écoulée
+        if now - self.last_score_update >= 1000:
+            self.score += 1
+            self.last_score_update = now
             
-            # Réinitialise le timer d'apparition des obstacles à 0
-            # Cela permet de redémarrer le compte à rebours avant 
-            # la création du prochain obstacle  
-            spawn_timer = 0 
-             
+            # Augmente le niveau tous les 10 points de score
+            if self.score % 10 == 0:
+                self.level_up()
+                events.append("level_up")
+        
+        # Déclenche une seule fois l'alerte du combat final à partir du niveau 12
+        if self.level >= 12 and not self.alert_displayed:
+            self.alert_displayed = True
+            events.append("final_alert")
+        
+        # La partie est gagnée lorsque le niveau atteint 34
+        if self.level >= 34:
+            self.finished = True
+            events.append("victory")
+        
+        return events
+
+    # Passe au niveau suivant et ajuste les paramètres du jeu :
+    # les obstacles apparaissent plus souvent (intervalle réduit de 5, au minimum 20)
+    # et le joueur se déplace plus vite (vitesse augmentée de 0.5, au maximum 10)
+    def level_up(self):
+        self.level += 1
+        self.spawn_interval = max(20, self.spawn_interval - 5)
+        self.player_speed = min(10, self.player_speed + 0.5)
+
+    # Place la partie directement au début du niveau "level", avec le score et les paramètres
+    # qu'elle aurait en y arrivant normalement (utilisé par les scénarios de mesure)
+    def set_level(self, level):
+        while self.level < level:
+            self.level_up()
+        self.score = (self.level - 1) * 10
+        self.alert_displayed = self.level >= 12
+
+    # Renvoie la liste des images à afficher (image, rectangle), dans l'ordre où elles 
+    # sont dessinées : d'abord le joueur, puis chaque obstacle et chaque power-up
+    # "alpha" est la fraction du pas suivant déjà écoulée : chaque sprite est placé entre
+    # sa position précédente et sa position actuelle (1 = position actuelle).
+    def sprites(self, alpha=1.0):
+        sprites = [(self.player_img, interpolate_rect(self.player_rect, self.player_previous, alpha))]
+        if self.obstacle_array is not None:
+            sprites.extend(self.obstacle_array.sprites(alpha))
+        else:
+            sprites.extend((obstacle.image, interpolate_rect(obstacle.rect, obstacle.previous_topleft, alpha))
+                           for obstacle in self.obstacles)
+        sprites.extend((powerup.image, interpolate_rect(powerup.rect, powerup.previous_topleft, alpha))
+                       for powerup in self.powerups)
+        return sprites
+
+    # Renvoie la liste des textes du HUD (image, position), affichés par-dessus les sprites
+    # "text_cache.render()" réutilise les surfaces déjà rendues tant que les valeurs ne changent pas.
+    def hud(self):
+        
+        # Score et niveau actuels en haut à gauche, nombre de bonus collectés juste en dessous
+        hud = [(text_cache.render(f"Bonus collectés : {self.bonus_collected_count}", 38, WHITE), (10, 90))]
+        
+        # Message temporaire au centre de l'écran si un bonus a été collecté récemment
+        if self.bonus_collected:
+            hud.append((text_cache.render("Bonus collecté !", 38, WHITE), (WIDTH // 2 - 100, HEIGHT // 2)))
+        
+        hud.append((text_cache.render(f"Score : {self.score}", 38, WHITE), (10, 10)))
+        hud.append((text_cache.render(f"Niveau : {self.level}", 38, WHITE), (10, 50)))
+        
+        # "Invincible !" en jaune doré dans le coin supérieur droit si l'invincibilité est active
+        if self.invincible:
+            hud.append((text_cache.render("Invincible !", 38, (255, 215, 0)), (WIDTH - 150, 10)))
+        
+        # "Obstacles ralentis !" en orange, un peu plus bas, si le ralentissement est actif
+        if self.slow_obstacles:
+            hud.append((text_cache.render("Obstacles ralentis !", 38, (255, 165, 0)), (WIDTH - 250, 50)))
+        
+        return hud
 
-            
-            # Crée un power-up aléatoirement avec une probabilité d'affichage de 30 %
-            # "random.random()" génère un nombre décimal entre 0 et 1
-            # Si ce nombre est inférieur à 0.3, alors un power-up sera créé 
-            # (soit environ 30 % de chances)
-            if random.random() < 0.3:
-                
-                # Choisit aléatoirement le type de power-up entre "invincible" et "slow"
-                # "random.choice()" sélectionne un des deux types 
-                # de power-ups de manière aléatoire
-                powerup_type = random.choice(["invincible", "slow"])
-                
-                # Crée un nouvel objet power-up avec l'image "powerup_img", 
-                # une vitesse de chute de 3, et le type choisi
-                # La classe "PowerUp" est utilisée pour définir 
-                # le comportement et les propriétés du power-up
-                new_powerup = PowerUp(powerup_img, 3, powerup_type)
-                
-                # Ajoute le power-up créé au groupe de power-ups pour pouvoir 
-                # le gérer avec d'autres power-ups
-                powerups.add(new_powerup)
-                
+    # Renvoie les valeurs affichées par "hud()" : le calque du HUD n'est assemblé à nouveau 
+    # (voir "RenderLayer.update()") que lorsque l'une d'elles change
+    def hud_state(self):
+        return (self.score, self.level, self.bonus_collected_count, 
+                bool(self.bonus_collected), bool(self.invincible), bool(self.slow_obstacles))
 
-        # Met à jour la position de chaque obstacle et power-up dans leurs groupes respectifs
-        # "obstacles.update()" et "powerups.update()" 
-        # appellent la méthode update() pour chaque objet dans ces groupes
-        # Cela permet de déplacer les obstacles et power-ups en fonction de leurs propriétés
-        obstacles.update()
-        powerups.update()
+
+# Définition de la classe 'PlayScene' : la partie elle-même
+# Cette scène est le cœur du jeu : elle gère l'affichage des éléments à l'écran, 
+# les interactions avec le joueur et la logique du jeu (comme le score et le niveau).
+# Les règles du jeu sont dans la classe "GameSession" : la scène lui transmet les touches
+# et le temps écoulé à chaque image, puis joue les sons, change de scène et dessine l'image.
+class PlayScene(Scene):
+    
+    # Nombre maximal d'images par seconde, modifiable avec "--fps N"
+    frame_rate = FRAME_RATE
+
+    # "seed" est la graine de la partie (celle de "--seed" par défaut, sinon une graine au hasard)
+    def __init__(self, seed=GAME_SEED):
+        super().__init__()
+        self.seed = seed
+
+    def enter(self, manager):
+        super().enter(manager)
+        
+        # Termine le chargement en arrière-plan s'il est encore en cours
+        # (il est normalement terminé pendant le compte à rebours)
+        asset_loader.finish()
+        
+        # Crée une nouvelle partie
+        self.session = GameSession(seed=self.seed)
+        
+        # Charge une image de fond aléatoire au début de la partie
+        # "load_random_background()" choisit une image parmi plusieurs options déjà en mémoire
+        self.background = load_random_background()
         
+        # Crée l'objet qui dessine les images du jeu à partir de ce fond d'écran
+        # "DIRTY_RECT_RENDERING" choisit le mode d'affichage (rectangles modifiés ou écran complet)
+        self.renderer = FrameRenderer(screen, self.background, DIRTY_RECT_RENDERING)
         
+        # Accumulateur qui convertit le temps réel écoulé en pas de simulation
+        self.timestep = FixedTimestep()
+        
+        # Attentes en cours pendant lesquelles la partie est arrêtée mais la fenêtre reste active :
+        # alerte du combat final (6 secondes), puis délai avant l'écran de fin de partie (3 secondes)
+        self.alert = None
+        self.game_over_wait = None
+        
+        # Ecran affiché à la fin du délai de fin de partie
+        self.game_over_scene = None
 
-        # Vérifie s'il y a des collisions entre le joueur et chaque obstacle
-        # La boucle "for" parcourt tous les obstacles dans le groupe "obstacles"
-        for obstacle in obstacles:
+    def exit(self):
+        # Arrête le son d'alerte si le jeu est quitté pendant l'alerte du combat final
+        if self.alert is not None:
+            get_sound("final_alert.wav").stop()
+        
+        # Enregistre le replay de la partie (option "--record") et rend les obstacles 
+        # et les power-ups encore en jeu à leurs réserves
+        save_replay(self.session)
+        self.session.clear()
+
+    def screen_changed(self):
+        # La nouvelle surface de l'écran doit être entièrement redessinée
+        self.renderer.set_target(screen)
+
+    def update(self, elapsed_ms):
+        session = self.session
+        renderer = self.renderer
+        
+        # La partie et le renderer marquent la fin de leurs propres phases pour le profileur
+        timer = profiler.current_timer()
+        session.timer = renderer.timer = timer
+        
+        # Pendant l'alerte du combat final, la partie est arrêtée : seul le temps de l'alerte avance.
+        # Au bout de 6 secondes, le son d'alerte s'arrête, la musique de fond reprend 
+        # et la partie continue à l'image suivante (le temps de l'alerte n'est pas rattrapé)
+        if self.alert is not None:
+            if self.alert.update(elapsed_ms):
+                get_sound("final_alert.wav").stop()
+                pygame.mixer.music.play(-1)
+                self.alert = None
+            timer.mark("autres")
+            return
+        
+        # Après la collision, la dernière image reste affichée 3 secondes avant l'écran de fin
+        if self.game_over_wait is not None:
+            if self.game_over_wait.update(elapsed_ms):
+                self.switch_to(self.game_over_scene)
+            timer.mark("autres")
+            return
+        
+        # Fait avancer la partie d'autant de pas que le temps écoulé l'exige, avec les touches 
+        # actuellement enfoncées ("pygame.key.get_pressed()" renvoie l'état de chaque touche).
+        # Sur une machine lente, plusieurs pas sont faits pour une seule image affichée :
+        # le jeu saute des images mais garde la même vitesse et la même difficulté.
+        steps = self.timestep.advance(elapsed_ms)
+        keys = pygame.key.get_pressed()
+        timer.mark("clavier")
+        events = []
+        for _ in range(steps):
+            events.extend(session.step(keys))
+            if session.finished:
+                break
+        
+        # Traduit les événements de la partie en sons, en écrans et en changements de décor
+        for game_event in events:
             
-            # Vérifie si le rectangle du joueur entre en collision avec 
-            # le rectangle de l'obstacle
-            # "player_rect.colliderect(obstacle.rect)" 
-            # renvoie True si les rectangles se chevauchent (collision)
-            # "and not invincible" s'assure que la collision n'est 
-            # prise en compte que si le joueur n'est pas invincible
-            if player_rect.colliderect(obstacle.rect) and not invincible:
-                
-                # Joue le son de fin de partie pour indiquer que le joueur a touché un obstacle
-                game_over_sound.play()
-                
-                # Fait une pause de 3 secondes pour permettre au joueur de voir la fin de partie
-                pygame.time.delay(3000)
-                
-                # Affiche l'écran de fin de jeu avec le score, 
-                # le niveau et le nombre de bonus collectés
-                # "display_game_over()" est une fonction qui affiche 
-                # ces informations pour le joueur  
-                display_game_over(score, level, bonus_collected_count)
-                
-                # Met fin à la partie en arrêtant la boucle principale du jeu
-                # "running = False" arrête la boucle "while" et quitte le jeu
-                running = False  
-                
-
-        # Vérifie s'il y a des collisions entre le joueur et chaque power-up
-        # La boucle "for" parcourt tous les power-ups dans le groupe "powerups"
-        for powerup in powerups:
-            
-             # Vérifie si le rectangle du joueur entre 
-             # en collision avec le rectangle du power-up
-            # "player_rect.colliderect(powerup.rect)" renvoie True 
-            # si les rectangles se chevauchent (collision)
-            if player_rect.colliderect(powerup.rect):
-                
-                
-                # Active l'effet du power-up en fonction de son type
-                # La condition suivante vérifie si le type de power-up est "invincible"
-                if powerup.type == "invincible":
-                    
-                    # Active l'état d'invincibilité du joueur pour le protéger des obstacles
-                    invincible = True
-                    
-                    # Démarre un timer pour mesurer la durée de l'effet d'invincibilité
-                    # "pygame.time.get_ticks()" enregistre le temps actuel en millisecondes
-                    powerup_timer = pygame.time.get_ticks()
-                    
-                    
-                # Vérifie si le type de power-up est "slow" (ralentissement des obstacles)
-                elif powerup.type == "slow":
-                    
-                    # Active l'effet de ralentissement des obstacles
-                    # "slow_obstacles = True" indique que les obstacles se déplaceront plus lentement
-                    slow_obstacles = True
-                    
-                    # Démarre un timer pour mesurer la durée de l'effet 
-                    # de ralentissement des obstacles
-                    # "pygame.time.get_ticks()" enregistre le temps actuel en millisecondes
-                    powerup_timer = pygame.time.get_ticks()
-                    
-                # Joue le son de collecte de bonus pour signaler au joueur qu'il a obtenu un power-up
-                bonus_sound.play()
-                
-                # Active un indicateur pour signaler que le joueur a collecté un bonus  
-                bonus_collected = True
-                
-                # Démarre un timer pour gérer l'affichage du message de bonus collecté
-                # "pygame.time.get_ticks()" enregistre le temps actuel, 
-                # utilisé pour afficher un message temporaire  
-                bonus_display_timer = pygame.time.get_ticks()
-                
-                # Incrémente le compteur de bonus collectés pour le suivi 
-                # des bonus obtenus par le joueur  
-                bonus_collected_count += 1 
-                
-                # Supprime le power-up après la collision pour qu'il 
-                # ne soit plus affiché ni collecté à nouveau 
-                powerup.kill()  
-
-        # Vérifie la durée d'activation des effets des power-ups, 
-        # qui est limitée à 6 secondes
-        # Cette condition vérifie si l'un des deux effets 
-        # (invincibilité ou ralentissement) est actif
-        if invincible or slow_obstacles:
+            # Un power-up a été collecté : joue le son de collecte de bonus
+            if game_event == "bonus":
+                get_sound("bonus_collected.wav").play()
             
+            # Nouveau niveau : change le fond d'écran de manière aléatoire pour varier les visuels
+            # Le nouveau fond d'écran impose de redessiner tout l'écran à la prochaine image
+            elif game_event == "level_up":
+                self.background = load_random_background()
+                renderer.set_background(self.background)
             
-            # Calcule le temps écoulé depuis que le power-up a été activé
-            # "pygame.time.get_ticks()" renvoie le temps actuel en millisecondes
-            # En soustrayant "powerup_timer", on obtient la durée d'activation du power-up
-            # Si cette durée dépasse 6000 millisecondes (6 secondes), 
-            # l'effet du power-up doit se terminer
-            if pygame.time.get_ticks() - powerup_timer > 6000:
+            # Début du combat final : alerte sonore et message pendant 6 secondes
+            elif game_event == "final_alert":
                 
-                # Désactive l'effet d'invincibilité si celui-ci est actif
-                invincible = False
+                # Arrête la musique de fond et joue le son d'alerte du combat final en boucle
+                pygame.mixer.music.stop()
+                get_sound("final_alert.wav").play(-1)
                 
-                # Désactive l'effet de ralentissement des obstacles si celui-ci est actif
-                slow_obstacles = False
-                
-
-        # Met à jour le score toutes les secondes pour récompenser le joueur au fil du temps
-        # "current_time" enregistre le temps actuel en millisecondes 
-        # à chaque passage dans la boucle de jeu
-        current_time = pygame.time.get_ticks()
-        
-        # Vérifie si une seconde (1000 millisecondes) s'est écoulée depuis 
-        # la dernière mise à jour du score
-        # "current_time - last_score_update" 
-        # calcule le temps écoulé depuis la dernière mise à jour
-        # Si ce temps est supérieur ou égal à 1000, on ajoute un point au score
-        if current_time - last_score_update >= 1000:
+                # Le message d'alerte reste affiché 6 secondes avant de reprendre le jeu
+                # (voir "draw()")
+                self.alert = TimedWait(6000)
             
-            # Incrémente le score du joueur de 1 pour chaque seconde passée
-            score += 1
-            
-            # Met à jour "last_score_update" pour enregistrer l'heure actuelle
-            # Cela permet de recommencer le compte pour une autre seconde 
-            # avant la prochaine mise à jour du score
-            last_score_update = current_time
+            # Le joueur a touché un obstacle : son de fin de partie, attente de 3 secondes,
+            # puis écran de fin de jeu avec le score, le niveau et le nombre de bonus collectés
+            elif game_event == "game_over":
+                get_sound("game_over.wav").play()
+                self.game_over_wait = TimedWait(3000)
+                self.game_over_scene = GameOverScene(session.score, session.level, session.bonus_collected_count)
             
+            # Le niveau 34 est atteint : écran du niveau final
+            elif game_event == "victory":
+                self.switch_to(VictoryScene(session.score, session.level, session.bonus_collected_count))
+        timer.mark("autres")
+
+    # Textes du HUD de la partie, avec le message d'alerte pendant l'alerte du combat final
+    def hud(self):
+        hud = self.session.hud()
+        
+        # Pendant l'alerte du combat final, le texte d'alerte en rouge est affiché 
+        # par-dessus le jeu, centré horizontalement
+        if self.alert is not None:
+            alert_text = text_cache.render("Attention ! Combat final.", 78, (255, 0, 0))
+            hud.append((alert_text, (WIDTH // 2 - alert_text.get_width() // 2, HEIGHT // 2 + alert_text.get_height() - 240 // 2)))
+        return hud
+
+    def draw(self):
+        renderer = self.renderer
+        timer = renderer.timer
+        
+        # Le calque du HUD n'est assemblé à nouveau que si le score, le niveau, les bonus,
+        # les effets actifs ou l'alerte ont changé depuis l'image précédente
+        renderer.hud.update((self.session.hud_state(), self.alert is not None), self.hud)
+        
+        # Surcouche : panneau du profileur s'il est actif, et "Pause" au centre de l'écran
+        # quand la fenêtre est en arrière-plan (la partie est en pause jusqu'au retour du joueur)
+        overlay = profiler.overlay()
+        if self.manager.background:
+            pause_text = text_cache.render("Pause", 78, WHITE)
+            overlay.append((pause_text, pause_text.get_rect(center=(WIDTH // 2, HEIGHT // 2)).topleft))
+        renderer.overlay.set_items(overlay)
+        timer.mark("hud")
+        
+        # Dessine l'image du jeu et l'envoie à l'écran
+        # "renderer.draw()" affiche le fond, les sprites puis les calques : en mode rectangles 
+        # modifiés, seules les zones qui ont changé sont redessinées et mises à jour
+        # ("pygame.display.update"), sinon tout l'écran est redessiné ("pygame.display.flip")
+        renderer.draw(self.session.sprites(self.timestep.alpha))
 
-            # Augmente le niveau et ajuste les paramètres du jeu tous les 10 points de score
-            # "score % 10 == 0" signifie que le niveau augmente lorsque 
-            # le score est un multiple de 10
-            # Par exemple, lorsque le score est 10, 20, 30, etc., le niveau change
-            if score % 10 == 0:
-                
-                # Incrémente le niveau du joueur de 1
-                # Chaque augmentation de niveau rend le jeu plus difficile
-                level += 1
-                
-                # Réduit l'intervalle d'apparition des obstacles 
-                # pour les faire apparaître plus souvent
-                # "spawn_interval = max(20, spawn_interval - 5)" 
-                # diminue l'intervalle par 5, mais pas en dessous de 20
-                spawn_interval = max(20, spawn_interval - 5)
-                
-                # Augmente la vitesse du joueur pour qu'il se déplace plus rapidement
-                # "player_speed = min(10, player_speed + 0.5)" 
-                # augmente la vitesse par 0.5, mais ne dépasse pas 10
-                player_speed = min(10, player_speed + 0.5)
-                
-                # Change le fond d'écran de manière aléatoire 
-                # à chaque changement de niveau pour varier les visuels
-                background = load_random_background()
-                
-                
-                
+    def profile_counts(self):
+        counts = {"obstacles": self.session.obstacle_count, "power-ups": len(self.session.powerups),
+                  "zones": self.renderer.last_update_count}
+        counts.update(super().profile_counts())
+        return counts
 
-        # Vérifie si le niveau est supérieur ou égal à 12 et si l'alerte n'a pas déjà été affichée
-        # "level >= 12" déclenche le combat final à partir du niveau 12
-        # "not alert_displayed" s'assure que l'alerte ne s'affiche qu'une seule fois
-        if level >= 12 and not alert_displayed:
-            
-            # Arrête la musique de fond pour mieux faire entendre le son d'alerte
-            pygame.mixer.music.stop()
-            
-            # Joue le son d'alerte du combat final en boucle
-            # "final_alert_sound.play()" 
-            # fait jouer le son une seule fois, puis s'arrête de jouer le son 
-            final_alert_sound.play(-1)
-              
-            # Prépare le texte d'alerte à afficher au centre de l'écran
-            # "pygame.font.Font(None, 48)" crée une police de taille 48 pour le texte
-            # ".render()" transforme le texte en une image (surface) 
-            # avec une couleur rouge (255, 0, 0)
-            alert_text = pygame.font.Font(None, 78).render("Attention ! Combat final.", True, (255, 0, 0))
-            
-            
-            # Affiche le texte d'alerte au centre de l'écran
-            # "screen.blit(alert_text, ...)" dessine le texte à une position 
-            # centrée horizontalement
-            # et légèrement ajustée verticalement
-            screen.blit(alert_text, (WIDTH // 2 - alert_text.get_width() // 2, HEIGHT // 2 + alert_text.get_height() - 240 // 2))
-            
-            
-            # Rafraîchit l'écran pour afficher l'alerte de combat final
-            pygame.display.flip()
-            
-            # Fait une pause de 6 secondes pour que l'alerte reste visible 
-            # avant de reprendre le jeu
-            pygame.time.delay(6000)
-            
-            # Arrête le son d'alerte du combat final après la pause 
-            final_alert_sound.stop()
-            
-            # Relance la musique de fond du jeu en boucle pour continuer l'ambiance sonore
-            pygame.mixer.music.play(-1)
-            
-            # Marque l'alerte comme ayant déjà été affichée pour éviter de la rejouer 
-            alert_displayed = True
 
-        # Affiche l'écran de niveau final et termine la partie si le niveau atteint 34
-        # "if level >= 34" vérifie si le niveau est 34 ou plus, marquant la fin de la partie
-        if level >= 34:
-            
-            # Appelle la fonction pour afficher l'écran du niveau final
-            # "display_final_level_screen()" 
-            # est une fonction qui montre un écran spécial pour la fin de partie (fond noir)
-            display_final_level_screen()
-            
-            
-            # Met fin à la boucle principale du jeu pour terminer la partie
-            # "running = False" arrête la boucle "while" en réglant "running" sur False
-            running = False
 
 
-        # Affiche l'image de fond aux coordonnées (0, 0) pour couvrir tout l'écran
-        # "screen.blit(background, (0, 0))" place l'image de fond à l'origine de l'écran
-        screen.blit(background, (0, 0))
+# Evénements qui signalent un changement d'état de la fenêtre (voir "SceneManager.window_event")
+WINDOW_STATE_EVENTS = (pygame.WINDOWFOCUSLOST, pygame.WINDOWFOCUSGAINED, pygame.WINDOWMINIMIZED,
+                       pygame.WINDOWHIDDEN, pygame.WINDOWRESTORED, pygame.WINDOWSHOWN)
+
+
+# Définition de la classe 'SceneManager' : la boucle principale du jeu
+# Une seule boucle fait tourner toutes les scènes (introduction, compte à rebours, partie,
+# fin de partie, victoire). Quand une scène demande à passer à la suivante, l'ancienne est
+# quittée et la nouvelle commence à l'image suivante : rejouer une partie ne fait plus 
+# appel à "main()" depuis l'écran de fin, et la pile d'appels reste la même après 
+# 1000 parties qu'après la première.
+class SceneManager:
+
+    # Nombre d'images par seconde des scènes au repos avec les pilotes d'affichage 
+    # qui ne savent pas attendre un événement sans vérifier sans cesse la file d'événements
+    IDLE_FRAME_RATE = 10
+    
+    # Nombre d'images par seconde quand la fenêtre est en arrière-plan ou réduite
+    BACKGROUND_FRAME_RATE = 4
+
+    # "idle=False" désactive l'attente des événements des scènes au repos (pour comparer)
+    def __init__(self, first_scene, idle=True):
+        self.scene = None
+        self.idle = idle
         
+        # Les pilotes "dummy" et "offscreen" (sans fenêtre) n'ont pas d'attente bloquante :
+        # SDL y vérifie la file d'événements toutes les millisecondes pendant "pygame.event.wait()"
+        self.blocking_wait = pygame.display.get_driver() not in ("dummy", "offscreen")
+        self.running = True
         
-        # Affiche l'image du joueur à sa position actuelle définie par "player_rect"
-        # "screen.blit(player_img, player_rect)" dessine le joueur à sa position mise à jour
-        screen.blit(player_img, player_rect)
+        # Etat de la fenêtre : active (elle reçoit le clavier) et réduite (invisible).
+        # Quand la fenêtre n'est pas active ou qu'elle est réduite, le jeu est en pause
+        # (voir la propriété "background")
+        self.focused = True
+        self.minimized = False
         
+        # Indique que le jeu vient de reprendre : le temps passé en pause est alors ignoré
+        self.resuming = False
         
-        # Affiche chaque obstacle présent dans le groupe "obstacles" à sa position actuelle
-        # La boucle "for" parcourt tous les objets "obstacle" du groupe "obstacles"
-        for obstacle in obstacles:
-            
-            # Dessine l'image de l'obstacle à sa position définie par "obstacle.rect"
-            # "screen.blit(obstacle.image, obstacle.rect)" place chaque obstacle sur l'écran
-            screen.blit(obstacle.image, obstacle.rect)
+        # Horloge qui limite le nombre d'images par seconde de la scène active
+        self.clock = pygame.time.Clock()
         
+        # Nombre de changements de scène et profondeur maximale de la pile d'appels observée
+        # lors d'un changement de scène (elle doit rester constante)
+        self.switches = 0
+        self.max_stack_depth = 0
         
-        # Affiche chaque power-up présent dans le groupe "powerups" à sa position actuelle
-        # La boucle "for" parcourt tous les objets "powerup" du groupe "powerups"
-        for powerup in powerups:
-            
-            # Dessine l'image du power-up à sa position définie par "powerup.rect"
-            # "screen.blit(powerup.image, powerup.rect)" place chaque power-up sur l'écran
-            screen.blit(powerup.image, powerup.rect)
-            
-
-        # Affiche le nombre total de bonus collectés par le joueur
-        # Crée une surface de texte pour afficher le nombre de bonus collectés 
-        # avec une police de taille 38
-        # "pygame.font.Font(None, 38).render()" génère un texte avec la couleur blanche (WHITE)
-        bonus_collected_text = pygame.font.Font(None, 38).render(f"Bonus collectés : {bonus_collected_count}", True, WHITE)
+        self.switch(first_scene)
+
+    # Quitte la scène active et démarre la scène "scene"
+    def switch(self, scene):
+        if self.scene is not None:
+            self.scene.exit()
+        self.scene = scene
+        scene.enter(self)
+        self.switches += 1
         
-        # Affiche le texte du nombre de bonus collectés en haut à gauche 
-        # de l'écran aux coordonnées (10, 90)
-        # "screen.blit(bonus_collected_text, (10, 80))" place le texte à la position souhaitée
-        screen.blit(bonus_collected_text, (10, 90))
+        # Mesure la profondeur de la pile d'appels en remontant les appels en cours
+        depth = 0
+        frame = sys._getframe()
+        while frame is not None:
+            depth += 1
+            frame = frame.f_back
+        self.max_stack_depth = max(self.max_stack_depth, depth)
+
+    # Indique si la fenêtre est en arrière-plan (une autre fenêtre est active) ou réduite :
+    # les scènes sont alors en pause et l'écran n'est redessiné que rarement
+    @property
+    def background(self):
+        return self.minimized or not self.focused
+
+    # Traite un événement de la fenêtre (activation, réduction, restauration)
+    def window_event(self, event):
+        was_background = self.background
+        if event.type == pygame.WINDOWFOCUSLOST:
+            self.focused = False
+        elif event.type == pygame.WINDOWFOCUSGAINED:
+            self.focused = True
+        elif event.type in (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):
+            self.minimized = True
+        elif event.type in (pygame.WINDOWRESTORED, pygame.WINDOWSHOWN):
+            self.minimized = False
         
-
-        # Affiche un message temporaire si un bonus a été collecté récemment
-        # "if bonus_collected" vérifie si le joueur a collecté un bonus récemment
-        if bonus_collected:
-            
-            # Crée une surface de texte pour afficher le message "Bonus collecté !"
-            # "pygame.font.Font(None, 38).render()" génère le texte avec 
-            # une police de taille 38 et une couleur blanche (WHITE)
-            bonus_text = pygame.font.Font(None, 38).render("Bonus collecté !", True, WHITE)
-            
-            # Affiche le message de bonus collecté au centre de l'écran
-            # "screen.blit(bonus_text, (WIDTH // 2 - 100, HEIGHT // 2))" 
-            # centre le texte horizontalement en soustrayant 100 pixels
-            screen.blit(bonus_text, (WIDTH // 2 - 100, HEIGHT // 2))
+        # Au retour au premier plan, le temps passé en pause n'est pas rattrapé par la scène 
+        # (aucune rafale de pas de simulation) et tout l'écran est redessiné
+        if was_background and not self.background:
+            self.resuming = True
+            self.scene.screen_changed()
+
+    # Quitte la scène active et arrête la boucle principale
+    def quit(self):
+        self.scene.exit()
+        self.running = False
+
+    # Exécute une image : événements, mise à jour, changement de scène ou dessin
+    def frame(self, events, elapsed_ms):
+        # Utilisation de la variable globale 'screen' pour pouvoir
+        # changer de mode d'affichage depuis n'importe quelle scène
+        global screen
+        
+        scene = self.scene
+        
+        # Le profileur (touche F3) mesure la durée de chaque phase de l'image
+        timer = profiler.current_timer()
+        timer.begin()
+        
+        for event in events:
             
+            # Si l'utilisateur ferme la fenêtre, la scène est quittée et le jeu s'arrête
+            if event.type == pygame.QUIT:
+                self.quit()
+                return
             
-            # Vérifie si plus d'une secondes (1000 millisecondes) 
-            # se sont écoulées depuis la collecte du bonus
-            # "pygame.time.get_ticks() - bonus_display_timer" 
-            # calcule le temps écoulé depuis l'apparition du message
-            # Si ce temps dépasse 1000 millisecondes, le message de bonus collecté disparaît
-            if pygame.time.get_ticks() - bonus_display_timer > 1000:
+            # Bascule entre plein écran et fenêtre avec la touche "F", dans toutes les scènes
+            # La surface de rendu ne change pas : aucune image n'est rechargée ni convertie.
+            # Le verrou "display_lock" attend la fin de la conversion d'image en cours
+            # du chargeur d'arrière-plan
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_f:
+                with display_lock:
+                    toggled = game_display.toggle_fullscreen()
                 
-                # Réinitialise "bonus_collected" à False pour ne plus afficher le message
-                bonus_collected = False
-
-        # Affiche le score et le niveau actuel du joueur sur l'écran
-        # Crée une surface de texte pour afficher le score du 
-        # joueur avec une police de taille 38
-        # "pygame.font.Font(None, 38).render()" 
-        # génère le texte "Score : " suivi de la valeur actuelle du score, en blanc (WHITE)
-        score_text = pygame.font.Font(None, 38).render(f"Score : {score}", True, WHITE)
-        
-        # Crée une surface de texte pour afficher le niveau actuel du joueur 
-        # avec une police de taille 38
-        # "pygame.font.Font(None, 38).render()" 
-        # génère le texte "Niveau : " suivi de la valeur actuelle du niveau, en blanc (WHITE)
-        level_text = pygame.font.Font(None, 38).render(f"Niveau : {level}", True, WHITE)
-        
-        # Affiche le texte du score en haut à gauche de l'écran aux coordonnées (10, 10)
-        # "screen.blit(score_text, (10, 10))" place le texte du score dans le coin supérieur gauche
-        screen.blit(score_text, (10, 10))
-        
-        # Affiche le texte du niveau juste en dessous du score, aux coordonnées (10, 50)
-        # "screen.blit(level_text, (10, 50))" 
-        # place le texte du niveau sous le score pour garder l'affichage organisé
-        screen.blit(level_text, (10, 50))
-
-
-        # Affiche le message "Invincible !" si l'effet d'invincibilité est activé
-        # "if invincible" vérifie si le joueur est actuellement invincible
-        if invincible:
-            
-            # Crée une surface de texte pour afficher "Invincible !" 
-            # avec une police de taille 38
-            # "pygame.font.Font(None, 38).render()" 
-            # génère le texte en jaune doré (255, 215, 0) pour indiquer l'invincibilité
-            invincible_text = pygame.font.Font(None, 38).render("Invincible !", True, (255, 215, 0))
+                # Le contenu de la fenêtre est perdu : la scène active redessine toute l'image
+                # (rien ne change si le pilote d'affichage ne permet pas le plein écran)
+                if toggled:
+                    screen = game_display.target
+                    scene.screen_changed()
             
-            # Affiche le texte "Invincible !" dans le coin supérieur droit de l'écran, 
-            # aux coordonnées (WIDTH - 150, 10)
-            # "screen.blit(invincible_text, (WIDTH - 150, 10))" 
-            # place le texte à droite de l'écran, 150 pixels avant le bord
-            screen.blit(invincible_text, (WIDTH - 150, 10))
+            # La fenêtre a été redimensionnée : l'image est agrandie à la nouvelle taille
+            elif event.type == pygame.WINDOWSIZECHANGED:
+                game_display.window_resized()
+                screen = game_display.target
+                scene.screen_changed()
             
-        
-        # Affiche le message "Obstacles ralentis !" si l'effet de ralentissement 
-        # des obstacles est activé
-        # "if slow_obstacles" vérifie si l'effet de ralentissement est actif
-        if slow_obstacles:
+            # Affiche ou masque le panneau du profileur avec la touche "F3"
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle()
             
-            # Crée une surface de texte pour afficher "Obstacles ralentis !" 
-            # avec une police de taille 38
-            # "pygame.font.Font(None, 38).render()" 
-            # génère le texte en orange (255, 165, 0) pour indiquer le ralentissement
-            slow_text = pygame.font.Font(None, 38).render("Obstacles ralentis !", True, (255, 165, 0))
+            # La fenêtre passe en arrière-plan, est réduite ou revient au premier plan
+            elif event.type in WINDOW_STATE_EVENTS:
+                self.window_event(event)
             
-            # Affiche le texte "Obstacles ralentis !" 
-            # dans le coin supérieur droit de l'écran, aux coordonnées (WIDTH - 250, 50)
-            # "screen.blit(slow_text, (WIDTH - 250, 50))" 
-            # place le texte un peu plus bas pour éviter le chevauchement avec "Invincible !"
-            screen.blit(slow_text, (WIDTH - 250, 50))
-
-
-        # Rafraîchit l'écran pour afficher toutes les mises à jour visuelles du jeu
-        # "pygame.display.flip()" met à jour l'écran pour refléter les modifications effectuées
-        # Cela inclut les déplacements, les changements de score, les effets visuels, etc.
-        pygame.display.flip()
+            # Les autres événements sont traités par la scène active
+            else:
+                scene.handle_event(event)
+                
+            # La scène a pu quitter le jeu ("Q") pendant le traitement de l'événement
+            if not self.running:
+                return
+        timer.mark("evenements")
+        
+        # Fenêtre en arrière-plan : la scène est en pause, elle est seulement redessinée
+        # si la fenêtre est visible (pas de dessin du tout quand elle est réduite)
+        if self.background:
+            if not self.minimized:
+                scene.draw()
+            text_cache.end_frame()
+            profiler.end_frame(scene.profile_counts())
+            return
         
+        # Le temps écoulé pendant la pause est ignoré à la reprise
+        if self.resuming:
+            self.resuming = False
+            elapsed_ms = 0
         
-        # Limite la vitesse de la boucle de jeu à 60 images par seconde (FPS) 
-        # pour garantir un déroulement fluide
-        # "clock.tick(60)" contrôle le nombre d'images par seconde (60 ici) 
-        # pour une expérience fluide
-        # Cela empêche le jeu de s'exécuter trop vite, rendant l'action plus stable et prévisible
-        clock.tick(60)
+        # Fait avancer la scène du temps écoulé depuis l'image précédente
+        scene.update(elapsed_ms)
+        if not self.running:
+            return
         
+        # Si la scène a demandé à passer à la suivante, la nouvelle scène commence
+        # (elle sera dessinée à l'image suivante) ; sinon, la scène se dessine
+        if scene.next_scene is not None:
+            self.switch(scene.next_scene)
+        else:
+            scene.draw()
+        
+        # Fin de l'image pour le cache de textes et le profileur
+        text_cache.end_frame()
+        profiler.end_frame(scene.profile_counts())
+
+    # Renvoie les événements de la prochaine image et le temps écoulé depuis la précédente.
+    # Une scène au repos attend le prochain événement, au plus "idle_timeout" millisecondes, 
+    # et une fenêtre en arrière-plan au plus un quart de seconde ("BACKGROUND_FRAME_RATE") :
+    # le programme dort au lieu de tourner à vide.
+    # Les autres scènes avancent au rythme de leur "frame_rate".
+    def next_frame(self):
+        scene = self.scene
+        if self.background:
+            return self.wait_events(1000 // self.BACKGROUND_FRAME_RATE, self.BACKGROUND_FRAME_RATE)
+        if self.idle and scene.is_idle():
+            return self.wait_events(scene.idle_timeout, self.IDLE_FRAME_RATE)
+        elapsed_ms = self.clock.tick(scene.frame_rate)
+        return pygame.event.get(), elapsed_ms
+
+    # Attend le prochain événement ("pygame.event.wait()") au plus "timeout_ms" millisecondes.
+    # Sans attente bloquante (pilotes sans fenêtre), avance plutôt à "frame_rate" images par seconde.
+    def wait_events(self, timeout_ms, frame_rate):
+        if not self.blocking_wait:
+            elapsed_ms = self.clock.tick(frame_rate)
+            return pygame.event.get(), elapsed_ms
+        event = pygame.event.wait(timeout_ms)
+        events = [] if event.type == pygame.NOEVENT else [event]
+        events.extend(pygame.event.get())
+        return events, self.clock.tick()
+
+    # Boucle principale : une image par tour, au rythme de la scène active
+    def run(self):
+        while self.running:
+            events, elapsed_ms = self.next_frame()
+            self.frame(events, elapsed_ms)
 
-    # Quitte Pygame une fois que la boucle principale du jeu est terminée
-    # "pygame.quit()" ferme proprement toutes les fonctionnalités de Pygame 
-    # et libère les ressources utilisées
-    pygame.quit()
-    
 
-# Fonction pour afficher l'écran de fin de partie
-# Elle montre le score final, le niveau atteint et le nombre total de bonus collectés
-def display_game_over(final_score, final_level, final_bonus):
+# Fonction principale du jeu
+# Elle fait défiler le texte de l'histoire, lance le compte à rebours puis la partie, 
+# et enchaîne les parties jusqu'à ce que le joueur quitte le jeu.
+# Le démarrage se fait dans un ordre précis, pour montrer une image le plus tôt possible :
+# la fenêtre est ouverte et la première image de l'introduction est affichée, puis seulement
+# le son est initialisé, la musique lancée et le chargement en arrière-plan démarré
+# (les images et les sons de la partie sont préparés pendant le défilement de l'histoire
+# et le compte à rebours).
+def main():
+    init_display()
+    startup_step("ouverture de la fenêtre")
+    
+    manager = SceneManager(IntroScene())
+    manager.frame(pygame.event.get(), 0)
+    startup_step("première image")
+    
+    init_audio()
+    asset_loader.start()
+    startup_step("son et musique")
     
-    # Remplit l'écran de noir pour préparer l'affichage des messages de fin de partie
-    # "screen.fill(BLACK)" applique la couleur noire à toute la surface de l'écran
-    screen.fill(BLACK)
+    if STARTUP_REPORT:
+        print_startup_report()
     
-    # Création des polices de caractères pour les messages de fin de partie
-    # "pygame.font.Font(None, taille)" crée une police avec la taille spécifiée
-    game_over_font = pygame.font.Font(None, 92)  # Police pour le message "GAME OVER !"
-    message_font = pygame.font.Font(None, 48)  # Police pour les informations de score et de niveau
-    small_font = pygame.font.Font(None, 42)  # Police pour le message de rejouer ou quitter
+    manager.run()
+    
+    # Quitte Pygame et ferme proprement la fenêtre du jeu
+    # "pygame.quit()" libère toutes les ressources de Pygame
+    pygame.quit()
 
-    # Messages de fin de partie
-    # "game_over_font.render()" crée une surface de texte avec le message "GAME OVER !" en rouge
-    game_over_text = game_over_font.render("GAME OVER !", True, (255, 0, 0))
+
+# Etat du clavier sans aucune touche enfoncée, utilisé par le mode sans affichage
+NO_KEYS = defaultdict(bool)
+
+
+# Fonction qui simule une partie sans affichage, sans son et sans pause
+# Les mêmes règles que dans la partie affichée (classe "GameSession") sont appliquées : chaque image 
+# simulée dure "1000 / fps" millisecondes et l'accumulateur la convertit en pas de simulation,
+# comme dans la partie affichée, mais sans attendre : la partie tourne aussi vite que le processeur 
+# le permet. "god_mode" rend les collisions non mortelles pour atteindre le niveau final, 
+# "max_ticks" limite le nombre de pas simulés.
+# "seed" est la graine de la partie (tirée au hasard si None).
+def run_headless(fps=60, god_mode=True, keys=NO_KEYS, max_ticks=None, seed=None):
+    session = GameSession(god_mode=god_mode, seed=seed)
+    timestep = FixedTimestep()
+    while not session.finished and (max_ticks is None or session.ticks < max_ticks):
+        for _ in range(timestep.advance(1000 / fps)):
+            session.step(keys)
+            if session.finished:
+                break
+    return session
+
+
+# Fonction qui rejoue une partie enregistrée, sans affichage ni pause
+# La partie est recréée avec la même graine et le même mode, puis chaque pas est simulé
+# avec les touches enregistrées : elle se déroule exactement comme la partie d'origine.
+def run_replay(replay):
+    session = GameSession(god_mode=replay.god_mode, seed=replay.seed)
+    for keys in replay.keys():
+        session.step(keys)
+        if session.finished:
+            break
+    return session
+
+
+# Fonction qui enregistre le replay d'une partie si l'option "--record" a été donnée
+def save_replay(session):
+    if RECORD_FILE is not None:
+        session.replay.save(RECORD_FILE)
+
+
+# Mesure l'effet des réserves de sprites en régime établi (niveau 20, partie sans fin) :
+# après une période de mise en route, le nombre d'objets Python ne doit plus augmenter
+# et presque tous les obstacles et power-ups doivent être réutilisés.
+@benchmark("reserves")
+def bench_sprite_pools(ticks=6000, warmup=3000):
+    for pool in (obstacle_pool, powerup_pool):
+        pool.__init__(pool.sprite_class)
+    session = GameSession(god_mode=True, seed=20)
+    session.set_level(20)
+    for _ in range(warmup):
+        session.score = 190
+        session.step(NO_KEYS)
+    gc.collect()
+    objects_before = len(gc.get_objects())
+    created_before = obstacle_pool.created + powerup_pool.created
+    collections_before = sum(stats["collections"] for stats in gc.get_stats())
+    start = time.perf_counter()
+    for _ in range(ticks):
+        # Le niveau reste fixe pour mesurer un régime établi
+        session.score = 190
+        session.step(NO_KEYS)
+    duration = (time.perf_counter() - start) * 1000 / ticks
+    collections = sum(stats["collections"] for stats in gc.get_stats()) - collections_before
+    gc.collect()
+    print(f"{ticks} pas au niveau {session.level} : {duration:.3f} ms/pas, "
+          f"objets Python {objects_before} -> {len(gc.get_objects())}, "
+          f"sprites créés après la mise en route : {obstacle_pool.created + powerup_pool.created - created_before}, "
+          f"passages du ramasse-miettes : {collections}")
+    for label, pool in (("obstacles", obstacle_pool), ("power-ups", powerup_pool)):
+        stats = pool.stats()
+        print(f"réserve {label:<9} réutilisés {stats['hit_rate']:6.1%}   créés {stats['created']}   "
+              f"réutilisations {stats['reused']}   maximum en jeu {stats['high_water']}")
+    session.clear()
+
+
+# Scénarios de mesure du jeu complet : chaque scénario prépare une situation du jeu
+# (introduction, compte à rebours, niveau 1, niveau 12, niveau 33) et renvoie une fonction
+# qui joue une image de cette situation, sans attendre et sans limite d'images par seconde.
+# Chaque image est découpée en phases avec un "PhaseTimer" ("timer.mark(nom)").
+# "python dysheros.py --benchmark scenarios --output resultats.json" lance tous les scénarios
+# et écrit les résultats (centiles, phases, allocations) dans un fichier JSON,
+# pour comparer les performances entre deux versions du jeu.
+SCENARIOS = {}
+
+# Graine des tirages aléatoires des scénarios : les mêmes obstacles à chaque mesure
+SCENARIO_SEED = 2024
+
+# Nombre d'images de préchauffage (non mesurées), d'images mesurées 
+# et d'images mesurées avec le suivi des allocations (plus lent, donc mesuré à part).
+# Au total, les scénarios de jeu restent sous les 10 secondes de jeu : le niveau ne change pas.
+SCENARIO_WARMUP = 60
+SCENARIO_FRAMES = 480
+SCENARIO_ALLOC_FRAMES = 60
+
+# Fichier dans lequel les résultats des scénarios sont écrits ("--output fichier")
+BENCHMARK_OUTPUT = command_line_option("--output")
+
+
+# Décorateur qui enregistre un scénario dans le registre "SCENARIOS"
+def scenario(name):
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+# Introduction : le texte de l'histoire défile d'un pixel par image
+@scenario("intro")
+def scenario_intro(timer):
+    font = pygame.font.Font(None, 43)
+    story_scroll = create_story_scroll(font)
+    state = {"scroll_y": HEIGHT}
+
+    def frame():
+        pygame.event.get()
+        timer.mark("evenements")
+        draw_intro_frame(screen, story_scroll, font, state["scroll_y"])
+        timer.mark("dessin")
+        game_display.present()
+        timer.mark("affichage")
+        state["scroll_y"] -= 1
+        if state["scroll_y"] + story_scroll.total_height < 0:
+            state["scroll_y"] = HEIGHT
+
+    return frame
+
+
+# Compte à rebours : les chiffres de 9 à 0 sont dessinés l'un après l'autre
+@scenario("decompte")
+def scenario_countdown(timer):
+    font = pygame.font.Font(None, 95)
+    countdown_surface = pygame.font.Font(None, 50).render("La quête de Léo va commencer dans :", True, WHITE)
+    state = {"frame": 0}
+
+    def frame():
+        pygame.event.get()
+        timer.mark("evenements")
+        draw_countdown_frame(screen, font, countdown_surface, 9 - state["frame"] % 10, 9, 110)
+        timer.mark("dessin")
+        game_display.present()
+        timer.mark("affichage")
+        state["frame"] += 1
+
+    return frame
+
+
+# Partie en cours au niveau "level" : une image = un pas de simulation, le HUD et le rendu,
+# comme dans "PlayScene". Les collisions ne sont pas mortelles pour que la partie continue.
+def game_scenario(timer, level):
+    session = GameSession(god_mode=True, seed=SCENARIO_SEED)
+    session.set_level(level)
+    renderer = FrameRenderer(screen, load_random_background(), DIRTY_RECT_RENDERING)
+
+    def frame():
+        pygame.event.get()
+        timer.mark("evenements")
+        session.step(NO_KEYS)
+        timer.mark("simulation")
+        renderer.hud.update(session.hud_state(), session.hud)
+        timer.mark("hud")
+        renderer.draw(session.sprites())
+        timer.mark("rendu")
+        text_cache.end_frame()
+
+    frame.session = session
+    return frame
+
+
+# Niveau 1 : obstacles qui tombent du haut de l'écran, une apparition par seconde
+@scenario("niveau_1")
+def scenario_level_1(timer):
+    return game_scenario(timer, 1)
+
+
+# Niveau 12 : début du combat final, les obstacles arrivent aussi par les côtés
+@scenario("niveau_12")
+def scenario_level_12(timer):
+    return game_scenario(timer, 12)
+
+
+# Niveau 33 : dernier niveau, intervalle d'apparition minimal et obstacles les plus rapides
+@scenario("niveau_33")
+def scenario_level_33(timer):
+    return game_scenario(timer, 33)
+
+
+# Joue un scénario et renvoie ses résultats : durée des images (moyenne, centiles, pire),
+# durée de chaque phase, passages du ramasse-miettes et allocations mémoire par image
+def run_scenario(name):
+    import tracemalloc
+    random.seed(SCENARIO_SEED)
+    timer = PhaseTimer()
+    frame = SCENARIOS[name](timer)
+    
+    # Préchauffage : remplit l'écran d'obstacles et les caches avant de mesurer
+    for _ in range(SCENARIO_WARMUP):
+        timer.begin()
+        frame()
+    
+    # Mesure des durées, image par image et phase par phase
+    totals = []
+    phases = defaultdict(list)
+    collections_before = sum(stats["collections"] for stats in gc.get_stats())
+    for _ in range(SCENARIO_FRAMES):
+        timer.begin()
+        frame()
+        total, frame_phases = timer.end()
+        totals.append(total)
+        for phase, duration in frame_phases.items():
+            phases[phase].append(duration)
+    collections = sum(stats["collections"] for stats in gc.get_stats()) - collections_before
+    
+    # Mesure des allocations avec "tracemalloc" (qui ralentit le jeu, donc dans une passe à part) :
+    # pour chaque image, la mémoire maximale allouée au-dessus de celle du début de l'image,
+    # et la mémoire conservée entre le début et la fin de la passe
+    tracemalloc.start()
+    first = tracemalloc.get_traced_memory()[0]
+    allocated = []
+    for _ in range(SCENARIO_ALLOC_FRAMES):
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        timer.begin()
+        frame()
+        allocated.append(tracemalloc.get_traced_memory()[1] - start)
+    retained = tracemalloc.get_traced_memory()[0] - first
+    tracemalloc.stop()
+    
+    totals.sort()
+    result = {
+        "frames": len(totals),
+        "frame_ms": {
+            "mean": sum(totals) / len(totals),
+            "p50": percentile(totals, 50),
+            "p95": percentile(totals, 95),
+            "p99": percentile(totals, 99),
+            "max": totals[-1],
+        },
+        "phases_ms": {},
+        "gc_collections": collections,
+        "alloc_peak_kb_per_frame": sum(allocated) / len(allocated) / 1024,
+        "retained_kb": retained / 1024,
+    }
+    for phase, durations in phases.items():
+        durations.sort()
+        result["phases_ms"][phase] = {
+            "mean": sum(durations) / len(durations),
+            "p95": percentile(durations, 95),
+            "max": durations[-1],
+        }
+    session = getattr(frame, "session", None)
+    if session is not None:
+        result["level"] = session.level
+        result["obstacles"] = session.obstacle_count
+    return result
+
+
+# Lance tous les scénarios, affiche leurs résultats et les écrit dans le fichier "--output"
+@benchmark("scenarios")
+def bench_scenarios():
+    import json
+    report = {
+        "format": 1,
+        "python": sys.version.split()[0],
+        "pygame": pygame.version.ver,
+        "seed": SCENARIO_SEED,
+        "dirty_rendering": DIRTY_RECT_RENDERING,
+        "scenarios": {},
+    }
+    for name in SCENARIOS:
+        result = run_scenario(name)
+        report["scenarios"][name] = result
+        frame_ms = result["frame_ms"]
+        print(f"{name:<10} p50 {frame_ms['p50']:6.3f} ms   p95 {frame_ms['p95']:6.3f} ms   "
+              f"p99 {frame_ms['p99']:6.3f} ms   pire {frame_ms['max']:6.3f} ms   "
+              f"alloc {result['alloc_peak_kb_per_frame']:6.1f} Ko/image   gc {result['gc_collections']}")
+        for phase, durations in result["phases_ms"].items():
+            print(f"    {phase:<12} moyenne {durations['mean']:6.3f} ms   p95 {durations['p95']:6.3f} ms")
+    if BENCHMARK_OUTPUT is not None:
+        with open(BENCHMARK_OUTPUT, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2, ensure_ascii=False)
+        print(f"Résultats écrits dans {BENCHMARK_OUTPUT}")
+
+
+# Définition de la classe 'GameOverScene' pour afficher l'écran de fin de partie
+# Elle montre le score final, le niveau atteint et le nombre total de bonus collectés,
+# puis attend que le joueur choisisse de rejouer (R) ou de quitter (Q).
+class GameOverScene(Scene):
+
+    def __init__(self, final_score, final_level, final_bonus):
+        super().__init__()
+        self.final_score = final_score
+        self.final_level = final_level
+        self.final_bonus = final_bonus
+        
+        # Indique que l'écran doit être dessiné (au début, et après un passage en plein écran)
+        self.needs_redraw = True
+
+    def screen_changed(self):
+        self.needs_redraw = True
+
+    # Une fois dessiné, l'écran de fin de partie ne change plus : 
+    # il attend seulement la réponse du joueur
+    def is_idle(self):
+        return not self.needs_redraw
+
+    # Dessine les messages de fin de partie (une seule fois : l'écran ne change pas ensuite)
+    def draw(self):
+        if not self.needs_redraw:
+            return
+        self.needs_redraw = False
+    
+        # Remplit l'écran de noir pour préparer l'affichage des messages de fin de partie
+        # "screen.fill(BLACK)" applique la couleur noire à toute la surface de l'écran
+        screen.fill(BLACK)
     
-    # "message_font.render()" crée une surface de texte pour afficher le score final en blanc
-    score_text = message_font.render(f"Votre score final est de : {final_score}", True, OR)
+        # Messages de fin de partie
+        # "text_cache.render(texte, taille, couleur)" crée (ou réutilise) une surface de texte
+        # avec la police de la taille spécifiée : 92 pour le message "GAME OVER !",
+        # 48 pour les informations de score et de niveau, 42 pour le message de rejouer ou quitter
+        game_over_text = text_cache.render("GAME OVER !", 92, (255, 0, 0))
     
-    # Crée une surface de texte pour afficher le niveau atteint en blanc
-    level_text = message_font.render(f"Vous avez atteint le niveau : {final_level}", True, WHITE)
+        # Crée une surface de texte pour afficher le score final en blanc
+        score_text = text_cache.render(f"Votre score final est de : {self.final_score}", 48, OR)
     
-    # Crée une surface de texte pour afficher le nombre total de bonus collectés en blanc
-    bonus_text = message_font.render(f"Nombre de bonus collectés : {final_bonus}", True, WHITE)
+        # Crée une surface de texte pour afficher le niveau atteint en blanc
+        level_text = text_cache.render(f"Vous avez atteint le niveau : {self.final_level}", 48, WHITE)
     
-    # Crée une surface de texte pour demander au joueur s'il veut rejouer ou quitter en blanc
-    replay_text = small_font.render("Voulez-vous rejouer (R) ou quitter (Q) ?", True, OR)
+        # Crée une surface de texte pour afficher le nombre total de bonus collectés en blanc
+        bonus_text = text_cache.render(f"Nombre de bonus collectés : {self.final_bonus}", 48, WHITE)
+    
+        # Crée une surface de texte pour demander au joueur s'il veut rejouer ou quitter en blanc
+        replay_text = text_cache.render("Voulez-vous rejouer (R) ou quitter (Q) ?", 42, OR)
 
-    # Affichage des messages de fin de partie sur l'écran
-    # "screen.blit()" place chaque message à une position spécifique sur l'écran
+        # Affichage des messages de fin de partie sur l'écran
+        # "screen.blit()" place chaque message à une position spécifique sur l'écran
     
     
-    # Affiche le message "GAME OVER !" au centre de l'écran, légèrement au-dessus du milieu
-    # "screen.blit(game_over_text, (WIDTH // 2 - 200, HEIGHT // 2 - 100))" 
-    # place le texte en fonction de la taille de l'écran :
-    # - "WIDTH // 2" représente la moitié de la largeur totale de l'écran 
-    # (c'est le centre horizontal)
-    # - On soustrait 200 pixels pour centrer horizontalement le texte "GAME OVER !" 
-    # (ajusté selon la largeur du texte)
-    # - "HEIGHT // 2" représente la moitié de la hauteur totale de l'écran 
-    # (c'est le centre vertical)
-    # - On soustrait 100 pixels pour placer le texte légèrement au-dessus 
-    # du centre vertical de l'écran
-    screen.blit(game_over_text, (WIDTH // 2 - 200, HEIGHT // 2 - 100))
+        # Affiche le message "GAME OVER !" au centre de l'écran, légèrement au-dessus du milieu
+        # "screen.blit(game_over_text, (WIDTH // 2 - 200, HEIGHT // 2 - 100))" 
+        # place le texte en fonction de la taille de l'écran :
+        # - "WIDTH // 2" représente la moitié de la largeur totale de l'écran 
+        # (c'est le centre horizontal)
+        # - On soustrait 200 pixels pour centrer horizontalement le texte "GAME OVER !" 
+        # (ajusté selon la largeur du texte)
+        # - "HEIGHT // 2" représente la moitié de la hauteur totale de l'écran 
+        # (c'est le centre vertical)
+        # - On soustrait 100 pixels pour placer le texte légèrement au-dessus 
+        # du centre vertical de l'écran
+        screen.blit(game_over_text, (WIDTH // 2 - 200, HEIGHT // 2 - 100))
     
     
     
-    # Affiche le score final juste en dessous du message "GAME OVER !"
-    # "screen.blit(score_text, (WIDTH // 2 - 200, HEIGHT // 2 - 30))" 
-    # positionne le texte du score par rapport au centre :
-    # - "WIDTH // 2 - 200" centre horizontalement le texte en soustrayant 200 pixels 
-    # pour que le texte soit bien aligné
-    # - "HEIGHT // 2 - 30" place le score légèrement sous le texte "GAME OVER !", 
-    # 30 pixels plus bas que le centre
-    screen.blit(score_text, (WIDTH // 2 - 200, HEIGHT // 2 - 30))
+        # Affiche le score final juste en dessous du message "GAME OVER !"
+        # "screen.blit(score_text, (WIDTH // 2 - 200, HEIGHT // 2 - 30))" 
+        # positionne le texte du score par rapport au centre :
+        # - "WIDTH // 2 - 200" centre horizontalement le texte en soustrayant 200 pixels 
+        # pour que le texte soit bien aligné
+        # - "HEIGHT // 2 - 30" place le score légèrement sous le texte "GAME OVER !", 
+        # 30 pixels plus bas que le centre
+        screen.blit(score_text, (WIDTH // 2 - 200, HEIGHT // 2 - 30))
     
     
     
-    # Affiche le niveau atteint sous le score pour garder une structure verticale
-    # "screen.blit(level_text, (WIDTH // 2 - 200, HEIGHT // 2 + 30))" 
-    # positionne le texte du niveau :
-    # - "WIDTH // 2 - 200" centre horizontalement le texte de la même manière 
-    # que les autres lignes
-    # - "HEIGHT // 2 + 30" place le texte du niveau 30 pixels plus bas que le centre, 
-    # sous le score
-    screen.blit(level_text, (WIDTH // 2 - 200, HEIGHT // 2 + 30))
+        # Affiche le niveau atteint sous le score pour garder une structure verticale
+        # "screen.blit(level_text, (WIDTH // 2 - 200, HEIGHT // 2 + 30))" 
+        # positionne le texte du niveau :
+        # - "WIDTH // 2 - 200" centre horizontalement le texte de la même manière 
+        # que les autres lignes
+        # - "HEIGHT // 2 + 30" place le texte du niveau 30 pixels plus bas que le centre, 
+        # sous le score
+        screen.blit(level_text, (WIDTH // 2 - 200, HEIGHT // 2 + 30))
     
     
     
-    # Affiche le nombre de bonus collectés sous le niveau pour respecter l'alignement vertical
-    # "screen.blit(bonus_text, (WIDTH // 2 - 200, HEIGHT // 2 + 90))" 
-    # positionne le texte des bonus :
-    # - "WIDTH // 2 - 200" garde le texte centré horizontalement
-    # - "HEIGHT // 2 + 90" place le texte des bonus 90 pixels sous le centre, sous le niveau, 
-    # en gardant une certaine distance
-    screen.blit(bonus_text, (WIDTH // 2 - 200, HEIGHT // 2 + 90))
+        # Affiche le nombre de bonus collectés sous le niveau pour respecter l'alignement vertical
+        # "screen.blit(bonus_text, (WIDTH // 2 - 200, HEIGHT // 2 + 90))" 
+        # positionne le texte des bonus :
+        # - "WIDTH // 2 - 200" garde le texte centré horizontalement
+        # - "HEIGHT // 2 + 90" place le texte des bonus 90 pixels sous le centre, sous le niveau, 
+        # en gardant une certaine distance
+        screen.blit(bonus_text, (WIDTH // 2 - 200, HEIGHT // 2 + 90))
     
     
-    # Affiche le message pour rejouer ou quitter encore plus bas pour que tout soit bien organisé
-    # "screen.blit(replay_text, (WIDTH // 2 - 200, HEIGHT // 2 + 150))" 
-    # place le texte d'option en bas de la liste :
-    # - "WIDTH // 2 - 200" continue d'aligner tout le texte horizontalement au centre
-    # - "HEIGHT // 2 + 150" positionne ce dernier message à 150 pixels 
-    # sous le centre pour indiquer les options
-    screen.blit(replay_text, (WIDTH // 2 - 200, HEIGHT // 2 + 150))
+        # Affiche le message pour rejouer ou quitter encore plus bas pour que tout soit bien organisé
+        # "screen.blit(replay_text, (WIDTH // 2 - 200, HEIGHT // 2 + 150))" 
+        # place le texte d'option en bas de la liste :
+        # - "WIDTH // 2 - 200" continue d'aligner tout le texte horizontalement au centre
+        # - "HEIGHT // 2 + 150" positionne ce dernier message à 150 pixels 
+        # sous le centre pour indiquer les options
+        screen.blit(replay_text, (WIDTH // 2 - 200, HEIGHT // 2 + 150))
 
-    # Met à jour l'écran pour afficher tous les messages de fin de partie
-    pygame.display.flip()
+        # Met à jour l'écran pour afficher tous les messages de fin de partie
+        game_display.present()
 
     # Attente de l'entrée de l'utilisateur pour rejouer ou quitter le jeu
-    waiting = True
-
-    # Boucle pour gérer les événements pendant l'attente de l'entrée du joueur
-    # Cette boucle vérifie continuellement les actions de l'utilisateur 
-    # (comme appuyer sur une touche ou fermer la fenêtre)
-    # tant que "waiting" est True, c'est-à-dire tant que le jeu attend une réponse 
-    # du joueur pour continuer ou quitter
-    while waiting:
-        
-        # Parcourt tous les événements détectés par Pygame, 
-        # comme les clics de souris ou les frappes de clavier
-        # "pygame.event.get()" récupère une liste de tous les événements récents 
-        # pour les traiter un par un
-        for event in pygame.event.get():
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
             
+            # Si la touche "r" est pressée, une nouvelle partie commence
+            # Le gestionnaire de scènes remplace cette scène par une nouvelle partie :
+            # aucune fonction n'est appelée à l'intérieur d'une autre.
+            if event.key == pygame.K_r:
+                self.switch_to(PlayScene())
             
-            # Vérifie si l'événement est de type "QUIT", 
-            # ce qui signifie que l'utilisateur veut fermer la fenêtre du jeu
-            # "event.type == pygame.QUIT" 
-            # détecte si l'utilisateur clique sur la croix pour fermer la fenêtre
-            if event.type == pygame.QUIT:
-                
-                # Quitte Pygame et ferme proprement la fenêtre du jeu
-                # "pygame.quit()" libère toutes les ressources utilisées par Pygame
-                # "sys.exit()" termine le programme pour fermer complètement l'application
-                pygame.quit()
-                sys.exit()
-                
+            # Si la touche "q" (ou Echap) est pressée, quitte le jeu
+            elif event.key in (pygame.K_q, pygame.K_ESCAPE):
+                self.manager.quit()
 
-            # Vérifie si l'événement est de type "KEYDOWN", 
-            # ce qui signifie qu'une touche du clavier a été enfoncée
-            elif event.type == pygame.KEYDOWN:
-                
-                # Si la touche "r" est pressée, le jeu redémarre
-                # "event.key == pygame.K_r" vérifie si la touche pressée est la lettre "r" 
-                # (pour redémarrer)
-                if event.key == pygame.K_r:
-                    
-                    # Met la variable "waiting" sur False pour arrêter la boucle d'attente
-                    # Cela signifie que le jeu peut continuer et que l'attente 
-                    # de l'entrée du joueur est terminée
-                    waiting = False 
-                    
-                    # Appelle la fonction principale "main()" pour recommencer 
-                    # le jeu depuis le début
-                    # En relançant "main()", le jeu se réinitialise et démarre une nouvelle partie 
-                    main()  
-                    
-
-                # Si la touche "q" est pressée, quitte le jeu
-                # "event.key == pygame.K_q" vérifie si la touche pressée est la lettre "q" 
-                # (pour quitter)
-                elif event.key == pygame.K_q:
-                    
-                    # Quitte Pygame et ferme proprement la fenêtre du jeu
-                    # "pygame.quit()" libère toutes les ressources de Pygame
-                    # "sys.exit()" termine le programme pour quitter l'application
-                    pygame.quit()
-                    sys.exit()
-
-# Charge le son de victoire qui est joué lors de la fin du combat final
-# "pygame.mixer.Sound()" charge le fichier audio "son_fin_jeu.wav" pour l'utiliser plus tard
-victory_sound = pygame.mixer.Sound(resource_path("son_fin_jeu.mp3"))
-
-# Définit le volume du son de victoire pour qu'il soit au maximum (1.0 est le volume maximal)
-# Vous pouvez ajuster ce niveau de volume si nécessaire
-victory_sound.set_volume(1.0)  # Définissez le volume si nécessaire
-
-
-# Fonction pour afficher l'écran du niveau final
-# Affiche un message de félicitations et le score final pour indiquer la fin du jeu
-def display_final_level_screen():
-    
-    # Arrête la musique de fond pour faire place au son de victoire
-    # "pygame.mixer.music.stop()" arrête toute musique qui est actuellement en cours de lecture en arrière-plan
-    pygame.mixer.music.stop()
-
-    # Joue le son de victoire en boucle pour célébrer l'accomplissement du niveau final
-    # "victory_sound.play(-1)" fait jouer le son de victoire en répétition infinie 
-    # (-1 signifie "en boucle")
-    victory_sound.play(-1)
-    
-    # Remplit l'écran avec une couleur noire pour nettoyer l'affichage
-    # "screen.fill(BLACK)" applique la couleur noire sur tout l'écran 
-    # pour préparer l'affichage des messages
-    screen.fill(BLACK)
-    
-    # Charge l'image de la coupe (trophée) pour la montrer à la fin du jeu
-    # "pygame.image.load()" charge une image depuis un fichier (ici "cup.png")
-    # "resource_path()" aide à localiser correctement le fichier image
-    # "convert_alpha()" permet de gérer la transparence de l'image pour 
-    # qu'elle s'affiche proprement
-    cup_image = pygame.image.load(resource_path("cup.png")).convert_alpha()
-    
-    # Redimensionne l'image de la coupe pour qu'elle mesure 
-    # 400 pixels de large et 300 pixels de haut
-    # "pygame.transform.smoothscale()" ajuste la taille de l'image 
-    # pour s'intégrer visuellement à l'écran
-    cup_image = pygame.transform.smoothscale(cup_image, (400, 300))
-    
-    # Crée un rectangle autour de l'image de la coupe et centre ce rectangle sur l'écran
-    # "get_rect()" génère un rectangle basé sur les dimensions de l'image de la coupe
-    # "center=(WIDTH // 2, HEIGHT // 2 - 150)" 
-    # place ce rectangle au centre horizontalement, légèrement vers le haut
-    cup_rect = cup_image.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 150))
-
-    # Création des polices pour les messages de félicitations
-    # "pygame.font.Font(None, 48)" crée une police de taille 48 pour le texte affiché
-    font = pygame.font.Font(None, 48)
-    
-    # Crée le texte de félicitations "Bravo, fin du combat final !" en couleur orange
-    # "font.render()" génère une image de texte avec le contenu et la couleur spécifiés
-    congrats_text = font.render("Bravo, vous avez gagné le combat final !", True, OR)
-    
-    # Crée le texte pour afficher le score final du joueur en blanc
-    # "final_score_text" montrera la valeur de "score" à la fin du jeu
-    final_score_text = font.render(f"Votre score final est de : {score}", True, WHITE)
-    
-    # Crée le texte pour afficher le niveau final atteint par le joueur en blanc
-    # "final_level_text" montrera la valeur de "level" à la fin du jeu
-    final_level_text = font.render(f"Vous avez atteint le niveau : {level}", True, WHITE)
-    
-    # Crée le texte pour afficher le nombre total de bonus collectés par le joueur en blanc
-    # "final_bonus_text" montrera le nombre total de bonus ramassés par le joueur
-    final_bonus_text = font.render(f"Nombre de bonus collectés : {bonus_collected_count}", True, WHITE)
-
-    # Affiche les messages de félicitations et l'image de la coupe sur l'écran
-    # "screen.blit()" place chaque élément (image ou texte) à des positions spécifiques
-    
-    # Affiche l'image de la coupe à sa position centrée définie par "cup_rect"
-    screen.blit(cup_image, cup_rect)
-    
-    # Affiche le message de félicitations "Bravo, fin du combat final !" 
-    # juste sous l'image de la coupe
-    # "screen.blit(congrats_text, (WIDTH // 2 - 250, HEIGHT // 2 + 10))" 
-    # positionne le texte de félicitations de cette manière :
-    # - "WIDTH // 2" représente la moitié de la largeur de l'écran, 
-    # ce qui nous donne le centre horizontal de l'écran
-    # - "WIDTH // 2 - 250" permet de centrer le texte horizontalement 
-    # en ajustant sa position de 250 pixels vers la gauche
-    #   pour qu'il soit bien aligné au centre, adapté à la largeur du texte
-    # - "HEIGHT // 2" représente la moitié de la hauteur de l'écran, donc le centre vertical
-    # - "HEIGHT // 2 + 10" place le texte légèrement en dessous du centre 
-    # (10 pixels sous la ligne centrale)
-    screen.blit(congrats_text, (WIDTH // 2 - 250, HEIGHT // 2 + 10))
-    
-    
-    
-    # Affiche le texte du score final sous le message de félicitations
-    # "screen.blit(final_score_text, (WIDTH // 2 - 250, HEIGHT // 2 + 60))" 
-    # positionne le score de cette manière :
-    # - "WIDTH // 2 - 250" garde le texte centré horizontalement, 
-    # en utilisant le même ajustement de 250 pixels vers la gauche
-    # - "HEIGHT // 2 + 60" place le texte du score 60 pixels 
-    # plus bas que la ligne centrale, sous le texte de félicitations,
-    #   pour créer un espace visuel entre les deux
-    screen.blit(final_score_text, (WIDTH // 2 - 250, HEIGHT // 2 + 60))
-    
-    
-    
-    # Affiche le texte du niveau final sous le score pour garder une structure verticale organisée
-    # "screen.blit(final_level_text, (WIDTH // 2 - 250, HEIGHT // 2 + 110))" 
-    # positionne le texte du niveau :
-    # - "WIDTH // 2 - 250" continue de centrer le texte horizontalement
-    # - "HEIGHT // 2 + 110" place le texte du niveau 110 pixels sous la ligne centrale, 
-    # juste en dessous du score
-    #   et crée ainsi un espacement de 50 pixels avec le texte du score
-    screen.blit(final_level_text, (WIDTH // 2 - 250, HEIGHT // 2 + 110))
-    
-    
-    
-    # Affiche le texte du nombre de bonus collectés sous le texte 
-    # du niveau pour garder l'alignement vertical
-    # "screen.blit(final_bonus_text, (WIDTH // 2 - 250, HEIGHT // 2 + 160))" 
-    # place le texte des bonus :
-    # - "WIDTH // 2 - 250" garde le texte centré horizontalement, 
-    # pour un alignement uniforme avec les autres textes
-    # - "HEIGHT // 2 + 160" place le texte des bonus 160 pixels sous la ligne centrale, 
-    # sous le texte du niveau,
-    # créant ainsi un espacement de 50 pixels supplémentaire avec le niveau 
-    # pour une bonne lisibilité
-    screen.blit(final_bonus_text, (WIDTH // 2 - 250, HEIGHT // 2 + 160))
-
-    # Met à jour l'écran pour afficher tous les messages et l'image de la coupe
-    pygame.display.flip()
-    
-    # Fait une pause de 3 secondes pour permettre au joueur 
-    # de voir les messages de fin de partie
-    pygame.time.delay(3000)
-
-    # Prépare le texte de question pour demander au joueur s'il veut rejouer ou quitter
-    # "font.render()" crée une surface de texte avec la question, en couleur orange
-    replay_text = font.render("Voulez-vous rejouer (R) ou quitter (Q) ?", True, OR)
-    
-    # Définit la transparence initiale à 0 pour créer un effet de fondu
-    alpha = 0
-    
-    # Boucle pour augmenter progressivement la transparence du texte de question
-    while alpha <= 255:
-        # Remplit l'écran de noir pour rafraîchir l'affichage
-        screen.fill(BLACK)
+
+# Définition de la classe 'VictoryScene' pour afficher l'écran du niveau final
+# Affiche un message de félicitations et le score final pour indiquer la fin du jeu,
+# fait apparaître en fondu la question "rejouer ou quitter", puis attend la réponse du joueur.
+class VictoryScene(Scene):
+    
+    # L'écran est redessiné 30 fois par seconde pendant l'attente et le fondu
+    frame_rate = 30
+
+    def __init__(self, final_score, final_level, final_bonus):
+        super().__init__()
+        self.final_score = final_score
+        self.final_level = final_level
+        self.final_bonus = final_bonus
+
+    def enter(self, manager):
+        super().enter(manager)
         
-        # Affiche à nouveau l'image de la coupe à sa position d'origine
-        screen.blit(cup_image, cup_rect)
+        # Arrête la musique de fond pour faire place au son de victoire
+        # "pygame.mixer.music.stop()" arrête toute musique qui est actuellement en cours de lecture en arrière-plan
+        pygame.mixer.music.stop()
+
+        # Son de victoire, au volume maximal (1.0), préparé en arrière-plan pendant l'introduction
+        # (ou chargé ici si ce n'est pas le cas)
+        self.victory_sound = get_sound("son_fin_jeu.mp3", 1.0)
+
+        # Joue le son de victoire en boucle pour célébrer l'accomplissement du niveau final
+        # "victory_sound.play(-1)" fait jouer le son de victoire en répétition infinie 
+        # (-1 signifie "en boucle")
+        self.victory_sound.play(-1)
         
-        # Affiche le message de félicitations "Bravo, fin du combat final !" 
-        # légèrement sous le centre de l'écran
-        # "screen.blit(congrats_text, (WIDTH // 2 - 250, HEIGHT // 2 + 10))" 
-        # place le texte en fonction des dimensions de l'écran :
-        # - "WIDTH // 2" est la moitié de la largeur de l'écran, 
-        # représentant le centre horizontal
-        # - "WIDTH // 2 - 250" ajuste la position de 250 pixels 
-        # vers la gauche pour centrer le texte "Bravo, fin du combat final !"
-        #   en tenant compte de sa largeur, afin qu’il soit bien aligné au centre de l'écran
-        # - "HEIGHT // 2" est la moitié de la hauteur de l'écran, 
-        #    représentant le centre vertical
-        # - "HEIGHT // 2 + 10" place le texte légèrement sous le centre 
-        # (10 pixels en dessous de la ligne centrale)
-        screen.blit(congrats_text, (WIDTH // 2 - 250, HEIGHT // 2 + 10))
-        
-        
-        # Affiche le texte du score final juste en dessous du message de félicitations
-        # "screen.blit(final_score_text, (WIDTH // 2 - 250, HEIGHT // 2 + 60))" 
-        # positionne le texte du score :
-        # - "WIDTH // 2 - 250" continue de centrer horizontalement le texte 
-        # du score en gardant le même décalage de 250 pixels
-        # - "HEIGHT // 2 + 60" place le texte du score 60 pixels 
-        # en dessous de la ligne centrale, soit 50 pixels sous le texte de félicitations
-        #   pour maintenir une bonne lisibilité et un espacement visuel constant
-        screen.blit(final_score_text, (WIDTH // 2 - 250, HEIGHT // 2 + 60))
+        # Image de la coupe (trophée) pour la montrer à la fin du jeu, avec sa transparence,
+        # redimensionnée avec lissage pour qu'elle mesure 400 pixels de large et 300 pixels de haut
+        # "get_sprite_variant()" la prend dans le cache (préparée pendant l'introduction)
+        # ou la charge depuis le fichier "cup.png" si elle n'y est pas encore
+        self.cup_image = get_sprite_variant("cup.png", (400, 300), smooth=True)
+    
+        # Crée un rectangle autour de l'image de la coupe et centre ce rectangle sur l'écran
+        # "get_rect()" génère un rectangle basé sur les dimensions de l'image de la coupe
+        # "center=(WIDTH // 2, HEIGHT // 2 - 150)" 
+        # place ce rectangle au centre horizontalement, légèrement vers le haut
+        self.cup_rect = self.cup_image.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 150))
+
+        # Crée le texte de félicitations "Bravo, fin du combat final !" en couleur orange
+        # "text_cache.render()" génère (ou réutilise) une image de texte de taille 48
+        # avec le contenu et la couleur spécifiés
+        self.congrats_text = text_cache.render("Bravo, vous avez gagné le combat final !", 48, OR)
+    
+        # Crée le texte pour afficher le score final du joueur en blanc
+        # "final_score_text" montrera la valeur de "final_score" à la fin du jeu
+        self.final_score_text = text_cache.render(f"Votre score final est de : {self.final_score}", 48, WHITE)
+    
+        # Crée le texte pour afficher le niveau final atteint par le joueur en blanc
+        # "final_level_text" montrera la valeur de "final_level" à la fin du jeu
+        self.final_level_text = text_cache.render(f"Vous avez atteint le niveau : {self.final_level}", 48, WHITE)
+    
+        # Crée le texte pour afficher le nombre total de bonus collectés par le joueur en blanc
+        # "final_bonus_text" montrera le nombre total de bonus ramassés par le joueur
+        self.final_bonus_text = text_cache.render(f"Nombre de bonus collectés : {self.final_bonus}", 48, WHITE)
+
+        # Prépare le texte de question pour demander au joueur s'il veut rejouer ou quitter
+        # "text_cache.render()" crée une surface de texte avec la question, en couleur orange
+        # La surface est copiée car sa transparence est modifiée pendant le fondu,
+        # ce qui ne doit pas altérer la version partagée du cache.
+        self.replay_text = text_cache.render("Voulez-vous rejouer (R) ou quitter (Q) ?", 48, OR).copy()
+
+        # Transparence actuelle du texte de question (0 = invisible) pour l'effet de fondu
+        self.alpha = 0
         
+        # Les messages de félicitations et l'image de la coupe restent seuls à l'écran 
+        # pendant 3 secondes pour permettre au joueur de les voir, puis la question apparaît 
+        # en fondu pendant 2,55 secondes (la transparence augmente de 5 toutes les 50 ms)
+        self.hold = TimedWait(3000)
+        self.fade = TimedWait(2550)
         
-        # Affiche le texte du niveau final en dessous du score, pour garder 
-        # une organisation en colonne
-        # "screen.blit(final_level_text, (WIDTH // 2 - 250, HEIGHT // 2 + 110))" 
-        # positionne le texte du niveau :
-        # - "WIDTH // 2 - 250" aligne toujours le texte horizontalement 
-        # avec les autres, au centre
-        # - "HEIGHT // 2 + 110" place le texte du niveau 110 pixels 
-        # sous la ligne centrale, donc 50 pixels sous le texte du score
-        #   pour un espacement visuel agréable et une présentation ordonnée
-        screen.blit(final_level_text, (WIDTH // 2 - 250, HEIGHT // 2 + 110))
+        # Indique que l'écran doit être redessiné (au début, à chaque étape du fondu,
+        # et après un passage en plein écran)
+        self.needs_redraw = True
+
+    def screen_changed(self):
+        self.needs_redraw = True
+
+    # Une fois l'écran dessiné, la scène est au repos pendant l'attente de 3 secondes 
+    # (rien ne bouge : le gestionnaire attend au plus la fin de l'attente) 
+    # et une fois le fondu terminé
+    def is_idle(self):
+        if self.needs_redraw:
+            return False
+        if not self.hold.done:
+            self.idle_timeout = max(1, int(self.hold.duration - self.hold.elapsed))
+            return True
+        self.idle_timeout = Scene.idle_timeout
+        return self.fade.done
+
+    # Dessine l'image de la coupe et les messages de félicitations sur un écran noir
+    def draw_messages(self):
         
+        # Remplit l'écran avec une couleur noire pour nettoyer l'affichage
+        # "screen.fill(BLACK)" applique la couleur noire sur tout l'écran 
+        # pour préparer l'affichage des messages
+        screen.fill(BLACK)
         
-        # Affiche le texte du nombre de bonus collectés sous le texte du niveau, 
-        # pour garder la présentation alignée
-        # "screen.blit(final_bonus_text, (WIDTH // 2 - 250, HEIGHT // 2 + 160))" 
-        # positionne le texte des bonus :
-        # - "WIDTH // 2 - 250" aligne le texte des bonus avec les autres textes 
-        # pour un centrage horizontal uniforme
+        # Affiche les messages de félicitations et l'image de la coupe sur l'écran
+        # "screen.blit()" place chaque élément (image ou texte) à des positions spécifiques
+    
+        # Affiche l'image de la coupe à sa position centrée définie par "cup_rect"
+        screen.blit(self.cup_image, self.cup_rect)
+    
+        # Affiche le message de félicitations "Bravo, fin du combat final !" 
+        # juste sous l'image de la coupe
+        # "screen.blit(self.congrats_text, (WIDTH // 2 - 250, HEIGHT // 2 + 10))" 
+        # positionne le texte de félicitations de cette manière :
+        # - "WIDTH // 2" représente la moitié de la largeur de l'écran, 
+        # ce qui nous donne le centre horizontal de l'écran
+        # - "WIDTH // 2 - 250" permet de centrer le texte horizontalement 
+        # en ajustant sa position de 250 pixels vers la gauche
+        #   pour qu'il soit bien aligné au centre, adapté à la largeur du texte
+        # - "HEIGHT // 2" représente la moitié de la hauteur de l'écran, donc le centre vertical
+        # - "HEIGHT // 2 + 10" place le texte légèrement en dessous du centre 
+        # (10 pixels sous la ligne centrale)
+        screen.blit(self.congrats_text, (WIDTH // 2 - 250, HEIGHT // 2 + 10))
+    
+    
+    
+        # Affiche le texte du score final sous le message de félicitations
+        # "screen.blit(self.final_score_text, (WIDTH // 2 - 250, HEIGHT // 2 + 60))" 
+        # positionne le score de cette manière :
+        # - "WIDTH // 2 - 250" garde le texte centré horizontalement, 
+        # en utilisant le même ajustement de 250 pixels vers la gauche
+        # - "HEIGHT // 2 + 60" place le texte du score 60 pixels 
+        # plus bas que la ligne centrale, sous le texte de félicitations,
+        #   pour créer un espace visuel entre les deux
+        screen.blit(self.final_score_text, (WIDTH // 2 - 250, HEIGHT // 2 + 60))
+    
+    
+    
+        # Affiche le texte du niveau final sous le score pour garder une structure verticale organisée
+        # "screen.blit(self.final_level_text, (WIDTH // 2 - 250, HEIGHT // 2 + 110))" 
+        # positionne le texte du niveau :
+        # - "WIDTH // 2 - 250" continue de centrer le texte horizontalement
+        # - "HEIGHT // 2 + 110" place le texte du niveau 110 pixels sous la ligne centrale, 
+        # juste en dessous du score
+        #   et crée ainsi un espacement de 50 pixels avec le texte du score
+        screen.blit(self.final_level_text, (WIDTH // 2 - 250, HEIGHT // 2 + 110))
+    
+    
+    
+        # Affiche le texte du nombre de bonus collectés sous le texte 
+        # du niveau pour garder l'alignement vertical
+        # "screen.blit(self.final_bonus_text, (WIDTH // 2 - 250, HEIGHT // 2 + 160))" 
+        # place le texte des bonus :
+        # - "WIDTH // 2 - 250" garde le texte centré horizontalement, 
+        # pour un alignement uniforme avec les autres textes
         # - "HEIGHT // 2 + 160" place le texte des bonus 160 pixels sous la ligne centrale, 
-        # c'est-à-dire 50 pixels sous le niveau
-        #   pour maintenir l'espacement cohérent entre chaque ligne de texte
-        screen.blit(final_bonus_text, (WIDTH // 2 - 250, HEIGHT // 2 + 160))
+        # sous le texte du niveau,
+        # créant ainsi un espacement de 50 pixels supplémentaire avec le niveau 
+        # pour une bonne lisibilité
+        screen.blit(self.final_bonus_text, (WIDTH // 2 - 250, HEIGHT // 2 + 160))
+
+    def update(self, elapsed_ms):
+        # Après l'attente de 3 secondes, augmente la transparence avec le temps écoulé 
+        # pour créer un effet de fondu progressif jusqu'à ce que la question soit complètement opaque
+        if not self.hold.done:
+            self.hold.update(elapsed_ms)
+        elif not self.fade.done:
+            self.fade.update(elapsed_ms)
+            self.alpha = int(255 * self.fade.progress)
+            self.needs_redraw = True
+
+    def draw(self):
+        if not self.needs_redraw:
+            return
+        self.needs_redraw = False
         
-        # Applique la transparence actuelle au texte de question pour le fondu
+        # Redessine les messages, puis le texte de question avec la transparence actuelle
         # "set_alpha(alpha)" change la transparence du texte, 
         # de complètement transparent (0) à opaque (255)
-        replay_text.set_alpha(alpha)
-        
+        self.draw_messages()
+        self.replay_text.set_alpha(self.alpha)
         
         # Affiche le texte de question "Voulez-vous rejouer (R) ou quitter (Q) ?" 
-        # sous les autres messages
-        # "screen.blit(replay_text, (WIDTH // 2 - 250, HEIGHT // 2 + 210))" 
-        # place ce texte de la manière suivante :
-        # - "WIDTH // 2" est la moitié de la largeur totale de l'écran, 
-        # ce qui représente le centre horizontal
-        # - "WIDTH // 2 - 250" décale la position de 250 pixels 
-        # vers la gauche pour centrer précisément le texte
-        #   "Voulez-vous rejouer (R) ou quitter (Q) ?" en tenant compte de sa largeur
-        # - "HEIGHT // 2" est la moitié de la hauteur de l'écran, donc le centre vertical
-        # - "HEIGHT // 2 + 210" place le texte 210 pixels 
-        # en dessous de la ligne centrale de l'écran, sous tous les autres messages affichés,
-        #   créant ainsi un espacement uniforme avec les textes au-dessus 
-        # set permettant de le lire en dernier
-        screen.blit(replay_text, (WIDTH // 2 - 250, HEIGHT // 2 + 210))
+        # sous les autres messages, 210 pixels en dessous de la ligne centrale de l'écran
+        screen.blit(self.replay_text, (WIDTH // 2 - 250, HEIGHT // 2 + 210))
         
         # Rafraîchit l'écran pour montrer le texte de question avec la transparence modifiée
-        pygame.display.flip()
+        game_display.present()
+
+    # Attente de la réponse du joueur, une fois le fondu terminé
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and self.alpha >= 255:
+            
+            # Si la touche "r" est pressée, le jeu redémarre
+            # Relance la musique de fond avant de commencer la nouvelle partie
+            if event.key == pygame.K_r:
+                pygame.mixer.music.play(-1)
+                self.switch_to(PlayScene())
+            
+            # Si la touche "q" (ou Echap) est pressée, quitte le jeu
+            elif event.key in (pygame.K_q, pygame.K_ESCAPE):
+                self.manager.quit()
+
+    def exit(self):
+        # Arrête le son de victoire en quittant l'écran de fin
+        self.victory_sound.stop()
+
+
+# Enchaîne 1000 parties (fin de partie puis "R" pour rejouer) sans limite d'images par seconde,
+# et vérifie tous les 100 redémarrages que la pile d'appels, la mémoire allouée par Python
+# et le nombre d'objets restent stables : chaque partie remplace la précédente au lieu
+# de s'empiler sur elle.
+@benchmark("redemarrages")
+def bench_restarts(restarts=1000, report_every=100):
+    import tracemalloc
+    restart_event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_r)
+    manager = SceneManager(PlayScene(seed=SCENARIO_SEED))
+    count = 0
+    tracemalloc.start()
+    start = time.perf_counter()
+    while count < restarts:
+        if isinstance(manager.scene, GameOverScene):
+            manager.frame([restart_event], MAX_FRAME_MS)
+            count += 1
+            if count % report_every == 0:
+                gc.collect()
+                current, _ = tracemalloc.get_traced_memory()
+                print(f"{count:5d} redémarrages : pile {manager.max_stack_depth} appels, "
+                      f"mémoire {current / 1024:8.1f} Ko, {len(gc.get_objects())} objets")
+        else:
+            manager.frame([], MAX_FRAME_MS)
+    tracemalloc.stop()
+    print(f"{restarts} redémarrages en {time.perf_counter() - start:.1f} s "
+          f"({manager.switches} changements de scène)")
+
+
+# Mesure le coût de la première image de jeu (création de la partie comprise), 
+# avec des caches vides puis après le chargement en arrière-plan ("AssetLoader").
+# Pendant le chargement, la boucle principale ne fait que publier les éléments prêts :
+# la durée de publication la plus longue est indiquée.
+@benchmark("prechargement")
+def bench_preloading():
+
+    def clear_caches():
+        asset_cache.clear()
+        sprite_masks.clear()
+        sound_cache.clear()
+        text_cache.fonts.clear()
+        text_cache.surfaces.clear()
+
+    def first_frame_ms():
+        start = time.perf_counter()
+        manager = SceneManager(PlayScene(seed=SCENARIO_SEED))
+        manager.frame([], TICK_MS)
+        duration = (time.perf_counter() - start) * 1000
+        manager.quit()
+        return duration
+
+    clear_caches()
+    print(f"première image, caches vides        {first_frame_ms():8.3f} ms")
+    
+    clear_caches()
+    loader = create_gameplay_loader()
+    loader.start()
+    worst_poll = 0.0
+    while not loader.ready:
+        time.sleep(TICK_MS / 1000)
+        start = time.perf_counter()
+        loader.poll()
+        worst_poll = max(worst_poll, (time.perf_counter() - start) * 1000)
+    print(f"chargement en arrière-plan          {loader.load_ms:8.3f} ms ({len(loader.jobs)} éléments), "
+          f"publication la plus longue {worst_poll:.3f} ms par image")
+    print(f"première image, après chargement    {first_frame_ms():8.3f} ms")
+
+
+# Mesure l'utilisation du processeur pendant que l'écran de fin de partie attend le joueur :
+# programme endormi (référence : son et musique en arrière-plan), ancienne boucle d'attente ("pygame.event.get()" sans pause), gestionnaire de scènes 
+# à 60 images par seconde, et gestionnaire avec l'attente des événements des scènes au repos.
+@benchmark("repos")
+def bench_idle_screens(seconds=2.0):
+
+    def busy_loop():
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pygame.event.get()
+
+    def scene_loop(idle):
+        # Un événement "QUIT" est envoyé au bout de "seconds" secondes pour arrêter la boucle
+        pygame.time.set_timer(pygame.QUIT, int(seconds * 1000), 1)
+        SceneManager(GameOverScene(120, 12, 9), idle=idle).run()
+
+    for label, loop in (("sans rien faire", lambda: time.sleep(seconds)),
+                        ("ancienne boucle", busy_loop),
+                        ("60 images par seconde", lambda: scene_loop(False)),
+                        ("au repos", lambda: scene_loop(True))):
+        pygame.event.clear()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        loop()
+        cpu = time.process_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+        print(f"{label:<22} processeur {cpu / wall:6.1%}   ({cpu * 1000:7.1f} ms en {wall:.2f} s)")
+    print(f"pilote d'affichage \"{pygame.display.get_driver()}\"")
+
+
+# Mesure l'utilisation du processeur pendant une partie au premier plan, en arrière-plan 
+# et fenêtre réduite (événements de fenêtre simulés), et vérifie qu'au retour au premier plan
+# la partie reprend sans rafale de pas de simulation.
+@benchmark("arriere_plan")
+def bench_background(seconds=1.5):
+    scene = PlayScene(seed=SCENARIO_SEED)
+    manager = SceneManager(scene)
+    scene.session.god_mode = True
+    manager.clock.tick()
+    
+    phases = (("premier plan", []),
+              ("arrière-plan", [pygame.WINDOWFOCUSLOST]),
+              ("réduite", [pygame.WINDOWMINIMIZED]),
+              ("reprise", [pygame.WINDOWRESTORED, pygame.WINDOWFOCUSGAINED]))
+    for label, event_types in phases:
+        for event_type in event_types:
+            pygame.event.post(pygame.event.Event(event_type))
+        ticks = scene.session.ticks
+        frames = 0
+        resume_steps = None
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        while time.perf_counter() - wall_start < seconds:
+            manager.frame(*manager.next_frame())
+            frames += 1
+            if resume_steps is None:
+                resume_steps = scene.session.ticks - ticks
+        cpu = time.process_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+        print(f"{label:<14} processeur {cpu / wall:6.1%}   {frames / wall:6.1f} images/s   "
+              f"{(scene.session.ticks - ticks) / wall:6.1f} pas/s   "
+              f"pas à la première image : {resume_steps}")
+    manager.quit()
+
+
+# Mesure le coût d'une image de jeu dans chaque mode de mise à l'échelle ("sdl" et "lisse"),
+# en fenêtre puis en plein écran, et le temps du passage en plein écran (touche "F").
+# La surface de rendu et les images déjà converties doivent rester les mêmes.
+@benchmark("affichage")
+def bench_display(frames=120):
+    global screen
+    converted = dict(asset_cache.surfaces)
+    
+    for scaling in ("sdl", "lisse"):
+        display = game_display
+        display.scaling = scaling
+        display.scaled_frames = 0
+        display.open()
+        screen = target = display.target
+        frame = game_scenario(NULL_TIMER, 10)
+        frame.session.timer = NULL_TIMER
         
-        # Augmente la transparence de 5 à chaque cycle pour créer un effet de fondu progressif
-        alpha += 5
+        for label in ("fenêtre", "plein écran"):
+            average, worst = measure_frames(frame, frames)
+            size = "x".join(map(str, display.window.get_size()))
+            print(f"{display.scaling:<6} {label:<12} {size:>9}   moyenne {average:6.3f} ms   pire {worst:6.3f} ms")
+            
+            # Passage en plein écran (puis retour en fenêtre à la fin de la boucle)
+            start = time.perf_counter()
+            if not display.toggle_fullscreen():
+                print(f"{display.scaling:<6} plein écran non disponible avec le pilote \"{pygame.display.get_driver()}\"")
+                break
+            print(f"{display.scaling:<6} {'bascule F':<12} {(time.perf_counter() - start) * 1000:19.3f} ms")
+        else:
+            display.toggle_fullscreen()
+        frame.session.clear()
         
-        # Fait une courte pause de 50 millisecondes avant 
-        # la prochaine augmentation de transparence
-        pygame.time.delay(50)
-
-    # Initialise une variable pour gérer l'attente de l'entrée de l'utilisateur 
-    # (rejouer ou quitter)
-    waiting = True
+        reconverted = sum(1 for key, surface in converted.items() if asset_cache.surfaces.get(key) is not surface)
+        print(f"{display.scaling:<6} surface de rendu inchangée : {'oui' if display.target is target else 'non'}   "
+              f"images agrandies : {display.scaled_frames}   images reconverties : {reconverted}")
+    
+    # Rouvre la fenêtre du jeu pour les benchmarks suivants
+    game_display.scaling = SCALING
+    game_display.open()
+    screen = game_display.target
+
+
+# Mesure le cache des images quand l'affichage passe par plusieurs résolutions (bornes, 
+# fenêtre redimensionnée) : à chaque résolution, les fonds, les obstacles, la coupe et 
+# l'image d'introduction sont demandés à la taille correspondante, trois fois de suite
+# (trois parties), avant de passer à la résolution suivante.
+# "par défaut" : budget calculé pour la résolution actuelle, comme "ASSET_BUDGET_MB" ;
+# les variantes de la résolution précédente sont retirées au changement de résolution.
+# "toutes les tailles" : budget assez grand pour garder les quatre résolutions à la fois.
+@benchmark("images")
+def bench_asset_cache(rounds=3):
+    sizes = ((800, 600), (1024, 768), (1280, 720), (1920, 1080))
+    all_sizes_mb = sum(asset_working_set_mb(width, height) for width, height in sizes) * 1.25
+    
+    for label, budget in (("par défaut", None), ("toutes les tailles", all_sizes_mb)):
+        cache = AssetCache(budget or ASSET_BUDGET_MB)
+        start = time.perf_counter()
+        for width, height in sizes:
+            if budget is None:
+                cache.budget = int(asset_working_set_mb(width, height) * 1.25 * 1048576)
+            scale_x, scale_y = width / WIDTH, height / HEIGHT
+            for _ in range(rounds):
+                for filename in BACKGROUND_FILES:
+                    cache.get(filename, (width, height), alpha=False)
+                for filename, (w, h), _ in OBSTACLE_TYPES.values():
+                    cache.get(filename, (round(w * scale_x), round(h * scale_y)))
+                for filename, (w, h) in IMAGE_SIZES.items():
+                    effect = round_corners if filename == "leo_hero1.png" else None
+                    cache.get(filename, (round(w * scale_x), round(h * scale_y)), smooth=filename != "powerup.png", effect=effect)
+        duration = (time.perf_counter() - start) * 1000
+        print(f"{label:<18} {duration:7.1f} ms   {cache.stats()}")
+
+
+# Fin du chargement du code : toutes les fonctions et classes sont définies
+startup_step("chargement du code")
+
+
+# Mode mesure de performance : "python dysheros.py --benchmark [nom ...] [--output fichier]"
+# lance les benchmarks enregistrés au lieu du jeu, puis quitte.
+if "--benchmark" in sys.argv:
+    init_display()
+    init_audio()
+    names = []
+    for arg in sys.argv[sys.argv.index("--benchmark") + 1:]:
+        if arg.startswith("--"):
+            break
+        names.append(arg)
+    run_benchmarks(names)
+    pygame.quit()
+    sys.exit()
+
+
+# Mode sans affichage : simule une partie complète (34 niveaux), ou rejoue le fichier donné
+# avec "--replay", et affiche son résumé.
+if HEADLESS:
+    init_display()
+    start = time.perf_counter()
+    if REPLAY_FILE is not None:
+        session = run_replay(Replay.load(REPLAY_FILE))
+    else:
+        session = run_headless(FRAME_RATE, seed=GAME_SEED)
+        save_replay(session)
+    duration = time.perf_counter() - start
+    print(f"Partie simulée (graine {session.seed}) : niveau {session.level}, score {session.score}, "
+          f"{session.bonus_collected_count} bonus, {session.fatal_hits} pas avec collision, "
+          f"{session.ticks} pas ({session.time_ms / 1000:.0f} s de jeu) en {duration:.3f} s")
+    for label, pool in (("obstacles", obstacle_pool), ("power-ups", powerup_pool)):
+        stats = pool.stats()
+        print(f"Réserve {label} : {stats['hit_rate']:.1%} réutilisés, {stats['created']} créés, "
+              f"maximum {stats['high_water']} en jeu")
+    pygame.quit()
+    sys.exit()
 
-    # Boucle pour vérifier les entrées de l'utilisateur pendant l'attente
-    while waiting:
-        # Parcourt tous les événements de Pygame pour détecter les interactions utilisateur
-        for event in pygame.event.get():
-            # Si l'utilisateur ferme la fenêtre, arrête le jeu correctement
-            if event.type == pygame.QUIT:
-                victory_sound.stop()  # Arrête le son de victoire
-                pygame.quit()
-                sys.exit()
 
-            # Vérifie si une touche a été enfoncée
-            elif event.type == pygame.KEYDOWN:
-                
-                # Si la touche "r" est pressée, le jeu redémarre
-                if event.key == pygame.K_r:
-                    # Arrête le son de victoire et relance la musique de fond
-                    victory_sound.stop()
-                    pygame.mixer.music.play(-1)  # Joue la musique de fond en boucle
-                    waiting = False  # Arrête la boucle d'attente
-                    main()  # Relance la fonction principale du jeu pour rejouer
-
-                # Si la touche "q" est pressée, quitte le jeu
-                elif event.key == pygame.K_q:
-                    victory_sound.stop()  # Arrête le son de victoire
-                    pygame.quit()
-                    sys.exit()
-
-
-# Tentative de faire défiler le texte, de lancer le décompte et le jeu principal
+# Tentative de lancer le jeu : texte de l'histoire, compte à rebours puis parties
 # La structure "try...except" permet de gérer les erreurs : 
 # le code dans "try" est exécuté normalement,
 # mais si une erreur survient, le programme passe dans "except" 
 # pour gérer cette erreur sans planter le programme
 try:
     
-    # Appelle la fonction pour faire défiler le texte de l'histoire avant de démarrer le jeu
-    # "scroll_text()" est une fonction qui affiche un texte défilant 
-    # (ici, l'introduction de notre jeu)
-    scroll_text()
-    
-    
-    # Appelle la fonction de compte à rebours avant de lancer le jeu
-    # "countdown()" affiche un décompte (5, 4, 3, 2, 1) 
-    # pour donner le temps au joueur de se préparer avant le début du jeu
-    countdown()
-    
-    
     # Appelle la fonction principale "main()" pour démarrer le jeu
-    # "main()" est la fonction qui gère tout le gameplay, 
-    # les interactions et les événements du jeu  
+    # "main()" fait tourner les scènes les unes après les autres (histoire, compte à rebours,
+    # partie, fin de partie ou victoire) jusqu'à ce que le joueur quitte le jeu
     main()
-    
-# Boucle pour garder la fenêtre ouverte après la fin du jeu
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
-                pygame.quit()
-                sys.exit()
 
 # En cas d'erreur dans les fonctions précédentes, l'exception est capturée ici
 except Exception as e: